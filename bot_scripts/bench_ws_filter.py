@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.dex_detection_rules import DEX_DETECTION_RULES
+from helpers.ws_frame_filter import WsFrameFilter, get_decoder
+from helpers.pipeline_recorder import read_archive
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Measure logsSubscribe frame filtering throughput (messages/sec)."
+    )
+    parser.add_argument(
+        "--frames",
+        type=str,
+        help="File with one raw WebSocket frame per line (JSON), or a RECORDER capture (*.jsonl.gz). "
+             "Default: synthetic pump.fun-like frames.",
+    )
+    parser.add_argument("--dex", type=str, default="Pumpfun", help="Rule set from DEX_DETECTION_RULES.")
+    parser.add_argument("--count", type=int, default=50000, help="Synthetic frames to generate.")
+    parser.add_argument("--match-ratio", type=float, default=0.01, help="Share of synthetic frames that match.")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the frames (best one is reported).")
+    return parser.parse_args()
+
+
+def synthetic_frames(count: int, match_ratio: float, rules: list[str]) -> list[str]:
+    rng = random.Random(42)
+    noise = [
+        "Program 6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P invoke [1]",
+        "Program log: Instruction: Buy",
+        "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA invoke [2]",
+        "Program log: Instruction: Transfer",
+        "Program TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA consumed 4645 of 182720 compute units",
+        "Program data: vdt/007mYe5LnhbG1bqQ2Kv0pYbcKbwcD4Cj0fT9jtyycDa4tZgC8HtYH1mCzFL4F6zFx1o4ZEnN",
+        "Program 6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P success",
+    ]
+    frames = []
+    for i in range(count):
+        logs = [rng.choice(noise) for _ in range(rng.randint(8, 40))]
+        if rules and rng.random() < match_ratio:
+            logs.insert(rng.randrange(len(logs)), f"Program log: {rng.choice(rules)}")
+        frames.append(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "logsNotification",
+            "params": {
+                "result": {
+                    "context": {"slot": 300000000 + i},
+                    "value": {"signature": f"{i:088d}", "err": None, "logs": logs},
+                },
+                "subscription": 1,
+            },
+        }))
+    return frames
+
+
+def baseline(frames: list[str], rules: list[str]) -> int:
+    """The pre-filter on_message path: decode everything, then scan the logs."""
+    matched = 0
+    for message in frames:
+        data = json.loads(message)
+        value = data.get("params", {}).get("result", {}).get("value", {})
+        if not value:
+            continue
+        logs = value.get("logs", [])
+        if not value.get("signature"):
+            continue
+        if rules and not any(any(rule in log for rule in rules) for log in logs):
+            continue
+        matched += 1
+    return matched
+
+
+def filtered(frames, frame_filter: WsFrameFilter) -> int:
+    return sum(1 for message in frames if frame_filter.parse(message))
+
+
+def measure(label: str, fn, frames, rounds: int) -> None:
+    best = float("inf")
+    matched = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        matched = fn(frames)
+        best = min(best, time.perf_counter() - started)
+    rate = len(frames) / best if best else float("inf")
+    print(f"{label:<24} {rate:>12,.0f} msg/s   matched={matched}")
+
+
+def main():
+    args = parse_args()
+    rules = DEX_DETECTION_RULES.get(args.dex, [])
+    if args.frames and args.frames.endswith(".gz"):
+        frames = [record["frame"] for record in read_archive(args.frames) if record["type"] == "ws"]
+    elif args.frames:
+        with open(args.frames, "r", encoding="utf-8") as f:
+            frames = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        frames = synthetic_frames(args.count, args.match_ratio, rules)
+    raw = [frame.encode() for frame in frames]
+    print(f"{len(frames)} frames, rules={rules}")
+
+    measure("baseline (json)", lambda fs: baseline(fs, rules), frames, args.rounds)
+    decoders = ["json"] + [name for name in ("orjson", "msgspec") if get_decoder(name)[0] == name]
+    for name in decoders:
+        measure(f"prefilter str ({name})", lambda fs: filtered(fs, WsFrameFilter(rules, name)), frames, args.rounds)
+        measure(f"prefilter bytes ({name})", lambda fs: filtered(fs, WsFrameFilter(rules, name)), raw, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -66,9 +66,11 @@ def create_tables():
                         id SERIAL PRIMARY KEY,
                         token_address TEXT UNIQUE NOT NULL,
                         signature TEXT,
-                        detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        finality TEXT
                     );
                     """)
+                    cur.execute("ALTER TABLE tokens ADD COLUMN IF NOT EXISTS finality TEXT;")
                     # TOKEN VOLUME
                     cur.execute("""
                         CREATE TABLE IF NOT EXISTS token_volumes (
@@ -126,9 +128,57 @@ def create_tables():
                             timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                             status TEXT,
                             confirmed_at TIMESTAMP,
-                            finalized_at TIMESTAMP
+                            finalized_at TIMESTAMP,
+                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                            version BIGINT NOT NULL DEFAULT 1
                         );
                     """)
+                    cur.execute("ALTER TABLE trades ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;")
+                    cur.execute("ALTER TABLE trades ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1;")
+
+                    # TRADE CHANGES: every update bumps version/updated_at, every change is pushed
+                    # on the trades_changed channel (OpenPositionTracker applies them as deltas)
+                    cur.execute("""
+                    CREATE OR REPLACE FUNCTION trades_touch() RETURNS trigger AS $$
+                    BEGIN
+                        NEW.version := OLD.version + 1;
+                        NEW.updated_at := NOW() AT TIME ZONE 'UTC';
+                        RETURN NEW;
+                    END;
+                    $$ LANGUAGE plpgsql;
+                    """)
+                    cur.execute("""
+                    CREATE OR REPLACE FUNCTION trades_notify() RETURNS trigger AS $$
+                    DECLARE
+                        r trades%ROWTYPE;
+                    BEGIN
+                        IF TG_OP = 'DELETE' THEN r := OLD; ELSE r := NEW; END IF;
+                        PERFORM pg_notify('trades_changed', json_build_object(
+                            'op', TG_OP,
+                            'id', r.id,
+                            'version', r.version,
+                            'token_id', r.token_id,
+                            'token_address', (SELECT token_address FROM tokens WHERE id = r.token_id),
+                            'trade_type', r.trade_type,
+                            'entry_usd', r.entry_usd,
+                            'timestamp', r.timestamp,
+                            'simulation', r.simulation,
+                            'status', r.status
+                        )::text);
+                        RETURN NULL;
+                    END;
+                    $$ LANGUAGE plpgsql;
+                    """)
+                    cur.execute("DROP TRIGGER IF EXISTS trades_touch ON trades;")
+                    cur.execute("""
+                    CREATE TRIGGER trades_touch BEFORE UPDATE ON trades
+                    FOR EACH ROW EXECUTE FUNCTION trades_touch();
+                    """)
+                    cur.execute("DROP TRIGGER IF EXISTS trades_notify ON trades;")
+                    cur.execute("""
+                    CREATE TRIGGER trades_notify AFTER INSERT OR UPDATE OR DELETE ON trades
+                    FOR EACH ROW EXECUTE FUNCTION trades_notify();
+                    """)
 
 
                     # LIQUIDITY SNAPSHOTS
@@ -168,6 +218,21 @@ def create_tables():
                     );
                     """)
 
+                    # TOKEN DECIMALS (permanent per mint, stored for tokens that passed the gates)
+                    cur.execute("""
+                    CREATE TABLE IF NOT EXISTS token_decimals (
+                        mint TEXT PRIMARY KEY,
+                        decimals SMALLINT NOT NULL,
+                        learned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    );
+                    """)
+                    # only detected tokens are kept; drop rows of mints without a tokens row
+                    # (rolled-back tokens, and every mint stored before storage was limited to them)
+                    cur.execute("""
+                    DELETE FROM token_decimals d
+                    WHERE NOT EXISTS (SELECT 1 FROM tokens t WHERE t.token_address = d.mint);
+                    """)
+
                     conn.commit()
                     logger.info("✅ Full relational schema created successfully.")
         except Exception as e:
@@ -0,0 +1,318 @@
+import argparse
+import copy
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from connectors.helius_connector import WsLink
+from core_orchestrator.bot_orchestrator import BotOrchestrator
+from helpers.async_requests_utility import AsyncRequestsUtility
+from helpers.credentials_utility import CredentialsUtility
+from helpers.pipeline_recorder import read_archive
+from helpers.replay_server import ReplayServer
+from helpers.requests_utility import RequestsUtility
+from services.bot_context import BotContext
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Replay a RECORDER capture through the detection pipeline and report throughput / latency."
+    )
+    parser.add_argument("archive", type=str, help="Recording (logs/recordings/capture_*.jsonl.gz).")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        help="Milliseconds added to every stand-in response. Default: each call's recorded latency.",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0,
+        help="Frame pacing relative to the recording (1 = real time, 10 = 10x). 0 (default) = as fast as possible.",
+    )
+    parser.add_argument("--mode", choices=["thread", "async"], help="Override PIPELINE.MODE.")
+    parser.add_argument("--workers", type=int, help="Override PIPELINE.WORKERS.")
+    parser.add_argument("--drain", type=float, default=30, help="Seconds to wait for in-flight work after the last frame.")
+    parser.add_argument("--out", type=str, help="Also write the report as JSON to this file.")
+    return parser.parse_args()
+
+
+def build_context(args) -> BotContext:
+    credentials = CredentialsUtility()
+    settings_manager = Settings()
+    bot_settings = copy.deepcopy(settings_manager.load_settings())
+
+    # never trade, notify, record or wait for finality during a replay
+    bot_settings["SIM_MODE"] = True
+    bot_settings["RECORDER"]["ENABLED"] = False
+    bot_settings["FAST_DETECTION"]["ENABLED"] = False
+    bot_settings["NOTIFY"] = {channel: False for channel in bot_settings["NOTIFY"]}
+    bot_settings["MAXIMUM_TRADES"] = 10 ** 9  # every passing token takes the buy path, run after run
+    if args.mode:
+        bot_settings["PIPELINE"]["MODE"] = args.mode
+    if args.workers:
+        bot_settings["PIPELINE"]["WORKERS"] = args.workers
+    settings_manager.validate_bot_settings(bot_settings)
+
+    return BotContext(
+        settings=bot_settings,
+        api_keys=credentials.get_all(),
+        settings_manager=settings_manager,
+        first_run=False,
+    )
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class StageTimer:
+    """Times pipeline stages by wrapping the bound methods the pipeline calls through `self` / ctx."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages: dict[str, list[float]] = defaultdict(list)
+        self.flows: list[float] = []
+        self.started = 0
+        self.finished = 0
+        self.last_finished_at = None
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self.lock:
+            self.stages[stage].append(seconds)
+
+    def wrap(self, obj, attr: str, stage: str, on_result=None) -> None:
+        fn = getattr(obj, attr)
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - started)
+                if on_result:
+                    on_result(result)
+                return result
+        else:
+            @functools.wraps(fn)
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - started)
+                if on_result:
+                    on_result(result)
+                return result
+        setattr(obj, attr, timed)
+
+    def wrap_entry(self, obj, attr: str) -> None:
+        """Count signatures in flight through the pipeline entry point."""
+        fn = getattr(obj, attr)
+
+        def begin():
+            with self.lock:
+                self.started += 1
+
+        def end():
+            with self.lock:
+                self.finished += 1
+                self.last_finished_at = time.perf_counter()
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def counted(*args, **kwargs):
+                begin()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    end()
+        else:
+            @functools.wraps(fn)
+            def counted(*args, **kwargs):
+                begin()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    end()
+        setattr(obj, attr, counted)
+
+    def gate_timings(self, result) -> None:
+        _, timings = result
+        for check, seconds in timings.items():
+            self.record(f"check:{check}", seconds)
+
+    def flow(self, duration: float) -> None:
+        if duration:
+            with self.lock:
+                self.flows.append(duration)
+
+    def in_flight(self) -> int:
+        with self.lock:
+            return self.started - self.finished
+
+
+def instrument(ctx: BotContext, timer: StageTimer, async_pipeline: bool) -> None:
+    tm = ctx.get("transaction_manager")
+    sm = ctx.get("solana_manager")
+    if async_pipeline:
+        timer.wrap_entry(tm, "process_signature_async")
+        timer.wrap(ctx.get("async_helius_client"), "get_transaction", "fetch")
+        timer.wrap(tm, "_run_gates_async", "gates", timer.gate_timings)
+    else:
+        timer.wrap_entry(tm, "process_signature")
+        timer.wrap(tm, "resolve_signature", "fetch")
+        timer.wrap(tm, "_run_gates", "gates", timer.gate_timings)
+    timer.wrap(tm, "_passes_prefilters", "prefilters")
+    timer.wrap(tm, "_record_new_token", "record")
+    timer.wrap(sm, "buy", "buy")
+    timer.wrap(tm, "_notify_and_schedule", "notify")
+    timer.wrap(tm, "_pop_flow_duration", "flow_pop", timer.flow)
+
+
+def redirect_clients(ctx: BotContext, server: ReplayServer) -> None:
+    """Point every HTTP client at the stand-in: registered ones and those a service builds itself (RugCheck)."""
+    candidates = list(ctx.services.values())
+    candidates += [getattr(service, "requests_utility", None) for service in ctx.services.values()]
+    redirected = set()
+    for client in candidates:
+        if isinstance(client, (RequestsUtility, AsyncRequestsUtility)) and id(client) not in redirected:
+            redirected.add(id(client))
+            client.base_url = server.url_for(client.base_url)
+
+
+def check_dexes(connector, records: list[dict]) -> None:
+    """Fail early if the recording subscribed to a DEX the current `DEX` setting does not run."""
+    recorded = {record["dex"] for record in records if record["type"] == "ws_sub"}
+    missing = sorted(recorded - set(connector.dexes))
+    if missing:
+        sys.exit(
+            f"Recording contains frames for {', '.join(missing)}, but DEX={','.join(connector.dexes)}. "
+            f"Set DEX to include {', '.join(missing)} and run the replay again."
+        )
+
+
+def feed(connector, records: list[dict], speed: float) -> int:
+    """Push the recorded frames through the connector's on_message, per recorded link."""
+    links: dict[int, WsLink] = {}
+    frames = 0
+    started = time.perf_counter()
+    first_t = None
+    for record in records:
+        if record["type"] not in ("ws", "ws_sub"):
+            continue
+        link = links.setdefault(record["link"], WsLink(record["link"], "replay://"))
+        if record["type"] == "ws_sub":
+            link.subscriptions[record["subscription"]] = record["dex"]
+            continue
+        if speed:
+            first_t = record["t"] if first_t is None else first_t
+            wait = (record["t"] - first_t) / speed - (time.perf_counter() - started)
+            if wait > 0:
+                time.sleep(wait)
+        connector.on_message(link, None, record["frame"])
+        frames += 1
+    return frames
+
+
+def build_report(timer: StageTimer, server: ReplayServer, frames: int, elapsed: float, queue_stats: dict) -> dict:
+    stages = {}
+    for stage, values in sorted(timer.stages.items()):
+        if stage == "flow_pop":
+            continue
+        stages[stage] = {
+            "count": len(values),
+            "total_s": round(sum(values), 3),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+        }
+    return {
+        "frames": frames,
+        "signatures": timer.finished,
+        "tokens": len(timer.flows),
+        "elapsed_s": round(elapsed, 3),
+        "signatures_per_s": round(timer.finished / elapsed, 2) if elapsed else 0.0,
+        "tokens_per_s": round(len(timer.flows) / elapsed, 3) if elapsed else 0.0,
+        "flow_p50_s": round(percentile(timer.flows, 50), 3),
+        "flow_p99_s": round(percentile(timer.flows, 99), 3),
+        "stages": stages,
+        "queue": queue_stats,
+        "stand_in": server.get_stats(),
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\nframes={report['frames']} signatures={report['signatures']} tokens={report['tokens']} "
+          f"elapsed={report['elapsed_s']}s")
+    print(f"throughput: {report['signatures_per_s']} sig/s, {report['tokens_per_s']} tokens/s")
+    print(f"flow duration: p50={report['flow_p50_s']}s p99={report['flow_p99_s']}s")
+    print(f"\n{'stage':<18}{'count':>8}{'total s':>10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for stage, s in report["stages"].items():
+        print(f"{stage:<18}{s['count']:>8}{s['total_s']:>10}{s['mean_ms']:>10}{s['p50_ms']:>10}{s['p99_ms']:>10}")
+    stand_in = report["stand_in"]
+    print(f"\nstand-in server: {stand_in['hits']} served, {stand_in['misses']} not in recording")
+    for call, counts in stand_in["by_call"].items():
+        if counts["misses"]:
+            print(f"  missing: {call} x{counts['misses']}")
+
+
+def main():
+    args = parse_args()
+    records = list(read_archive(args.archive))
+    print(f"{len(records)} records from {args.archive}")
+
+    server = ReplayServer(records, latency=args.latency / 1000 if args.latency is not None else None)
+    server.start()
+
+    ctx = build_context(args)
+    orchestrator = BotOrchestrator(ctx)
+    try:
+        check_dexes(orchestrator.helius_connector, records)
+    except SystemExit:
+        server.stop()
+        raise
+    redirect_clients(ctx, server)
+    timer = StageTimer()
+    instrument(ctx, timer, orchestrator.async_pipeline)
+    orchestrator.start_pipeline()
+
+    started = time.perf_counter()
+    frames = feed(orchestrator.helius_connector, records, args.speed)
+
+    # wait until the queue is drained and nothing has been in flight for a moment
+    deadline = time.perf_counter() + args.drain
+    queue = ctx.get("signature_queue")
+    while time.perf_counter() < deadline:
+        if queue.empty() and timer.in_flight() == 0:
+            time.sleep(1)
+            if queue.empty() and timer.in_flight() == 0:
+                break
+        time.sleep(0.1)
+    ended = timer.last_finished_at or time.perf_counter()
+
+    report = build_report(timer, server, frames, ended - started, queue.lane_sizes())
+    orchestrator.shutdown()
+    server.stop()
+
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nreport written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
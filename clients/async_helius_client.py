@@ -0,0 +1,154 @@
+import copy
+import time
+from services.bot_context import BotContext
+from spl.token.constants import TOKEN_PROGRAM_ID as SPL_TOKEN_PROGRAM_ID
+from helpers.framework_utils import lamports_to_decimal, get_payload
+
+
+class AsyncHeliusClient:
+    """Awaitable versions of the read-only HeliusClient calls used by the detection flow."""
+
+    def __init__(self, ctx: BotContext):
+        self.ctx = ctx
+        self.logger = ctx.get("logger")
+        self.helius_requests = ctx.get("helius_async_requests")
+        self.helius_client = ctx.get("helius_client")
+        self.api_key = ctx.api_keys.get("helius")
+        self.asset_payload = get_payload("Asset_payload")
+        self.get_transaction_payload = get_payload("Get_transaction")
+        self.signature_for_adress = get_payload("Signature_for_adress")
+        self.token_account_by_owner = get_payload("Token_account_by_owner")
+        if ctx.settings["FAST_DETECTION"]["ENABLED"]:
+            self.get_transaction_payload["params"][1]["commitment"] = "confirmed"
+            self.signature_for_adress["params"][1]["commitment"] = "confirmed"
+
+    async def _call(self, template: dict, description: str, **fields):
+        payload = copy.deepcopy(template)
+        payload["id"] = self.helius_client._next_id()
+        payload.update(fields)
+        await self.ctx.get("helius_rl").wait_async(payload["method"])
+        response_json = await self.helius_requests.post(endpoint=self.api_key, payload=payload)
+        return self.helius_client._assert_response_ok(response_json, description)
+
+    async def get_transaction(self, signature: str) -> dict | None:
+        self.logger.debug(f"retriving transaction for signature: {signature} using async Helius...")
+        params = copy.deepcopy(self.get_transaction_payload["params"])
+        params[0] = signature
+        return await self._call(self.get_transaction_payload, f"get_transaction {signature}", params=params)
+
+    async def get_recent_transactions_signatures_for_token(self, token_mint: str, until: str = None, before: str = None) -> list:
+        try:
+            params = copy.deepcopy(self.signature_for_adress["params"])
+            params[0] = token_mint
+            if before:
+                params[1]["before"] = before
+            if until:
+                params[1]["until"] = until
+            result = await self._call(
+                self.signature_for_adress,
+                f"get_recent_transactions_signatures_for_token {token_mint,until,before}",
+                params=params,
+            )
+            return result or []
+        except Exception as e:
+            self.logger.error(f"❌ Failed to fetch recent TXs for token {token_mint}: {e}")
+            return []
+
+    async def get_token_age(self, mint_address: str) -> int | None:
+        try:
+            params = copy.deepcopy(self.signature_for_adress["params"])
+            params[0] = mint_address
+            params[1]["limit"] = 1  # only result[0] (newest signature) is read
+            result = await self._call(self.signature_for_adress, f"get_token_age {mint_address}", params=params)
+            if not result:
+                return 0
+            first_tx = result[0]
+            if "blockTime" in first_tx and first_tx["blockTime"]:
+                return int(time.time()) - int(first_tx["blockTime"])
+        except Exception as e:
+            self.logger.error(f"❌ Error fetching token age: {e}")
+        return 0
+
+    async def get_asset(self, token_address: str, mutable: bool = False) -> dict | None:
+        cache = self.helius_client.asset_cache
+        cached = cache.get(token_address, mutable)
+        if cached is not None:
+            return cached
+        params = copy.deepcopy(self.asset_payload["params"])
+        params["id"] = token_address
+        result = await self._call(self.asset_payload, f"getAsset {token_address}", params=params)
+        if result:
+            cache.put(token_address, result)
+        return result
+
+    async def get_token_meta_data(self, token_address: str) -> dict:
+        try:
+            result = await self.get_asset(token_address)
+            content = result.get("content", {})
+            return {
+                "name": content.get("metadata", {}).get("name"),
+                "image": content.get("links", {}).get("image"),
+                "token_address": result.get("id"),
+            }
+        except Exception as e:
+            self.logger.error(f"❌ Error fetching token data: {e}")
+            return {}
+
+    async def get_token_decimals(self, token_address: str) -> int:
+        index = self.ctx.get("decimals_index")
+        known = index.get(token_address)
+        if known is not None:
+            return known
+        try:
+            result = await self.get_asset(token_address)
+            decimals = result.get("token_info", {}).get("decimals", {})
+            index.learn(token_address, decimals)
+            return decimals
+        except Exception as e:
+            self.logger.error(f"❌ Error fetching token data: {e}")
+            return 0
+
+    async def get_token_supply(self, token_address: str) -> float:
+        try:
+            result = await self.get_asset(token_address, mutable=True)
+            token_info = result.get("token_info", {})
+            return lamports_to_decimal(token_info.get("supply", {}), token_info.get("decimals", 0))
+        except Exception as e:
+            self.logger.error(f"❌ Error fetching token data: {e}")
+            return 0
+
+    async def get_mint_account_info(self, token_address: str) -> dict:
+        try:
+            result = await self.get_asset(token_address, mutable=True)
+            return {
+                "authorities": result.get("authorities", {}),
+                "frozen": result.get("ownership", {}).get("frozen", False),
+                "mutable": result.get("mutable", False),
+            }
+        except Exception as e:
+            self.logger.error(f"❌ Error fetching token data: {e}")
+            return {}
+
+    async def get_token_accounts_by_owner(self, pubkey: str, mint: str = None) -> list:
+        try:
+            params = copy.deepcopy(self.token_account_by_owner["params"])
+            params[0] = pubkey
+            params[1] = {"mint": mint} if mint else {"programId": str(SPL_TOKEN_PROGRAM_ID)}
+            result = await self._call(self.token_account_by_owner, f"get_token_accounts_by_owner {pubkey}", params=params)
+            if not result:
+                return None
+
+            reserves = []
+            for acc in result.get("value", {}).get("accounts", []):
+                parsed_info = acc["account"]["data"]["parsed"]["info"]
+                ta = parsed_info["tokenAmount"]
+                reserves.append({
+                    "mint": parsed_info["mint"],
+                    "amount": int(ta["amount"]),
+                    "decimals": int(ta["decimals"]),
+                    "pub_key": acc["pubkey"],
+                })
+            return reserves
+        except Exception as e:
+            self.logger.error(f"❌ Failed to fetch account reserves: {e}", exc_info=True)
+            return []
@@ -0,0 +1,82 @@
+import asyncio
+from config.third_parties import JUPITER_STATION
+from services.bot_context import BotContext
+from helpers.framework_utils import decimal_to_lamports, lamports_to_decimal
+from helpers.span_tracker import span
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+
+class AsyncJupiterClient:
+    """Awaitable versions of the JupiterClient quote/price calls used by the detection flow."""
+
+    def __init__(self, ctx: BotContext):
+        self.ctx = ctx
+        self.logger = ctx.get("logger")
+        self.jupiter_requests = ctx.get("jupiter_async_requests")
+
+    async def _wait(self, endpoint: str = "price"):
+        await self.ctx.get("jupiter_rl").wait_async(endpoint)
+
+    async def get_quote_dict(self, input_mint: str, output_mint: str, token_amount: float, slippage_override: float = None) -> dict:
+        try:
+            await self._wait("quote")
+            slippage_value = slippage_override if slippage_override is not None else self.ctx.settings["SLPG"]
+            slippage_bps = int(slippage_value) * 100
+            quote_url = f"{JUPITER_STATION['QUOTE_ENDPOINT']}?inputMint={input_mint}&outputMint={output_mint}&amount={token_amount}&slippageBps={slippage_bps}&restrictIntermediateTokens=true"
+            with span("quote"):
+                quote_response = await self.jupiter_requests.get(quote_url)
+            if "error" in quote_response:
+                self.logger.warning(f"⚠️ Quote attempt failed: {quote_response['error']}")
+                return {}
+            self.logger.info(f"Jupiter Quote for{output_mint}: In = {quote_response['inAmount']}, Out = {quote_response['outAmount']}")
+            hel = self.ctx.get("async_helius_client")
+            in_decimals, out_decimals = await asyncio.gather(
+                hel.get_token_decimals(input_mint),
+                hel.get_token_decimals(output_mint),
+            )
+            token_in = lamports_to_decimal(quote_response['inAmount'], in_decimals)
+            token_out = lamports_to_decimal(quote_response['outAmount'], out_decimals)
+            return {"quote_price": token_out/token_in, "inAmount": token_in, "outAmount": token_out, "quote": quote_response}
+
+        except Exception as e:
+            self.logger.error(f"❌ Error retrieving quote: {e}")
+            return {}
+
+    async def get_sol_price(self) -> float:
+        await self._wait()
+        response = await self.jupiter_requests.get(endpoint=f"{JUPITER_STATION['PRICE']}?ids={SOL_MINT}")
+        return float(response[SOL_MINT]["usdPrice"])
+
+    async def get_solana_token_worth_in_dollars(self, usd_amount: int) -> float:
+        sol_price = await self.get_sol_price()
+        return decimal_to_lamports(usd_amount / sol_price, 9)
+
+    async def get_token_price(self, mint: str) -> float:
+        await self._wait()
+        data = await self.jupiter_requests.get(f"{JUPITER_STATION['PRICE']}?ids={mint}&showExtraInfo=true")
+        if mint not in data or "usdPrice" not in data[mint]:
+            self.logger.warning(f"No price for {mint}: {data}")
+            return None
+        return float(data[mint]["usdPrice"])
+
+    async def get_token_prices(self, mints: list) -> dict[str, float]:
+        """USD price per mint (None if Jupiter has none), one rate-limited call per PRICE_MAX_IDS mints."""
+        mints = list(dict.fromkeys(mints))
+        chunk_size = JUPITER_STATION["PRICE_MAX_IDS"]
+
+        async def fetch(chunk: list) -> dict:
+            await self._wait()
+            return await self.jupiter_requests.get(f"{JUPITER_STATION['PRICE']}?ids={','.join(chunk)}&showExtraInfo=true") or {}
+
+        chunks = [mints[i:i + chunk_size] for i in range(0, len(mints), chunk_size)]
+        prices = {}
+        for chunk, data in zip(chunks, await asyncio.gather(*(fetch(chunk) for chunk in chunks))):
+            for mint in chunk:
+                entry = data.get(mint) or {}
+                prices[mint] = float(entry["usdPrice"]) if "usdPrice" in entry else None
+
+        missing = [mint for mint, price in prices.items() if price is None]
+        if missing:
+            self.logger.warning(f"No price for {len(missing)}/{len(mints)} mints: {missing}")
+        return prices
@@ -1,6 +1,10 @@
 from services.bot_context import BotContext
 from spl.token.constants import TOKEN_PROGRAM_ID as SPL_TOKEN_PROGRAM_ID
 from helpers.framework_utils import lamports_to_decimal,get_payload
+from helpers.rpc_batcher import RpcBatcher
+from helpers.asset_cache import AssetCache
+import copy
+import itertools
 import time
 
 
@@ -15,8 +19,24 @@ class HeliusClient:
         self.helius_requests = ctx.get("helius_requests")
         self.helius_enhanced = ctx.get("helius_enhanced")
         self.api_key = ctx.api_keys.get("helius")
-        self._id = 1
+        self._ids = itertools.count(2)
         self.prepare_json_files()
+
+        batching = ctx.settings["RPC_BATCH"]
+        self.batcher = RpcBatcher(
+            self.helius_requests,
+            self.api_key,
+            window=batching["WINDOW_MS"] / 1000,
+            max_batch=batching["MAX_BATCH"],
+            rate_limiter=ctx.get("helius_rl"),
+        ) if batching["ENABLED"] else None
+
+        caching = ctx.settings["ASSET_CACHE"]
+        self.asset_cache = AssetCache(
+            max_entries=caching["MAX_ENTRIES"],
+            immutable_ttl=caching["IMMUTABLE_TTL"],
+            mutable_ttl=caching["MUTABLE_TTL"],
+        )
     
     def prepare_json_files(self):
         self.transaction_simulation_paylod = get_payload("Transaction_simulation")
@@ -32,14 +52,19 @@ class HeliusClient:
         self.latest_blockhash = get_payload("Latest_blockhash")
         self.sender_transaction_payload = get_payload("Sender_transaction")
 
+        # FAST_DETECTION: read detection txs before they finalize (getTransaction has no "processed")
+        if self.ctx.settings["FAST_DETECTION"]["ENABLED"]:
+            self.get_transaction_payload["params"][1]["commitment"] = "confirmed"
+            self.signature_for_adress["params"][1]["commitment"] = "confirmed"
+
     def get_balance(self,pubkey: str)->int:
-        self.account_balance["id"] = self._next_id()
-        self.account_balance["params"][0] = pubkey
+        payload = self._fresh(self.account_balance)
+        payload["params"][0] = pubkey
         try:
-            self.ctx.get("helius_rl").wait()
+            self.ctx.get("helius_rl").wait("getBalance")
             response_json = self.helius_requests.post(
                 endpoint=self.api_key,
-                payload=self.account_balance,
+                payload=payload,
             )
             result = self._assert_response_ok(response_json, f"get_balance {pubkey}")
             if not result:
@@ -53,18 +78,18 @@ class HeliusClient:
                     return 0
     
     def get_token_accounts_by_owner(self, pubkey: str,mint: str = None)->dict:
-        self.token_account_by_owner["id"] = self._next_id()
-        self.token_account_by_owner["params"][0] = pubkey
+        payload = self._fresh(self.token_account_by_owner)
+        payload["params"][0] = pubkey
         if mint:
-             self.token_account_by_owner["params"][1]={"mint": mint}
+             payload["params"][1]={"mint": mint}
         else:
-            self.token_account_by_owner["params"][1]["programId"] = str(SPL_TOKEN_PROGRAM_ID)
+            payload["params"][1]["programId"] = str(SPL_TOKEN_PROGRAM_ID)
 
         try:
-            self.ctx.get("helius_rl").wait()
+            self.ctx.get("helius_rl").wait("getTokenAccountsByOwnerV2")
             response_json = self.helius_requests.post(
                 endpoint=self.api_key,
-                payload=self.token_account_by_owner,
+                payload=payload,
             )
 
             self.special_logger.debug(f"🔍 Raw Helius token accounts by owner Response: {response_json}")
@@ -85,6 +110,7 @@ class HeliusClient:
                     "decimals": int(ta["decimals"]),
                     "pub_key":acc["pubkey"] 
                 })
+                self.ctx.get("decimals_index").learn(parsed_info["mint"], int(ta["decimals"]))
             return reserves
         except Exception as e:
                     self.logger.error(f"❌ Failed to fetch account reserves: {e}", exc_info=True)
@@ -92,15 +118,8 @@ class HeliusClient:
     
     def get_token_meta_data(self, token_address: str)->dict:
         self.logger.info(f"🔍 Fetching metadata for {token_address} using Helius...")
-        self.ctx.get("helius_rl").wait()
-        self.asset_payload["id"] = self._next_id()
-        self.asset_payload["params"]["id"] = token_address     
-        response_json = self.helius_requests.post(
-                endpoint=self.api_key,
-                payload=self.asset_payload,
-            )
         try:
-            result = self._assert_response_ok(response_json, f"get_token_meta_data {token_address}")
+            result = self._get_asset(token_address, f"get_token_meta_data {token_address}")
             content = result.get("content", {})
 
             token_name = content.get("metadata", {}).get("name")
@@ -117,17 +136,15 @@ class HeliusClient:
             return {}
 
     def get_token_decimals(self, token_address: str)->int:
+        index = self.ctx.get("decimals_index")
+        known = index.get(token_address)
+        if known is not None:
+            return known
         self.logger.info(f"🔍 retriving decimals for {token_address} using Helius...")
-        self.ctx.get("helius_rl").wait()
-        self.asset_payload["id"] = self._next_id()
-        self.asset_payload["params"]["id"] = token_address     
-        response_json = self.helius_requests.post(
-                endpoint=self.api_key,
-                payload=self.asset_payload,
-            )
         try:
-            result = self._assert_response_ok(response_json, f"get_token_decimals {token_address}")
+            result = self._get_asset(token_address, f"get_token_decimals {token_address}")
             token_decimals = result.get("token_info", {}).get("decimals", {})
+            index.learn(token_address, token_decimals)
             return token_decimals
         except Exception as e:
             self.logger.error(f"❌ Error fetching token data: {e}")
@@ -136,11 +153,11 @@ class HeliusClient:
     def send_transaction(self,txn_64:str)->str:
         try:
             self.logger.info(f"sending transaction for signature: {txn_64}")
-            self.ctx.get("helius_rl").wait()
-            self.send_transaction_payload["id"] = self._next_id()
-            self.send_transaction_payload["params"][0] = txn_64
+            self.ctx.get("helius_rl").wait("sendTransaction")
+            payload = self._fresh(self.send_transaction_payload)
+            payload["params"][0] = txn_64
             response_json = self.helius_requests.post(
-                self.api_key, payload=self.send_transaction_payload
+                self.api_key, payload=payload
             )
             self.logger.debug(f"transaction response: {response_json}")          
             transaction_signature =  self._assert_response_ok(response_json, f"send_transaction {txn_64}")
@@ -152,12 +169,12 @@ class HeliusClient:
     def simulate_transaction(self, txn_64:str)->str:
         """Simulate a transaction using Helius RPC"""
         try:
-            self.ctx.get("helius_rl").wait()
-            self.transaction_simulation_paylod["params"][0] = txn_64
-            self.send_transaction_payload["id"] = self._next_id()
+            self.ctx.get("helius_rl").wait("simulateTransaction")
+            payload = self._fresh(self.transaction_simulation_paylod)
+            payload["params"][0] = txn_64
             response = self.helius_requests.post(
                 endpoint=self.api_key,
-                payload=self.transaction_simulation_paylod,
+                payload=payload,
             )
             self.logger.debug(f"Transaction Simulation Response: {response}")
 
@@ -168,15 +185,30 @@ class HeliusClient:
             self.logger.error(f"❌ Error simulating transaction: {e}")
             return False
     
+    def get_signature_statuses(self, signatures: list[str]) -> list | None:
+        """One getSignatureStatuses call (max 256); status dicts or None per signature, None if the call failed."""
+        try:
+            self.ctx.get("helius_rl").wait("getSignatureStatuses")
+            payload = self._fresh(self.get_signature_status)
+            payload["params"][0] = list(signatures)
+            response = self.helius_requests.post(endpoint=self.api_key, payload=payload)
+            result = self._assert_response_ok(response, f"get_signature_statuses ({len(signatures)})")
+            if not result:
+                return None
+            return result.get("value") or [None] * len(signatures)
+        except Exception as e:
+            self.logger.error(f"❌ Failed to fetch signature statuses: {e}")
+            return None
+
     def verify_signature(self, signature: str, max_retries: int = 30, delay: float = 3.0) -> str:
         confirmed_count = 0
         for attempt in range(1, max_retries + 1):
             try:
-                self.ctx.get("helius_rl").wait()
-                self.get_signature_status["params"][0] = [signature]
-                self.get_signature_status["id"] = self._next_id()
+                self.ctx.get("helius_rl").wait("getSignatureStatuses")
+                payload = self._fresh(self.get_signature_status)
+                payload["params"][0] = [signature]
 
-                response = self.helius_requests.post(endpoint=self.api_key, payload=self.get_signature_status)
+                response = self.helius_requests.post(endpoint=self.api_key, payload=payload)
                 result = self._assert_response_ok(response, f"verify_signature {signature}")
                 if not result:
                     time.sleep(delay); continue
@@ -215,28 +247,20 @@ class HeliusClient:
 
     def get_token_supply(self, token_address: str)->int:
         self.logger.info(f"🔍 retriving token supply for {token_address} using Helius...")
-        self.ctx.get("helius_rl").wait()
-        self.asset_payload["id"] = self._next_id()
-        self.asset_payload["params"]["id"] = token_address     
-        response_json = self.helius_requests.post(
-                endpoint=self.api_key,
-                payload=self.asset_payload,
-            )
         try:
-            result = self._assert_response_ok(response_json, f"get_token_supply {token_address}")
-            token_supply = result.get("token_info", {}).get("supply", {})
-            return lamports_to_decimal(token_supply,self.get_token_decimals(token_address))
+            result = self._get_asset(token_address, f"get_token_supply {token_address}", mutable=True)
+            token_info = result.get("token_info", {})
+            return lamports_to_decimal(token_info.get("supply", {}), token_info.get("decimals", 0))
         except Exception as e:
             self.logger.error(f"❌ Error fetching token data: {e}")
             return 0
     
     def get_latest_blockhash(self)->str:
         self.logger.info(f"🔍 retriving latest blockhash using Helius...")
-        self.ctx.get("helius_rl").wait()
-        self.latest_blockhash["id"] = self._next_id()
+        self.ctx.get("helius_rl").wait("getLatestBlockhash")
         response_json = self.helius_requests.post(
                 endpoint=self.api_key,
-                payload= self.latest_blockhash,
+                payload= self._fresh(self.latest_blockhash),
             )
         try:
             result = self._assert_response_ok(response_json, f"get_latest_blockhash")
@@ -249,16 +273,16 @@ class HeliusClient:
     
     def get_recent_transactions_signatures_for_token(self, token_mint: str,until:str=None,before:str=None) -> list[str]:
         try:     
-            self.ctx.get("helius_rl").wait()         
-            self.signature_for_adress["id"] = self._next_id()
-            self.signature_for_adress["params"][0] = token_mint
+            self.ctx.get("helius_rl").wait("getSignaturesForAddress")         
+            payload = self._fresh(self.signature_for_adress)
+            payload["params"][0] = token_mint
             if before:
-                self.signature_for_adress["params"][1]["before"] = before  
+                payload["params"][1]["before"] = before  
             if until:
-                self.signature_for_adress["params"][1]["until"] = until
+                payload["params"][1]["until"] = until
             response = self.helius_requests.post(
                 endpoint=self.api_key,
-                payload=self.signature_for_adress
+                payload=payload
             )
 
             txs = self._assert_response_ok(response, f"get_recent_transactions_signatures_for_token {token_mint,until,before}")
@@ -270,12 +294,13 @@ class HeliusClient:
     
     def get_token_age(self, mint_address: str) -> int | None:
         try:
-            self.ctx.get("helius_rl").wait() 
-            self.signature_for_adress["id"] = self._next_id()
-            self.signature_for_adress["params"][0] = mint_address
+            self.ctx.get("helius_rl").wait("getSignaturesForAddress") 
+            payload = self._fresh(self.signature_for_adress)
+            payload["params"][0] = mint_address
+            payload["params"][1]["limit"] = 1  # only result[0] (newest signature) is read
             response = self.helius_requests.post(
                 endpoint=self.api_key,
-                payload=self.signature_for_adress
+                payload=payload
             )
 
             result = self._assert_response_ok(response, f"get_token_age {mint_address}")
@@ -290,15 +315,8 @@ class HeliusClient:
     
     def get_mint_account_info(self, token_address: str)->dict:
         self.logger.info(f"🔍 retriving token info for {token_address} using Helius...")
-        self.ctx.get("helius_rl").wait()
-        self.asset_payload["id"] = self._next_id()
-        self.asset_payload["params"]["id"] = token_address     
-        response_json = self.helius_requests.post(
-                endpoint=self.api_key,
-                payload=self.asset_payload,
-            )
         try:
-            result =  self._assert_response_ok(response_json,f"get_mint_account_info {token_address}")
+            result = self._get_asset(token_address, f"get_mint_account_info {token_address}", mutable=True)
             frozen = result.get("ownership", {}).get("frozen",False )
             authorities = result.get("authorities", {})
             mutable = result.get("mutable", False)
@@ -311,12 +329,12 @@ class HeliusClient:
         self.logger.info(f"🔍 Checking token holders for {token_mint} using Helius...")
 
         try:
-            self.ctx.get("helius_rl").wait()
-            self.largest_accounts_payload["id"] = self._next_id()
-            self.largest_accounts_payload["params"][0] = token_mint
+            self.ctx.get("helius_rl").wait("getTokenLargestAccounts")
+            payload = self._fresh(self.largest_accounts_payload)
+            payload["params"][0] = token_mint
             response_json = self.helius_requests.post(
                 endpoint=self.api_key,
-                payload=self.largest_accounts_payload,
+                payload=payload,
             )
 
             self.special_logger.debug(f"🔍 Raw Helius Largest Accounts Response: {response_json}")
@@ -369,13 +387,9 @@ class HeliusClient:
     def get_transaction(self,signature:str):
         self.logger.debug(f"retriving transaction for signature: {signature} using Helius...")
         try:
-            self.ctx.get("helius_rl").wait()
-            self.get_transaction_payload["id"] = self._next_id()
-            self.get_transaction_payload["params"][0] = signature
-            response_json = self.helius_requests.post(
-                endpoint=self.api_key,
-                payload=self.get_transaction_payload,
-            )
+            payload = self._fresh(self.get_transaction_payload)
+            payload["params"][0] = signature
+            response_json = self._rpc(payload)
 
             self.special_logger.debug(f"🔍 Raw Helius Largest Accounts Response: {response_json}")
             result = self._assert_response_ok(response_json,f"get_transaction {signature}")
@@ -383,6 +397,48 @@ class HeliusClient:
         except Exception as e:
             self.logger.error(f"failed to retrive transaction: {e}")   
 
+    def get_transactions(self, signatures: list[str]) -> dict:
+        """Fetch several transactions in one batch request; returns {signature: tx} for those found."""
+        self.logger.debug(f"retriving {len(signatures)} transactions in one batch using Helius...")
+        payloads = []
+        for signature in signatures:
+            payload = self._fresh(self.get_transaction_payload)
+            payload["params"][0] = signature
+            payloads.append(payload)
+        try:
+            if self.batcher:
+                responses = self.batcher.call_many(payloads)
+            else:
+                responses = [self._rpc(payload) for payload in payloads]
+            transactions = {}
+            for signature, response_json in zip(signatures, responses):
+                result = self._assert_response_ok(response_json, f"get_transaction {signature}")
+                if result:
+                    transactions[signature] = result
+            return transactions
+        except Exception as e:
+            self.logger.error(f"failed to retrive transactions: {e}")
+            return {}
+
+    def _get_asset(self, token_address: str, description: str, mutable: bool = False) -> dict | None:
+        """getAsset through the shared cache; mutable=True for supply/authorities (short TTL)."""
+        cached = self.asset_cache.get(token_address, mutable)
+        if cached is not None:
+            return cached
+        payload = self._fresh(self.asset_payload)
+        payload["params"]["id"] = token_address
+        result = self._assert_response_ok(self._rpc(payload), description)
+        if result:
+            self.asset_cache.put(token_address, result)
+        return result
+
+    def _rpc(self, payload: dict) -> dict:
+        """One JSON-RPC call; coalesced with concurrent calls when RPC_BATCH is enabled."""
+        if self.batcher:
+            return self.batcher.call(payload)
+        self.ctx.get("helius_rl").wait(payload["method"])
+        return self.helius_requests.post(endpoint=self.api_key, payload=payload)
+
     def _assert_response_ok(self, response: dict, description: str = "Helius call") -> dict | None:
         try:
             # 1️⃣ Type check
@@ -408,7 +464,7 @@ class HeliusClient:
     def get_enhanced_transactions_by_address(self,PDA:str):
         self.logger.info(f"retriving transactions for pair key: {PDA} using Helius...")
         try:
-            self.ctx.get("helius_rl").wait()
+            self.ctx.get("helius_rl").wait("enhanced")
             self._next_id()
             self.helius_enhanced_payload["api-key"] = self.api_key
             response_json = self.helius_enhanced.get(endpoint=f"v0/addresses/{PDA}/transactions" ,payload=self.helius_enhanced_payload)
@@ -422,12 +478,12 @@ class HeliusClient:
         self.logger.info(f"🔍 Checking token holders for {token_mint} using Helius...")
 
         try:
-            self.ctx.get("helius_rl").wait()
-            self.largest_accounts_payload["id"] = self._next_id()
-            self.largest_accounts_payload["params"][0] = token_mint
+            self.ctx.get("helius_rl").wait("getTokenLargestAccounts")
+            payload = self._fresh(self.largest_accounts_payload)
+            payload["params"][0] = token_mint
             response_json = self.helius_requests.post(
                 endpoint=self.api_key,
-                payload=self.largest_accounts_payload,
+                payload=payload,
             )
 
             self.special_logger.debug(f"🔍 Raw Helius Largest Accounts Response: {response_json}")
@@ -447,13 +503,13 @@ class HeliusClient:
 
     def send_via_sender(self, signed_tx_base64: str) -> str | None:
         try:
-            self.sender_transaction_payload["id"] = self._next_id()
-            self.sender_transaction_payload["params"][0] = signed_tx_base64
+            payload = self._fresh(self.sender_transaction_payload)
+            payload["params"][0] = signed_tx_base64
 
             self.logger.debug(f"🚀 Sending TX via Helius Sender ...")
             response_json = self.ctx.get("helius_sender_requests").post(
                 endpoint="",
-                payload=self.sender_transaction_payload
+                payload=payload
             )
 
             result = self._assert_response_ok(response_json, "send_via_sender")
@@ -470,8 +526,13 @@ class HeliusClient:
             return None
 
     def _next_id(self) ->int:
-        self._id += 1
-        return self._id
+        return next(self._ids)
+
+    def _fresh(self, template: dict) -> dict:
+        """Per-call copy of a payload template (templates are shared across worker threads)."""
+        payload = copy.deepcopy(template)
+        payload["id"] = self._next_id()
+        return payload
 
 
        
\ No newline at end of file
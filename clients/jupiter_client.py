@@ -3,6 +3,7 @@ from config.third_parties import JUPITER_STATION
 from config.dex_detection_rules import FEE_WALLETS 
 from services.bot_context import BotContext
 from helpers.framework_utils import decimal_to_lamports,lamports_to_decimal,get_payload
+from helpers.span_tracker import span
 from solders.transaction import VersionedTransaction  # type: ignore
 from solders.system_program import TransferParams, transfer
 import random, base64
@@ -24,9 +25,10 @@ class JupiterClient:
         self.jupiter_requests = ctx.get("jupiter_requests")
         self.swap_payload = get_payload("Swap_token_payload")
   
+    @span("quote")
     def get_quote_dict(self, input_mint:str, output_mint:str, token_amount:float, slippage_override: float = None)->dict:
         try:
-            self.ctx.get("jupiter_rl").wait()            
+            self.ctx.get("jupiter_rl").wait("quote")            
             slippage_value = slippage_override if slippage_override is not None else self.ctx.settings["SLPG"]
             slippage_bps = int(slippage_value) * 100
             quote_url = f"{JUPITER_STATION['QUOTE_ENDPOINT']}?inputMint={input_mint}&outputMint={output_mint}&amount={token_amount}&slippageBps={slippage_bps}&restrictIntermediateTokens=true"
@@ -50,7 +52,7 @@ class JupiterClient:
         return decimal_to_lamports(sol_needed, 9)
     
     def get_sol_price(self) -> float:
-        self.ctx.get("jupiter_rl").wait()
+        self.ctx.get("jupiter_rl").wait("price")
         response = self.jupiter_requests.get(endpoint=f"{JUPITER_STATION['PRICE']}?ids=So11111111111111111111111111111111111111112")
         return float(response["So11111111111111111111111111111111111111112"]["usdPrice"])
 
@@ -62,8 +64,9 @@ class JupiterClient:
             swap_txn_base64 = swap_response["swapTransaction"]
             try:
                 raw_bytes = base64.b64decode(swap_txn_base64)
-                raw_tx = VersionedTransaction.from_bytes(raw_bytes)
-                signed_tx = VersionedTransaction(raw_tx.message, [self.ctx.get("wallet_client").get_keypair()])
+                with span("sign"):
+                    raw_tx = VersionedTransaction.from_bytes(raw_bytes)
+                    signed_tx = VersionedTransaction(raw_tx.message, [self.ctx.get("wallet_client").get_keypair()])
                 self.logger.info(f"Signed transaction for Wallet: {self.ctx.get('wallet_client').get_public_key()}")
                 seralized_tx = bytes(signed_tx)
                 signed_tx_base64 = base64.b64encode(seralized_tx).decode("utf-8")
@@ -85,7 +88,7 @@ class JupiterClient:
     def get_swap_transaction_for_sender(self, quote_response: dict) -> str | None:
         try:
             # Respect Jupiter rate limit
-            self.ctx.get("jupiter_rl").wait()
+            self.ctx.get("jupiter_rl").wait("swap")
             wallet_client = self.ctx.get("wallet_client")
             keypair = wallet_client.get_keypair()
             user_pubkey = Pubkey.from_string(str(wallet_client.get_public_key()))
@@ -93,10 +96,11 @@ class JupiterClient:
             self.swap_payload["quoteResponse"] = quote_response
             self.swap_payload["asLegacyTransaction"] = True 
 
-            swap_response = self.jupiter_requests.post(
-                endpoint=JUPITER_STATION["SWAP_ENDPOINT"],
-                payload=self.swap_payload,
-            )
+            with span("swap_build"):
+                swap_response = self.jupiter_requests.post(
+                    endpoint=JUPITER_STATION["SWAP_ENDPOINT"],
+                    payload=self.swap_payload,
+                )
             swap_txn_base64 = swap_response["swapTransaction"]
             self.logger.debug(f"Raw Jupiter swap response: {swap_response}")
 
@@ -145,11 +149,12 @@ class JupiterClient:
                 instructions=all_instructions,
                 payer=user_pubkey,
             )
-            new_tx = Transaction(
-                message=new_message,
-                from_keypairs=[keypair],
-                recent_blockhash=msg.recent_blockhash
-            )
+            with span("sign"):
+                new_tx = Transaction(
+                    message=new_message,
+                    from_keypairs=[keypair],
+                    recent_blockhash=msg.recent_blockhash
+                )
 
             signed_tx_base64 = base64.b64encode(bytes(new_tx)).decode("utf-8")
             self.logger.info(f"✅ Added {tip_sol:.6f} SOL tip → {tip_wallet_str}")
@@ -160,7 +165,7 @@ class JupiterClient:
             return None
 
     def get_token_price(self, mint: str) -> float:
-        self.ctx.get("jupiter_rl").wait()   
+        self.ctx.get("jupiter_rl").wait("price")   
         endpoint = f"{JUPITER_STATION['PRICE']}?ids={mint}&showExtraInfo=true"
         data = self.jupiter_requests.get(endpoint)
         if mint not in data or "usdPrice" not in data[mint]:
@@ -169,17 +174,22 @@ class JupiterClient:
         return float(data[mint]["usdPrice"])
     
     def get_token_prices(self, mints: list) -> dict[str, float]:
-        self.ctx.get("jupiter_rl").wait()
-        endpoint = f"{JUPITER_STATION['PRICE']}?ids={','.join(mints)}&showExtraInfo=true"
-        data = self.jupiter_requests.get(endpoint)
-
+        """USD price per mint (None if Jupiter has none), one rate-limited call per PRICE_MAX_IDS mints."""
+        mints = list(dict.fromkeys(mints))
+        chunk_size = JUPITER_STATION["PRICE_MAX_IDS"]
         prices = {}
-        for mint in mints:
-            if mint in data and "usdPrice" in data[mint]:
-                prices[mint] = float(data[mint]["usdPrice"])
-            else:
-                self.logger.warning(f"No price for {mint}: {data}")
-                prices[mint] = None
+        for i in range(0, len(mints), chunk_size):
+            chunk = mints[i:i + chunk_size]
+            self.ctx.get("jupiter_rl").wait("price")
+            endpoint = f"{JUPITER_STATION['PRICE']}?ids={','.join(chunk)}&showExtraInfo=true"
+            data = self.jupiter_requests.get(endpoint) or {}
+            for mint in chunk:
+                entry = data.get(mint) or {}
+                prices[mint] = float(entry["usdPrice"]) if "usdPrice" in entry else None
+
+        missing = [mint for mint, price in prices.items() if price is None]
+        if missing:
+            self.logger.warning(f"No price for {len(missing)}/{len(mints)} mints: {missing}")
         return prices
 
     def get_token_worth_in_usd(self, mint: str, token_amount: float) -> float:
@@ -201,9 +211,10 @@ class JupiterClient:
             self.logger.warning(f"⚠️ Failed to fetch dynamic Jito tip, falling back to 0.001 SOL: {e}")
             return 0.001
     
+    @span("swap_build")
     def get_swap_dict(self, quote_response: dict) -> dict | None:
         try:
-            self.ctx.get("jupiter_rl").wait()
+            self.ctx.get("jupiter_rl").wait("swap")
             self.swap_payload["userPublicKey"] = str(self.ctx.get("wallet_client").get_public_key())
             self.swap_payload["quoteResponse"] = quote_response
 
@@ -2,6 +2,7 @@ import json
 import os
 import copy
 from helpers.logging_manager import LoggingHandler
+from helpers.rate_limiter import PRIORITIES
 
 logger = LoggingHandler.get_logger()
 
@@ -59,6 +60,93 @@ DEFAULT_SETTINGS = {
         "SLACK": False,
     },
 
+    # Keep-alive HTTP connection pools (per RequestsUtility instance)
+    "HTTP_POOL": {
+        "POOL_CONNECTIONS": 10,
+        "POOL_MAXSIZE": 20,
+        "POOL_BLOCK": False
+    },
+
+    "HOST_THROTTLE": {
+        "INITIAL_CONCURRENCY": 16,
+        "MAX_CONCURRENCY": 64,
+        "MAX_RETRIES": 4,
+        "MAX_BACKOFF": 60
+    },
+
+    "RPC_BATCH": {
+        "ENABLED": True,
+        "WINDOW_MS": 10,
+        "MAX_BATCH": 50
+    },
+
+    "ASSET_CACHE": {
+        "MAX_ENTRIES": 5000,
+        "IMMUTABLE_TTL": 3600,
+        "MUTABLE_TTL": 30
+    },
+
+    "WEBSOCKET": {
+        "CONNECTIONS": 1,
+        "ENDPOINTS": [],
+        "RECONNECT_MIN_DELAY": 1,
+        "RECONNECT_MAX_DELAY": 30,
+        "BACKFILL_LIMIT": 300
+    },
+
+    "FAST_DETECTION": {
+        "ENABLED": False,
+        "COMMITMENT": "confirmed",
+        "FINALITY_TIMEOUT": 60,
+        "CHECK_INTERVAL": 5,
+        "TX_FETCH_RETRIES": 3,
+        "TX_FETCH_DELAY": 0.2
+    },
+
+    "SIGNATURE_DEDUPE": {
+        "WINDOW_SECONDS": 900,
+        "MAX_ENTRIES": 200000,
+        "BLOOM_CAPACITY": 1000000,
+        "BLOOM_ERROR_RATE": 0.001
+    },
+
+    # Detection pipeline: "thread" (one TxHandler thread) or "async" (coroutines on a shared event loop)
+    "PIPELINE": {
+        "MODE": "thread",
+        "MAX_IN_FLIGHT": 200,
+        "WORKERS": 1
+    },
+
+    "SPANS": {
+        "ENABLED": True,
+        "FILE": "logs/spans.json",
+        "INTERVAL": 30,
+        "MAX_TRACES": 200
+    },
+
+    "RECORDER": {
+        "ENABLED": False,
+        "DIR": "logs/recordings",
+        "MAX_MB": 500
+    },
+
+    "PRICE_FEED": {
+        "ENABLED": False,
+        "COMMITMENT": "processed",
+        "SOL_PRICE_REFRESH": 30
+    },
+
+    "METRICS": {
+        "ENABLED": False,
+        "HOST": "127.0.0.1",
+        "PORT": 9108
+    },
+
+    "TRADE_SYNC": {
+        "LISTEN": False,
+        "RESYNC_INTERVAL": 300
+    },
+
     # API rate limits
     "RATE_LIMITS": {
         "helius": {
@@ -68,7 +156,16 @@ DEFAULT_SETTINGS = {
                 0.01
             ],
             "max_requests_per_minute": None,
-            "name":"Helius_limits"
+            "name":"Helius_limits",
+            "burst": 10,
+            "weights": {
+                "getAsset": 2,
+                "getTokenLargestAccounts": 2,
+                "enhanced": 5
+            },
+            "quotas": {
+                "ANALYTICS": 0.25
+            }
         },
         "jupiter": {
             "min_interval": 1.0,
@@ -77,7 +174,12 @@ DEFAULT_SETTINGS = {
                 0.15
             ],
             "max_requests_per_minute": 60,
-            "name":"Jupiter_limits"
+            "name":"Jupiter_limits",
+            "burst": 1,
+            "weights": {},
+            "quotas": {
+                "ANALYTICS": 0.25
+            }
         }
     }
 }
@@ -280,6 +382,148 @@ class Settings:
             if not isinstance(notify.get(k, False), bool):
                 raise TypeError(f"NOTIFY.{k} must be a bool")
 
+        # HTTP connection pools
+        pool = settings.get("HTTP_POOL", {})
+        if not isinstance(pool, dict):
+            raise TypeError("HTTP_POOL must be a dict")
+        for k in ["POOL_CONNECTIONS", "POOL_MAXSIZE"]:
+            if not isinstance(pool.get(k), int) or pool[k] < 1:
+                raise TypeError(f"HTTP_POOL.{k} must be a positive integer")
+        if not isinstance(pool.get("POOL_BLOCK"), bool):
+            raise TypeError("HTTP_POOL.POOL_BLOCK must be a bool")
+
+        throttle = settings.get("HOST_THROTTLE", {})
+        if not isinstance(throttle, dict):
+            raise TypeError("HOST_THROTTLE must be a dict")
+        for key in ("INITIAL_CONCURRENCY", "MAX_CONCURRENCY", "MAX_RETRIES", "MAX_BACKOFF"):
+            if not isinstance(throttle.get(key), int) or throttle[key] < 1:
+                raise TypeError(f"HOST_THROTTLE.{key} must be a positive integer")
+        if throttle["INITIAL_CONCURRENCY"] > throttle["MAX_CONCURRENCY"]:
+            raise ValueError("HOST_THROTTLE.INITIAL_CONCURRENCY cannot exceed MAX_CONCURRENCY")
+
+        batching = settings.get("RPC_BATCH", {})
+        if not isinstance(batching, dict):
+            raise TypeError("RPC_BATCH must be a dict")
+        if not isinstance(batching.get("ENABLED"), bool):
+            raise TypeError("RPC_BATCH.ENABLED must be a boolean")
+        if not isinstance(batching.get("WINDOW_MS"), (int, float)) or batching["WINDOW_MS"] < 0:
+            raise TypeError("RPC_BATCH.WINDOW_MS must be a non-negative number")
+        if not isinstance(batching.get("MAX_BATCH"), int) or batching["MAX_BATCH"] < 1:
+            raise TypeError("RPC_BATCH.MAX_BATCH must be a positive integer")
+
+        caching = settings.get("ASSET_CACHE", {})
+        if not isinstance(caching, dict):
+            raise TypeError("ASSET_CACHE must be a dict")
+        if not isinstance(caching.get("MAX_ENTRIES"), int) or caching["MAX_ENTRIES"] < 1:
+            raise TypeError("ASSET_CACHE.MAX_ENTRIES must be a positive integer")
+        for key in ("IMMUTABLE_TTL", "MUTABLE_TTL"):
+            if not isinstance(caching.get(key), (int, float)) or caching[key] < 0:
+                raise TypeError(f"ASSET_CACHE.{key} must be a non-negative number")
+
+        ws = settings.get("WEBSOCKET", {})
+        if not isinstance(ws, dict):
+            raise TypeError("WEBSOCKET must be a dict")
+        if not isinstance(ws.get("CONNECTIONS"), int) or ws["CONNECTIONS"] < 1:
+            raise TypeError("WEBSOCKET.CONNECTIONS must be a positive integer")
+        if not isinstance(ws.get("ENDPOINTS"), list) or not all(
+            isinstance(url, str) and url.startswith(("ws://", "wss://")) for url in ws["ENDPOINTS"]
+        ):
+            raise TypeError("WEBSOCKET.ENDPOINTS must be a list of ws:// or wss:// URLs")
+        for key in ("RECONNECT_MIN_DELAY", "RECONNECT_MAX_DELAY"):
+            if not isinstance(ws.get(key), (int, float)) or ws[key] <= 0:
+                raise TypeError(f"WEBSOCKET.{key} must be a positive number")
+        if ws["RECONNECT_MIN_DELAY"] > ws["RECONNECT_MAX_DELAY"]:
+            raise ValueError("WEBSOCKET.RECONNECT_MIN_DELAY cannot exceed RECONNECT_MAX_DELAY")
+        if not isinstance(ws.get("BACKFILL_LIMIT"), int) or ws["BACKFILL_LIMIT"] < 0:
+            raise TypeError("WEBSOCKET.BACKFILL_LIMIT must be a non-negative integer (0 disables backfill)")
+
+        fast = settings.get("FAST_DETECTION", {})
+        if not isinstance(fast, dict):
+            raise TypeError("FAST_DETECTION must be a dict")
+        if not isinstance(fast.get("ENABLED"), bool):
+            raise TypeError("FAST_DETECTION.ENABLED must be a boolean")
+        if fast.get("COMMITMENT") not in ("processed", "confirmed"):
+            raise ValueError(f"Invalid FAST_DETECTION.COMMITMENT: {fast.get('COMMITMENT')} (must be 'processed' or 'confirmed')")
+        for key in ("FINALITY_TIMEOUT", "CHECK_INTERVAL", "TX_FETCH_DELAY"):
+            if not isinstance(fast.get(key), (int, float)) or fast[key] <= 0:
+                raise TypeError(f"FAST_DETECTION.{key} must be a positive number")
+        if not isinstance(fast.get("TX_FETCH_RETRIES"), int) or fast["TX_FETCH_RETRIES"] < 0:
+            raise TypeError("FAST_DETECTION.TX_FETCH_RETRIES must be a non-negative integer")
+
+        dedupe = settings.get("SIGNATURE_DEDUPE", {})
+        if not isinstance(dedupe, dict):
+            raise TypeError("SIGNATURE_DEDUPE must be a dict")
+        if not isinstance(dedupe.get("WINDOW_SECONDS"), (int, float)) or dedupe["WINDOW_SECONDS"] <= 0:
+            raise TypeError("SIGNATURE_DEDUPE.WINDOW_SECONDS must be a positive number")
+        if not isinstance(dedupe.get("MAX_ENTRIES"), int) or dedupe["MAX_ENTRIES"] < 2:
+            raise TypeError("SIGNATURE_DEDUPE.MAX_ENTRIES must be an integer >= 2")
+        if not isinstance(dedupe.get("BLOOM_CAPACITY"), int) or dedupe["BLOOM_CAPACITY"] < 0:
+            raise TypeError("SIGNATURE_DEDUPE.BLOOM_CAPACITY must be a non-negative integer (0 disables the Bloom filter)")
+        if not isinstance(dedupe.get("BLOOM_ERROR_RATE"), (int, float)) or not 0 < dedupe["BLOOM_ERROR_RATE"] < 1:
+            raise ValueError("SIGNATURE_DEDUPE.BLOOM_ERROR_RATE must be between 0 and 1")
+
+        # Detection pipeline
+        pipeline = settings.get("PIPELINE", {})
+        if not isinstance(pipeline, dict):
+            raise TypeError("PIPELINE must be a dict")
+        if pipeline.get("MODE") not in ("thread", "async"):
+            raise ValueError(f"Invalid PIPELINE.MODE: {pipeline.get('MODE')} (must be 'thread' or 'async')")
+        if not isinstance(pipeline.get("MAX_IN_FLIGHT"), int) or pipeline["MAX_IN_FLIGHT"] < 1:
+            raise TypeError("PIPELINE.MAX_IN_FLIGHT must be a positive integer")
+        if not isinstance(pipeline.get("WORKERS"), int) or pipeline["WORKERS"] < 1:
+            raise TypeError("PIPELINE.WORKERS must be a positive integer")
+
+        spans = settings.get("SPANS", {})
+        if not isinstance(spans, dict):
+            raise TypeError("SPANS must be a dict")
+        if not isinstance(spans.get("ENABLED"), bool):
+            raise TypeError("SPANS.ENABLED must be a boolean")
+        if not isinstance(spans.get("FILE"), str) or not spans["FILE"]:
+            raise TypeError("SPANS.FILE must be a non-empty string")
+        if not isinstance(spans.get("INTERVAL"), (int, float)) or spans["INTERVAL"] <= 0:
+            raise TypeError("SPANS.INTERVAL must be a positive number")
+        if not isinstance(spans.get("MAX_TRACES"), int) or spans["MAX_TRACES"] < 0:
+            raise TypeError("SPANS.MAX_TRACES must be a non-negative integer")
+
+        recorder = settings.get("RECORDER", {})
+        if not isinstance(recorder, dict):
+            raise TypeError("RECORDER must be a dict")
+        if not isinstance(recorder.get("ENABLED"), bool):
+            raise TypeError("RECORDER.ENABLED must be a boolean")
+        if not isinstance(recorder.get("DIR"), str) or not recorder["DIR"]:
+            raise TypeError("RECORDER.DIR must be a non-empty string")
+        if not isinstance(recorder.get("MAX_MB"), (int, float)) or recorder["MAX_MB"] <= 0:
+            raise TypeError("RECORDER.MAX_MB must be a positive number")
+
+        price_feed = settings.get("PRICE_FEED", {})
+        if not isinstance(price_feed, dict):
+            raise TypeError("PRICE_FEED must be a dict")
+        if not isinstance(price_feed.get("ENABLED"), bool):
+            raise TypeError("PRICE_FEED.ENABLED must be a boolean")
+        if price_feed.get("COMMITMENT") not in ("processed", "confirmed", "finalized"):
+            raise ValueError("PRICE_FEED.COMMITMENT must be 'processed', 'confirmed' or 'finalized'")
+        if not isinstance(price_feed.get("SOL_PRICE_REFRESH"), (int, float)) or price_feed["SOL_PRICE_REFRESH"] <= 0:
+            raise TypeError("PRICE_FEED.SOL_PRICE_REFRESH must be a positive number")
+
+        metrics = settings.get("METRICS", {})
+        if not isinstance(metrics, dict):
+            raise TypeError("METRICS must be a dict")
+        if not isinstance(metrics.get("ENABLED"), bool):
+            raise TypeError("METRICS.ENABLED must be a boolean")
+        if not isinstance(metrics.get("HOST"), str) or not metrics["HOST"]:
+            raise TypeError("METRICS.HOST must be a non-empty string")
+        port = metrics.get("PORT")
+        if not isinstance(port, int) or isinstance(port, bool) or not 0 <= port <= 65535:
+            raise ValueError("METRICS.PORT must be an integer between 0 and 65535")
+
+        trade_sync = settings.get("TRADE_SYNC", {})
+        if not isinstance(trade_sync, dict):
+            raise TypeError("TRADE_SYNC must be a dict")
+        if not isinstance(trade_sync.get("LISTEN"), bool):
+            raise TypeError("TRADE_SYNC.LISTEN must be a boolean")
+        if not isinstance(trade_sync.get("RESYNC_INTERVAL"), (int, float)) or trade_sync["RESYNC_INTERVAL"] <= 0:
+            raise TypeError("TRADE_SYNC.RESYNC_INTERVAL must be a positive number")
+
         # API rate limits
         rl = settings.get("RATE_LIMITS", {})
         if not isinstance(rl, dict):
@@ -307,6 +551,22 @@ class Settings:
             ):
                 raise TypeError(f"{api} jitter_range must be a list/tuple of 2 numbers")
 
+            if not isinstance(cfg.get("burst"), int) or cfg["burst"] < 1:
+                raise TypeError(f"{api} burst must be a positive integer")
+
+            weights = cfg.get("weights")
+            if not isinstance(weights, dict) or not all(isinstance(w, (int, float)) and w > 0 for w in weights.values()):
+                raise TypeError(f"{api} weights must be a dict of positive numbers")
+
+            quotas = cfg.get("quotas")
+            if not isinstance(quotas, dict):
+                raise TypeError(f"{api} quotas must be a dict")
+            for cls, share in quotas.items():
+                if cls not in PRIORITIES:
+                    raise ValueError(f"{api} quotas: unknown priority class {cls} (expected one of {PRIORITIES})")
+                if share is not None and not (isinstance(share, (int, float)) and 0 < share <= 1):
+                    raise TypeError(f"{api} quotas.{cls} must be a fraction in (0, 1] or null")
+
         logger.info("✅ BOT_SETTINGS validation passed")
         return True
 
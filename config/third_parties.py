@@ -14,6 +14,7 @@ JUPITER_STATION = {
     "QUOTE_ENDPOINT": "/swap/v1/quote",
     "SWAP_ENDPOINT": "/swap/v1/swap",
     "PRICE": "/price/v3",
+    "PRICE_MAX_IDS": 50,  # ids per Price API v3 request
 }
 RAYDIUM = {"BASE_URL": "https://api-v3.raydium.io", "LIQUIDITY": "/pools/info/mint"}
 SOLSCAN={
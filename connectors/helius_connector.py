@@ -1,9 +1,52 @@
-import time, json, websocket
+import time, json, copy, random, logging, threading, websocket
+from collections import OrderedDict
+from urllib.parse import urlparse
 from config.network import HELIUS_WS
-from helpers.framework_utils import get_payload
+from helpers.framework_utils import get_payload, run_bg
+from helpers.ws_frame_filter import WsFrameFilter
+from helpers.span_tracker import record_span, mark_queued
 from config.dex_detection_rules import DEX_DETECTION_RULES
 
+
+class WsLink:
+    """One redundant logsSubscribe connection and its delivery stats."""
+
+    def __init__(self, index: int, url: str):
+        self.index = index
+        self.url = url
+        self.host = urlparse(url).netloc
+        self.ws = None
+        self.connected = False
+        self.requests: dict[int, str] = {}       # subscribe request id -> dex
+        self.subscriptions: dict[int, str] = {}  # subscription id -> dex
+        self.attempts = 0
+        self.reconnects = 0
+        self.messages = 0
+        self.first = 0      # signatures this link delivered before any other
+        self.late = 0       # signatures another link delivered first
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.last_message_at = 0.0
+
+    def get_stats(self) -> dict:
+        return {
+            "connection": self.index,
+            "host": self.host,
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "messages": self.messages,
+            "first": self.first,
+            "late": self.late,
+            "lag_avg_ms": round(self.lag_total / self.late * 1000, 1) if self.late else 0.0,
+            "lag_max_ms": round(self.lag_max * 1000, 1),
+            "idle_s": round(time.time() - self.last_message_at, 1) if self.last_message_at else None,
+        }
+
+
 class HeliusConnector:
+    STATS_INTERVAL = 60
+    FIRST_SEEN_MAX = 20000
+
     def __init__(self, ctx, stop_ws,):
         self.ctx = ctx
         self.logger = ctx.get("logger")
@@ -12,80 +55,256 @@ class HeliusConnector:
 
         self.api_key = ctx.api_keys["helius"]
         self.network = ctx.settings["NETWORK"]
-        self.wss_url = HELIUS_WS[self.network] + self.api_key
+        ws_settings = ctx.settings["WEBSOCKET"]
+        self.reconnect_min = ws_settings["RECONNECT_MIN_DELAY"]
+        self.reconnect_max = ws_settings["RECONNECT_MAX_DELAY"]
+        self.backfill_limit = ws_settings["BACKFILL_LIMIT"]
+
+        endpoints = ws_settings["ENDPOINTS"] or [HELIUS_WS[self.network]]
+        self.links = [
+            WsLink(i, endpoints[i % len(endpoints)] + self.api_key)
+            for i in range(ws_settings["CONNECTIONS"])
+        ]
+        self.wss_url = self.links[0].url
+        if len(self.links) > len(set(endpoints)):
+            self.logger.warning(
+                f"⚠️ WEBSOCKET: {len(self.links)} connections share {len(set(endpoints))} endpoint(s); links to the "
+                f"same endpoint duplicate every notification without adding redundancy (add ENDPOINTS or lower CONNECTIONS)."
+            )
 
-        self.dex_name = ctx.api_keys["dex"]
-        self.dex_payload = get_payload(self.dex_name)
+        # DEX=Pumpfun or DEX=Pumpfun,Raydium: one logsSubscribe per DEX on every link
+        self.dexes = [d.strip() for d in ctx.api_keys["dex"].split(",") if d.strip()]
+        self.dex_name = self.dexes[0]
+        self.dex_payloads = {dex: get_payload(dex) for dex in self.dexes}
+        fast = ctx.settings["FAST_DETECTION"]
+        if fast["ENABLED"]:
+            for payload in self.dex_payloads.values():
+                payload["params"][1]["commitment"] = fast["COMMITMENT"]
+        self.program_ids = {dex: p["params"][0]["mentions"][0] for dex, p in self.dex_payloads.items()}
         self.id = 1
 
         # shared pipes
         self.queue = ctx.get("signature_queue")
         self.sig_seen = ctx.get("signature_seen")
-        self.sig_to_mint = ctx.get("sig_to_mint")
+        self.recorder = ctx.get("pipeline_recorder")
+
+        # raw-frame prefilter over the union of all DEX rules (a DEX without rules accepts everything);
+        # the exact per-DEX check runs once the frame's subscription is known
+        self.dex_filters = {dex: WsFrameFilter(DEX_DETECTION_RULES.get(dex, [])) for dex in self.dexes}
+        union = [] if any(not f.rules for f in self.dex_filters.values()) else [
+            rule for f in self.dex_filters.values() for rule in f.rules
+        ]
+        self.frame_filter = WsFrameFilter(list(dict.fromkeys(union)))
+
+        # cross-link delivery tracking: signature -> first arrival; last signature per DEX for gap backfill
+        self.lock = threading.Lock()
+        self.first_seen: OrderedDict[str, float] = OrderedDict()
+        self.last_signature: dict[str, str] = {}
+        self.outage_until: dict[str, str] = {}  # last signatures seen before every link went down
+        self.detected = dict.fromkeys(self.dexes, 0)
+        self.backfilled = 0
 
     def start_ws(self):
-        self.logger.info(f"🌐 Connecting WS: {self.wss_url}")
+        self.logger.info(f"🌐 Connecting {len(self.links)} WS link(s): {', '.join(link.host for link in self.links)} for {', '.join(self.dexes)}")
         self.logger.info(f"trades count:{self.ctx.settings['MAXIMUM_TRADES']}, dollars per trade:{self.ctx.settings['TRADE_AMOUNT']}")
-        self.ws = websocket.WebSocketApp(
-            self.wss_url,
-            on_open=self.on_open,
-            on_message=self.on_message,
-            on_error=self.on_error,
-            on_close=self.on_close,
-        )
+        self.logger.info(f"🧾 WS frame decoder: {self.frame_filter.decoder_name}")
+        threads = []
+        for link in self.links:
+            t = threading.Thread(target=self._run_link, args=(link,), daemon=True, name=f"WebSocket-{link.index}")
+            t.start()
+            threads.append(t)
+        for t in threads:
+            t.join()
+
+    def _run_link(self, link: WsLink):
         while not self.stop_ws.is_set():
+            link.ws = websocket.WebSocketApp(
+                link.url,
+                on_open=lambda ws: self.on_open(link, ws),
+                on_message=lambda ws, message: self.on_message(link, ws, message),
+                on_error=lambda ws, error: self.on_error(link, ws, error),
+                on_close=lambda ws, code, msg: self.on_close(link, ws, code, msg),
+            )
             try:
-                self.ws.run_forever()
+                link.ws.run_forever()
             except Exception as e:
-                self.logger.error(f"❌ WebSocket error: {e}")
+                self.logger.error(f"❌ WebSocket error [{link.index}]: {e}")
+            self._mark_down(link)
 
             if not self.stop_ws.is_set():
-                self.logger.warning("🔄 Reconnecting in 5s...")
-                time.sleep(5)
+                # exponential backoff with jitter; reset once a connection opens
+                delay = min(self.reconnect_max, self.reconnect_min * 2 ** link.attempts)
+                delay += random.uniform(0, delay * 0.25)
+                link.attempts += 1
+                link.reconnects += 1
+                self.logger.warning(f"🔄 WS [{link.index}] reconnecting in {delay:.1f}s...")
+                self.stop_ws.wait(delay)
 
-    def on_open(self, ws):
-        self.dex_payload["id"] = self.id; self.id += 1
-        ws.send(json.dumps(self.dex_payload))
-        self.logger.info("✅ Subscribed to AMM logs.")
+    def on_open(self, link: WsLink, ws):
+        payloads = []
+        with self.lock:
+            link.requests.clear()
+            link.subscriptions.clear()
+            for dex, template in self.dex_payloads.items():
+                payload = copy.deepcopy(template)
+                payload["id"] = self.id; self.id += 1
+                link.requests[payload["id"]] = dex
+                payloads.append(payload)
+            link.connected = True
+            link.attempts = 0
+            gap_until, self.outage_until = self.outage_until, {}
+        for payload in payloads:
+            ws.send(json.dumps(payload))
+        self.logger.info(f"✅ Subscribed to AMM logs [{link.index}] via {link.host}: {', '.join(self.dexes)}.")
+        if self.backfill_limit:
+            for dex, until in gap_until.items():
+                run_bg(self._backfill, dex, until, name=f"WsBackfill-{dex}")
 
-    def on_message(self, ws, message):
+    def _mark_down(self, link: WsLink):
+        with self.lock:
+            if not link.connected:
+                return
+            link.connected = False
+            if not any(other.connected for other in self.links):
+                self.outage_until = {**self.last_signature, **self.outage_until}
+
+    def on_message(self, link: WsLink, ws, message):
         try:
-            data = json.loads(message)
-            self.logger.debug(f"ws response:{data}")
-            value = data.get("params", {}).get("result", {}).get("value", {})
-            if not value:
+            received = time.monotonic()
+            link.messages += 1
+            link.last_message_at = time.time()
+            marker = b"logsNotification" if isinstance(message, (bytes, bytearray)) else "logsNotification"
+            if marker not in message:
+                self._on_control(link, message)
+                return
+            if self.recorder:
+                self.recorder.ws_frame(link.index, message)
+            parsed = self.frame_filter.parse(message)
+            if not parsed:
                 return
-            signature = value.get("signature")
-            logs = value.get("logs", [])
-            if not signature:
+            signature, logs, subscription = parsed
+            dex = link.subscriptions.get(subscription, self.dex_name)
+            if len(self.dexes) > 1 and not self.dex_filters[dex].logs_match(logs):
                 return
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"ws response [{link.index}/{dex}]: {signature} ({len(logs)} logs)")
 
-            # quick filter with rules
-            rules = DEX_DETECTION_RULES.get(self.dex_name, [])
-            if rules and not any(any(rule in log for rule in rules) for log in logs):
+            if not self._record_arrival(link, signature, dex):
                 return
 
             # de-dupe
-            with self.ctx.get("signature_seen_lock"):
-                if signature in self.sig_seen:
-                    return
-                self.sig_seen.add(signature)
-            self.queue.put((signature, None, None, "LIVE"))
+            if self.sig_seen.check_and_add(signature):
+                return
+            mark_queued(signature)
+            self.queue.put((signature, None, None, "LIVE", dex))
+            record_span("ws_receive", time.monotonic() - received, signature)
         except Exception as e:
             self.logger.error(f"❌ on_message error: {e}", exc_info=True)
 
-    def on_error(self, ws, error):
-        self.logger.error(f"WS error: {error}")
+    def _on_control(self, link: WsLink, message):
+        """Subscription acks: map the subscription id to the DEX it was requested for."""
+        data = self.frame_filter.loads(message)
+        dex = link.requests.pop(data.get("id"), None)
+        if dex is None:
+            return
+        if "error" in data:
+            self.logger.error(f"❌ WS [{link.index}] {dex} subscription failed: {data['error']}")
+            return
+        with self.lock:
+            link.subscriptions[data.get("result")] = dex
+        if self.recorder:
+            self.recorder.ws_subscription(link.index, data.get("result"), dex)
+
+    def _record_arrival(self, link: WsLink, signature: str, dex: str) -> bool:
+        """Track which link delivered `signature` first; False if another link already did."""
+        now = time.monotonic()
+        with self.lock:
+            first = self.first_seen.get(signature)
+            if first is None:
+                self.first_seen[signature] = now
+                if len(self.first_seen) > self.FIRST_SEEN_MAX:
+                    self.first_seen.popitem(last=False)
+                self.last_signature[dex] = signature
+                self.detected[dex] += 1
+                link.first += 1
+                return True
+            lag = now - first
+            link.late += 1
+            link.lag_total += lag
+            link.lag_max = max(link.lag_max, lag)
+            return False
+
+    def _backfill(self, dex: str, until: str):
+        """Queue matching `dex` program txs that landed while every link was down (newest `BACKFILL_LIMIT`)."""
+        sm = self.ctx.get("solana_manager")
+        missed, before = [], None
+        while len(missed) < self.backfill_limit:
+            page = self.ctx.get("helius_client").get_recent_transactions_signatures_for_token(self.program_ids[dex], until, before)
+            if not page:
+                break
+            missed.extend(t["signature"] for t in page if isinstance(t, dict) and not t.get("err"))
+            if len(page) < 1000:
+                break
+            before = page[-1]["signature"]
+        missed = [sig for sig in missed[:self.backfill_limit] if sig not in self.sig_seen]
+        if not missed:
+            self.logger.info(f"🩹 WS gap backfill ({dex}): nothing missed.")
+            return
+
+        txs = sm.get_transactions_data(missed)
+        queued = 0
+        for sig in reversed(missed):  # oldest first
+            tx = txs.get(sig)
+            logs = (tx or {}).get("meta", {}).get("logMessages") or []
+            if not tx or not self.dex_filters[dex].logs_match(logs):
+                continue
+            if self.sig_seen.check_and_add(sig):
+                continue
+            mark_queued(sig)
+            self.queue.put((sig, tx, None, "BACKFILL", dex))
+            queued += 1
+        with self.lock:
+            self.backfilled += queued
+        self.logger.info(f"🩹 WS gap backfill ({dex}): {len(missed)} missed tx(s), {queued} matching queued.")
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            connections = [link.get_stats() for link in self.links]
+            detected = dict(self.detected)
+            backfilled = self.backfilled
+        return {
+            "filter": self.frame_filter.get_stats(),
+            "connections": connections,
+            "detected": detected,
+            "backfilled": backfilled,
+        }
+
+    def report_stats(self, stop_event):
+        while not stop_event.wait(self.STATS_INTERVAL):
+            stats = self.get_stats()
+            links = ", ".join(
+                f"[{c['connection']}] {'up' if c['connected'] else 'down'} first={c['first']} "
+                f"lag={c['lag_avg_ms']}ms/{c['lag_max_ms']}ms"
+                for c in stats["connections"]
+            )
+            dexes = ", ".join(f"{dex}={n}" for dex, n in stats["detected"].items())
+            self.logger.info(f"📡 WS links: {links}, detected: {dexes}, backfilled={stats['backfilled']}")
 
-    def on_close(self, ws, code, msg):
+    def on_error(self, link: WsLink, ws, error):
+        self.logger.error(f"WS error [{link.index}]: {error}")
+
+    def on_close(self, link: WsLink, ws, code, msg):
+        self._mark_down(link)
         if self.stop_ws.is_set():
-            self.logger.info("🛑 WS closed due to shutdown.")
+            self.logger.info(f"🛑 WS [{link.index}] closed due to shutdown.")
             return
-        self.logger.warning(f"WS closed (code={code}) {msg}")
+        self.logger.warning(f"WS [{link.index}] closed (code={code}) {msg}")
 
     def close(self):
         self.stop_ws.set()
-        try:
-            self.ws.close()
-        except Exception:
-            pass
+        for link in self.links:
+            try:
+                if link.ws:
+                    link.ws.close()
+            except Exception:
+                pass
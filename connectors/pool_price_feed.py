@@ -0,0 +1,289 @@
+import time, json, random, threading, websocket
+from services.bot_context import BotContext
+from helpers.framework_utils import run_bg
+from config.dex_detection_rules import KNOWN_BASES
+
+
+class WatchedPool:
+    """Reserves of one open position's pool, kept current by two vault subscriptions."""
+
+    def __init__(self, mint: str, pool: str, token_vault: dict, base_vault: dict):
+        self.mint = mint
+        self.pool = pool
+        self.vaults = {"token": token_vault["pub_key"], "base": base_vault["pub_key"]}
+        self.decimals = {"token": token_vault["decimals"], "base": base_vault["decimals"]}
+        self.reserves = {"token": token_vault["amount"], "base": base_vault["amount"]}
+        self.base_symbol = KNOWN_BASES[base_vault["mint"]]["symbol"]
+        self.subscriptions: dict[str, int] = {}  # role -> subscription id
+        self.slot = 0
+        self.updated_at = time.time()
+
+
+class PoolPriceFeed:
+    """Streams open positions' prices from `accountSubscribe` on their pool vaults.
+
+    Every reserve change is priced with `LiquidityAnalyzer.calculate_on_chain_price` and pushed to the
+    tracker as a tick; positions whose pool is unknown or not (yet) subscribed keep using Jupiter polling.
+    """
+
+    UNRESOLVED_RETRY = 60  # seconds before retrying a mint whose pool could not be resolved
+
+    def __init__(self, ctx: BotContext, stop_event: threading.Event):
+        self.ctx = ctx
+        self.logger = ctx.get("logger")
+        self.stop_event = stop_event
+        cfg = ctx.settings["PRICE_FEED"]
+        self.commitment = cfg["COMMITMENT"]
+        self.sol_price_refresh = cfg["SOL_PRICE_REFRESH"]
+        ws_settings = ctx.settings["WEBSOCKET"]
+        self.reconnect_min = ws_settings["RECONNECT_MIN_DELAY"]
+        self.reconnect_max = ws_settings["RECONNECT_MAX_DELAY"]
+        self.url = ctx.get("ws_url")
+
+        self.lock = threading.Lock()
+        self.ws = None
+        self.connected = False
+        self.attempts = 0
+        self.id = 1
+        self.pools: dict[str, WatchedPool] = {}
+        self.requests: dict[int, tuple[str, str]] = {}       # subscribe request id -> (mint, role)
+        self.subscriptions: dict[int, tuple[str, str]] = {}  # subscription id -> (mint, role)
+        self.resolving: set[str] = set()
+        self.unresolved: dict[str, float] = {}                # mint -> last failed lookup
+        self.sol_price = 0.0
+        self.sol_price_at = 0.0
+        self.ticks = 0
+        self.reconnects = 0
+
+    # --- positions -------------------------------------------------------
+
+    def track(self, mints) -> None:
+        """Subscribe pools of newly opened positions and drop those of closed ones."""
+        mints = set(mints)
+        self._refresh_sol_price()
+        now = time.time()
+        with self.lock:
+            closed = [self.pools.pop(mint) for mint in list(self.pools) if mint not in mints]
+            new = [
+                mint for mint in mints
+                if mint not in self.pools and mint not in self.resolving
+                and now - self.unresolved.get(mint, 0) > self.UNRESOLVED_RETRY
+            ]
+            self.resolving.update(new)
+            self.unresolved = {m: t for m, t in self.unresolved.items() if m in mints}
+        for watched in closed:
+            self._unsubscribe(watched)
+        for mint in new:
+            run_bg(self._watch, mint, name=f"PriceFeed-{mint[:6]}")
+
+    def _watch(self, mint: str) -> None:
+        try:
+            watched = self._resolve(mint)
+        finally:
+            with self.lock:
+                self.resolving.discard(mint)
+        if watched is None:
+            with self.lock:
+                self.unresolved[mint] = time.time()
+            return
+        with self.lock:
+            self.pools[mint] = watched
+        self._subscribe(watched)
+        self._publish(watched)
+
+    def _resolve(self, mint: str) -> WatchedPool | None:
+        analyzer = self.ctx.get("liquidity_analyzer")
+        entry = analyzer.token_pools.get(mint)
+        pool = entry["pool"] if isinstance(entry, dict) else entry
+        if not pool:
+            pool = self.ctx.get("liquidity_dao").get_pool_address(mint)
+        if not pool:
+            self.logger.debug(f"📡 No pool known for {mint}, price stays on Jupiter polling.")
+            return None
+        vaults = self.ctx.get("helius_client").get_token_accounts_by_owner(pool) or []
+        token_vault = next((v for v in vaults if v["mint"] == mint), None)
+        base_vault = next((v for v in vaults if v["mint"] in KNOWN_BASES), None)
+        if not token_vault or not base_vault:
+            self.logger.warning(f"⚠️ Pool {pool} of {mint} has no token/base vault pair, price stays on Jupiter polling.")
+            return None
+        return WatchedPool(mint, pool, token_vault, base_vault)
+
+    def get_price(self, mint: str) -> float | None:
+        """Latest streamed USD price, or None while the pool is not live on the feed."""
+        with self.lock:
+            watched = self.pools.get(mint)
+            if not self.connected or watched is None or len(watched.subscriptions) < 2:
+                return None
+            return self._price(watched)
+
+    def _price(self, watched: WatchedPool) -> float | None:
+        if watched.base_symbol == "SOL" and not self.sol_price:
+            return None
+        price = self.ctx.get("liquidity_analyzer").calculate_on_chain_price(
+            reserve_token=watched.reserves["token"],
+            token_decimals=watched.decimals["token"],
+            reserve_base=watched.reserves["base"],
+            base_decimals=watched.decimals["base"],
+            base_symbol=watched.base_symbol,
+            sol_price=self.sol_price,
+        )
+        return price or None
+
+    def _refresh_sol_price(self) -> None:
+        if time.time() - self.sol_price_at < self.sol_price_refresh:
+            return
+        try:
+            self.sol_price = self.ctx.get("jupiter_client").get_sol_price()
+            self.sol_price_at = time.time()
+        except Exception as e:
+            self.logger.warning(f"⚠️ Price feed could not refresh SOL price: {e}")
+
+    # --- websocket -------------------------------------------------------
+
+    def run(self, stop_event: threading.Event) -> None:
+        self.logger.info(f"📡 Pool price feed connecting ({self.commitment})")
+        while not stop_event.is_set():
+            self.ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self.on_open,
+                on_message=self.on_message,
+                on_error=lambda ws, error: self.logger.error(f"Price feed WS error: {error}"),
+                on_close=self.on_close,
+            )
+            try:
+                self.ws.run_forever()
+            except Exception as e:
+                self.logger.error(f"❌ Price feed WebSocket error: {e}")
+            self._mark_down()
+
+            if not stop_event.is_set():
+                delay = min(self.reconnect_max, self.reconnect_min * 2 ** self.attempts)
+                delay += random.uniform(0, delay * 0.25)
+                self.attempts += 1
+                self.reconnects += 1
+                self.logger.warning(f"🔄 Price feed reconnecting in {delay:.1f}s...")
+                stop_event.wait(delay)
+
+    def on_open(self, ws):
+        with self.lock:
+            self.connected = True
+            self.attempts = 0
+            pools = list(self.pools.values())
+        for watched in pools:
+            self._subscribe(watched)
+        self.logger.info(f"✅ Price feed connected, {len(pools)} pool(s) subscribed.")
+
+    def _mark_down(self) -> None:
+        with self.lock:
+            self.connected = False
+            self.requests.clear()
+            self.subscriptions.clear()
+            for watched in self.pools.values():
+                watched.subscriptions.clear()
+
+    def on_close(self, ws, code, msg):
+        self._mark_down()
+        if not self.stop_event.is_set():
+            self.logger.warning(f"Price feed WS closed (code={code}) {msg}")
+
+    def _send(self, payload: dict) -> None:
+        ws = self.ws
+        if ws is None or not self.connected:
+            return
+        try:
+            ws.send(json.dumps(payload))
+        except Exception as e:
+            self.logger.warning(f"⚠️ Price feed send failed: {e}")
+
+    def _subscribe(self, watched: WatchedPool) -> None:
+        payloads = []
+        with self.lock:
+            if not self.connected:
+                return  # on_open subscribes every watched pool
+            for role, account in watched.vaults.items():
+                request_id = self.id; self.id += 1
+                self.requests[request_id] = (watched.mint, role)
+                payloads.append({
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": "accountSubscribe",
+                    "params": [account, {"encoding": "jsonParsed", "commitment": self.commitment}],
+                })
+        for payload in payloads:
+            self._send(payload)
+
+    def _unsubscribe(self, watched: WatchedPool) -> None:
+        payloads = []
+        with self.lock:
+            for sid in watched.subscriptions.values():
+                self.subscriptions.pop(sid, None)
+                payloads.append({"jsonrpc": "2.0", "id": self.id, "method": "accountUnsubscribe", "params": [sid]})
+                self.id += 1
+        for payload in payloads:
+            self._send(payload)
+
+    def on_message(self, ws, message):
+        try:
+            data = json.loads(message)
+            if data.get("method") != "accountNotification":
+                self._on_control(data)
+                return
+            params = data["params"]
+            result = params["result"]
+            with self.lock:
+                target = self.subscriptions.get(params["subscription"])
+                watched = self.pools.get(target[0]) if target else None
+                if watched is None:
+                    return
+                amount = result["value"]["data"]["parsed"]["info"]["tokenAmount"]["amount"]
+                watched.reserves[target[1]] = int(amount)
+                watched.slot = result.get("context", {}).get("slot", watched.slot)
+                watched.updated_at = time.time()
+                self.ticks += 1
+            self._publish(watched)
+        except Exception as e:
+            self.logger.error(f"❌ Price feed message error: {e}", exc_info=True)
+
+    def _on_control(self, data: dict) -> None:
+        with self.lock:
+            target = self.requests.pop(data.get("id"), None)
+            if target is None:
+                return
+            if "error" in data:
+                self.logger.error(f"❌ Price feed subscription for {target[0]} failed: {data['error']}")
+                return
+            sid = data.get("result")
+            watched = self.pools.get(target[0])
+            if watched is not None:
+                self.subscriptions[sid] = target
+                watched.subscriptions[target[1]] = sid
+                return
+            # position closed before the ack arrived
+            payload = {"jsonrpc": "2.0", "id": self.id, "method": "accountUnsubscribe", "params": [sid]}
+            self.id += 1
+        self._send(payload)
+
+    def _publish(self, watched: WatchedPool) -> None:
+        price = self.get_price(watched.mint)
+        if price is not None:
+            self.ctx.get("open_position_tracker").on_price_tick(watched.mint, price)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            live = sum(1 for w in self.pools.values() if len(w.subscriptions) == 2)
+            return {
+                "connected": self.connected,
+                "pools": len(self.pools),
+                "live": live,
+                "resolving": len(self.resolving),
+                "unresolved": len(self.unresolved),
+                "ticks": self.ticks,
+                "reconnects": self.reconnects,
+            }
+
+    def close(self) -> None:
+        try:
+            if self.ws:
+                self.ws.close()
+        except Exception:
+            pass
@@ -0,0 +1,111 @@
+import time
+import zlib
+import threading
+from collections import deque
+from queue import Empty
+from threading import Event
+from services.bot_context import BotContext
+from helpers.mint_work_queue import MintWorkQueue
+from helpers.span_tracker import record_queue_wait
+
+
+class SignatureWorkerPool:
+    """N TxHandler workers; every mint is pinned to one worker so a token is never processed twice at once."""
+
+    STATS_INTERVAL = 60
+
+    def __init__(self, ctx: BotContext, workers: int):
+        self.ctx = ctx
+        self.logger = ctx.get("logger")
+        self.transaction_manager = ctx.get("transaction_manager")
+        self.workers = workers
+        # shards share the main queue's generations, so _cleanup_mint cancels forwarded work too
+        main = ctx.get("signature_queue")
+        self.shards = [MintWorkQueue(generations=main.generations) for _ in range(workers)]
+        self.lock = threading.Lock()
+        self.busy = [deque() for _ in range(workers)]  # (finished_at, seconds) of the last 60s
+        self.processed = [0] * workers
+        self.forwarded = 0
+        self.started_at = time.time()
+
+    def shard_for(self, token_mint: str) -> int:
+        return zlib.crc32(token_mint.encode()) % self.workers
+
+    def run_worker(self, stop_event: Event, index: int) -> None:
+        tm = self.transaction_manager
+        while not stop_event.is_set():
+            item = self._next_item(index)
+            if not item:
+                continue
+            sig, tx_data, token_mint, source, dex = item
+            record_queue_wait(sig)
+            started = time.time()
+            try:
+                if not token_mint:
+                    # unknown mint: any worker may resolve it, only the owner processes it
+                    resolved = tm.resolve_signature(sig, tx_data)
+                    if not resolved:
+                        continue
+                    tx_data, token_mint = resolved
+                owner = self.shard_for(token_mint)
+                if owner != index:
+                    self.shards[owner].put((sig, tx_data, token_mint, source, dex), lane="PREFETCH" if source == "PREFETCH" else "LIVE")
+                    with self.lock:
+                        self.forwarded += 1
+                    continue
+                self.logger.debug(f"⚡ Worker {index} processing {dex or '?'} signature {sig} from {source}")
+                tm.process_signature(sig, tx_data, token_mint)
+                with self.lock:
+                    self.processed[index] += 1
+            finally:
+                self._record_busy(index, started)
+
+    def _next_item(self, index: int) -> tuple | None:
+        try:
+            return self.shards[index].get_nowait()
+        except Empty:
+            pass
+        try:
+            return self.ctx.get("signature_queue").get(timeout=0.05)
+        except Empty:
+            return None
+
+    def _record_busy(self, index: int, started: float) -> None:
+        now = time.time()
+        with self.lock:
+            window = self.busy[index]
+            window.append((now, now - started))
+            while window and now - window[0][0] > 60:
+                window.popleft()
+
+    def get_stats(self) -> dict:
+        """Queue depths + per-worker utilisation (busy share of the last 60s)."""
+        now = time.time()
+        span = min(60, max(now - self.started_at, 1e-6))
+        with self.lock:
+            workers = []
+            for i in range(self.workers):
+                busy = sum(d for t, d in self.busy[i] if now - t <= 60)
+                workers.append({
+                    "worker": i,
+                    "shard_depth": self.shards[i].qsize(),
+                    "processed": self.processed[i],
+                    "utilisation": round(min(busy / span, 1.0), 3),
+                })
+            forwarded = self.forwarded
+        lanes = self.ctx.get("signature_queue").lane_sizes()
+        return {
+            "signature_queue": lanes["LIVE"],
+            "prefetch_queue": lanes["PREFETCH"],
+            "forwarded": forwarded,
+            "workers": workers,
+        }
+
+    def report_stats(self, stop_event: Event) -> None:
+        while not stop_event.wait(self.STATS_INTERVAL):
+            stats = self.get_stats()
+            util = ", ".join(f"w{w['worker']}={w['utilisation']:.0%}/{w['shard_depth']}" for w in stats["workers"])
+            self.logger.info(
+                f"📊 Pipeline: signature_queue={stats['signature_queue']}, "
+                f"prefetch_queue={stats['prefetch_queue']}, workers(util/depth): {util}"
+            )
@@ -1,4 +1,7 @@
+import time
+from threading import Event
 from services.bot_context import BotContext
+from helpers.span_tracker import span
 
 
 
@@ -21,6 +24,7 @@ class SolanaManager:
     def get_token_supply(self, mint_address: str) -> float:
         return self.ctx.get("helius_client").get_token_supply(mint_address)
 
+    @span("market_cap")
     def get_token_marketcap(self, token_mint: str) -> float:
         try:
             supply = self.ctx.get("helius_client").get_token_supply(token_mint)
@@ -33,20 +37,33 @@ class SolanaManager:
         txs = self.ctx.get("helius_client").get_recent_transactions_signatures_for_token(token_mint,until,before)
         return [t["signature"] for t in txs if isinstance(t, dict) and "signature" in t]
     
-    def get_token_age(self, mint_address: str)->int:
+    def get_token_age(self, mint_address: str, tx_data: dict = None)->int:
+        age = self.token_age_from_transaction(tx_data, mint_address)
+        if age is not None:
+            return age
         return self.ctx.get("helius_client").get_token_age(mint_address)
+
+    def token_age_from_transaction(self, tx_data: dict, mint_address: str) -> int | None:
+        """Age from the tx we already hold when it created the mint; None means an RPC lookup is needed."""
+        if not tx_data:
+            return None
+        created = self.ctx.get("liquidity_analyzer").creation_blocktime(tx_data, mint_address)
+        return max(0, int(time.time()) - created) if created else None
     
     def analyze_liquidty(self, transaction, token_mint: str,min_liq:float) -> bool:
         return self.ctx.get("liquidity_analyzer").analyze_liquidty(transaction, token_mint,min_liq)
 
-    def first_phase_tests(self,token_address:str)->bool:
-        return self.ctx.get("scam_checker").first_phase_tests(token_address)
+    def first_phase_tests(self,token_address:str, cancel: Event = None)->bool:
+        return self.ctx.get("scam_checker").first_phase_tests(token_address, cancel)
     
     def extract_token_mint(self,tx_data:dict)->str:
         return self.ctx.get("liquidity_analyzer").extract_token_mint(tx_data)
 
     def get_transaction_data(self,signature:str)->dict:
         return self.ctx.get("helius_client").get_transaction(signature) 
+
+    def get_transactions_data(self, signatures: list[str]) -> dict:
+        return self.ctx.get("helius_client").get_transactions(signatures)
     
     def second_phase_tests(self, token_mint:str, signature:str, market_cap:float)->dict:
         return self.ctx.get("scam_checker").second_phase_tests(token_mint, signature, market_cap)
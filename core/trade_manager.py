@@ -3,6 +3,8 @@ from helpers.framework_utils import run_bg, decimal_to_lamports
 from datetime import datetime, timezone
 from concurrent.futures import Future
 from helpers.framework_utils import get_formatted_date_str
+from helpers.rate_limiter import rate_priority
+from helpers.span_tracker import span, record_span
 import time
 
 
@@ -14,6 +16,8 @@ class TraderManager:
         self.pending_futures: dict[str, Future] = {}
         self.live_channel = ctx.settings_manager.get_notification_settings()["DISCORD"]["LIVE_CHANNEL"]
 
+    @rate_priority("EXECUTION")
+    @span("buy")
     def buy(self, input_mint: str, output_mint: str, usd_amount: int, sim: bool) -> str:
         self.logger.info(f"🔄 Initiating BUY for ${usd_amount} — Token: {output_mint}")
         try:
@@ -32,10 +36,12 @@ class TraderManager:
             
             if use_sender:
                 txn_64 = self.ctx.get("jupiter_client").get_swap_transaction_for_sender(quote)
-                buy_signature = self.ctx.get("helius_client").send_via_sender(txn_64)
+                with span("send"):
+                    buy_signature = self.ctx.get("helius_client").send_via_sender(txn_64)
             else:
                 txn_64 = self.ctx.get("jupiter_client").get_swap_transaction(quote)
-                buy_signature = self.ctx.get("helius_client").send_transaction(txn_64)
+                with span("send"):
+                    buy_signature = self.ctx.get("helius_client").send_transaction(txn_64)
             if not buy_signature:
                 self.logger.error(f"❌ Transaction send failed for {output_mint}")
                 return None
@@ -43,7 +49,9 @@ class TraderManager:
             self.logger.info(f"✅ Transaction submitted — signature: {buy_signature}")
 
             payload = {"output_mint": output_mint, "usd_amount": real_entry_price}
+            sent_at = time.monotonic()
             fut = run_bg(self.ctx.get("helius_client").verify_signature, buy_signature)
+            fut.add_done_callback(lambda f: record_span("confirm", time.monotonic() - sent_at, buy_signature, output_mint))
             fut.add_done_callback(lambda f: self._signature_status_callback(buy_signature, "buy", payload)(f))
             self.pending_futures[output_mint] = fut
             return buy_signature
@@ -52,6 +60,7 @@ class TraderManager:
             self.logger.error(f"❌ BUY Exception: {e}", exc_info=True)
             return None
 
+    @rate_priority("EXECUTION")
     def sell(self, input_mint: str, output_mint: str, trigger_reason: str = None, slippage_override: float = None) -> str:
         self.logger.info(f"🔄 Initiating SELL — {input_mint} → {output_mint}")
         try:
@@ -213,7 +222,7 @@ class TraderManager:
                     "simulated": False,
             })
             if tracker and token_mint in tracker.active_trades:
-                tracker.active_trades.pop(token_mint, None)
+                tracker.drop_trade(token_mint)
                 self.logger.debug(f"🧹 Removed {token_mint} from tracker cache.")
 
         except Exception as e:
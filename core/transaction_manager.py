@@ -1,11 +1,13 @@
 import time
+import asyncio
 from config.blacklist import BLACK_LIST
 from config.dex_detection_rules import KNOWN_TOKENS
-from helpers.framework_utils import run_bg,run_timer,run_prefetch
-from threading import Event
+from helpers.framework_utils import run_bg,run_timer,run_prefetch,run_check
+from helpers.span_tracker import span, record_span, bind_trace, mark_queued, record_queue_wait
+from threading import Event, BoundedSemaphore
+from concurrent.futures import wait, FIRST_COMPLETED
 from services.bot_context import BotContext
 from queue import Empty
-from threading import Event
 
 
 class TransactionManager:
@@ -18,164 +20,388 @@ class TransactionManager:
         self.min_liq = st["MIN_TOKEN_LIQUIDITY"]
         self.trade_amount = st["TRADE_AMOUNT"]
         self.sim_mode = st["SIM_MODE"]
+        # FAST_DETECTION: a tx notified at processed/confirmed may not be served by getTransaction yet
+        fast = st["FAST_DETECTION"]
+        self.tx_fetch_retries = fast["TX_FETCH_RETRIES"] if fast["ENABLED"] else 0
+        self.tx_fetch_delay = fast["TX_FETCH_DELAY"]
         self.new_tokens_channel = ctx.settings_manager.get_notification_settings()["DISCORD"]["NEW_TOKENS_CHANNEL"]
 
         self.flow_timer_by_token = {}
 
     def run(self, stop_event: Event) -> None:
         while not stop_event.is_set():
-            try:
-                sig, tx_data, token_mint, source = self.ctx.get("prefetch_queue").get_nowait()
-            except Empty:
-                try:
-                    sig, tx_data, token_mint, source = self.ctx.get("signature_queue").get(timeout=0.5)
-                except Empty:
-                    continue
-
-            self.logger.debug(f"⚡ Processing signature {sig} from {source}")
+            item = self._next_item()
+            if not item:
+                continue
+            sig, tx_data, token_mint, source, dex = item
+            record_queue_wait(sig)
+            self.logger.debug(f"⚡ Processing {dex or '?'} signature {sig} from {source}")
             self.process_signature(sig, tx_data, token_mint)
 
+    def run_async(self, stop_event: Event) -> None:
+        """Pipeline mode: every signature becomes a coroutine on the shared async runtime."""
+        runtime = self.ctx.get("async_runtime")
+        runtime.start()
+        slots = BoundedSemaphore(self.ctx.settings["PIPELINE"]["MAX_IN_FLIGHT"])
+        while not stop_event.is_set():
+            item = self._next_item()
+            if not item:
+                continue
+            sig, tx_data, token_mint, source, dex = item
+            record_queue_wait(sig)
+            self.logger.debug(f"⚡ Scheduling {dex or '?'} signature {sig} from {source}")
+            slots.acquire()
+            fut = runtime.submit(self.process_signature_async(sig, tx_data, token_mint))
+            fut.add_done_callback(lambda f: slots.release())
+
+    def _next_item(self) -> tuple | None:
+        try:
+            return self.ctx.get("signature_queue").get(timeout=0.5)
+        except Empty:
+            return None
+
     def process_signature(self, signature: str,tx_data=None, token_mint:str=None)->None:
         """Fetch tx, decide if interesting, maybe buy, notify, volume, etc."""
         try:
+            bind_trace(signature, token_mint)
+            resolved = self.resolve_signature(signature, tx_data, token_mint)
+            if not resolved:
+                return
+            result, token_mint = resolved
+            bind_trace(signature, token_mint)
+            blocktime = result.get("blockTime")    
+
+            if not self._passes_prefilters(signature, token_mint):
+                return
+
+            # age / liquidity / scam checks run together
+            verdicts, timings = self._run_gates(result, token_mint)
+            if verdicts.get("age") is False:
+                self._cleanup_mint(token_mint)
+                return
+            if verdicts.get("liquidity") is False:
+                return
+
+            self.logger.info(f"✅ Passed liquidity test — {token_mint}")
+
+            # record new token
+            self._record_new_token(signature, token_mint)
+            
+            # scam checks
+            if not verdicts.get("scam"):
+                self.logger.warning(f"❌ Scam check failed — skipping {token_mint}")
+                self._cleanup_mint(token_mint)
+                return
+            
+            self._mark_known(token_mint, signature, blocktime)
+
+            # market cap + metadata only feed the notification: fetch them while the buy goes out
+            market_cap_f = run_check(self.ctx.get("solana_manager").get_token_marketcap, token_mint)
+            meta_f = run_check(self.ctx.get("helius_client").get_token_meta_data, token_mint)
+
+            # BUY / SIM
+            if not self.ctx.get("trade_counter").reached_limit():
+                self.ctx.get("solana_manager").buy("So11111111111111111111111111111111111111112", token_mint, self.trade_amount, self.sim_mode)
+            else:
+                self.logger.critical("💥 MAXIMUM_TRADES reached — skipping trade.")
+            
+            #get token metadata (same {"name", "image", "token_address"} dict as the async path)
+            market_cap = market_cap_f.result()
+            name = (meta_f.result() or {}).get("name")
+
+            self._notify_and_schedule(token_mint, signature, name, market_cap, timings)
+
+        except Exception as e:
+            self.logger.error(f"❌ process_signature error: {e}", exc_info=True)
+
+    def _check_age(self, token_mint: str, age) -> bool:
+        if age is None or age > self.max_age:
+            self.logger.info(f"⏳ Token too old / not resolved (age={age}), skip {token_mint}.")
+            return False
+        return True
+
+    def _run_gates(self, tx_data: dict, token_mint: str) -> tuple[dict, dict]:
+        """Age, liquidity and first-phase scam checks in parallel; returns ({check: passed}, {check: seconds}).
+
+        The scam check (quote, getAsset, RugCheck) only starts once age passed, and is cancelled between its
+        calls when liquidity fails. Stops waiting as soon as age or liquidity fails. A scam failure still
+        waits for liquidity, because a token that passed it is recorded even when the scam check rejects it.
+        """
+        sm = self.ctx.get("solana_manager")
+        started = time.time()
+        cancel = Event()
+        futures = {
+            run_check(span("age")(lambda: self._check_age(token_mint, sm.get_token_age(token_mint, tx_data)))): "age",
+            run_check(span("liquidity")(sm.analyze_liquidty), tx_data, token_mint, self.min_liq): "liquidity",
+        }
+        verdicts, timings = {}, {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = futures[fut]
+                timings[name] = time.time() - started
+                try:
+                    verdicts[name] = bool(fut.result())
+                except Exception as e:
+                    self.logger.error(f"❌ {name} check failed for {token_mint}: {e}", exc_info=True)
+                    verdicts[name] = False
+                if name == "age" and verdicts[name]:
+                    scam = run_check(span("scam")(sm.first_phase_tests), token_mint, cancel)
+                    futures[scam] = "scam"
+                    pending.add(scam)
+            if verdicts.get("age") is False or verdicts.get("liquidity") is False:
+                cancel.set()
+                self._abandon_gates(token_mint, [f for f, n in futures.items() if n == "liquidity"])
+                break
+        return verdicts, timings
+
+    async def _run_gates_async(self, tx_data: dict, token_mint: str) -> tuple[dict, dict]:
+        """Coroutine twin of _run_gates (same ordering: scam starts after age passed, stops when liquidity fails)."""
+        hel = self.ctx.get("async_helius_client")
+        started = time.time()
+        cancel = Event()
+
+        async def age_check():
+            with span("age"):
+                age = self.ctx.get("solana_manager").token_age_from_transaction(tx_data, token_mint)
+                if age is None:
+                    age = await hel.get_token_age(token_mint)
+                return self._check_age(token_mint, age)
+
+        async def scam_check():
+            with span("scam"):
+                return await self.ctx.get("scam_checker").first_phase_tests_async(token_mint, cancel)
+
+        tasks = {
+            asyncio.ensure_future(age_check()): "age",
+            asyncio.ensure_future(asyncio.to_thread(
+                span("liquidity")(self.ctx.get("solana_manager").analyze_liquidty), tx_data, token_mint, self.min_liq
+            )): "liquidity",
+        }
+        verdicts, timings = {}, {}
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                timings[name] = time.time() - started
+                try:
+                    verdicts[name] = bool(task.result())
+                except Exception as e:
+                    self.logger.error(f"❌ {name} check failed for {token_mint}: {e}", exc_info=True)
+                    verdicts[name] = False
+                if name == "age" and verdicts[name]:
+                    scam = asyncio.ensure_future(scam_check())
+                    tasks[scam] = "scam"
+                    pending.add(scam)
+            if verdicts.get("age") is False or verdicts.get("liquidity") is False:
+                cancel.set()
+                self._abandon_gates(token_mint, [t for t, n in tasks.items() if n == "liquidity"])
+                for task in pending:
+                    if tasks[task] != "liquidity":
+                        task.cancel()
+                break
+        return verdicts, timings
+
+    def _abandon_gates(self, token_mint: str, liquidity_jobs: list) -> None:
+        # a rejected token must not leave the liquidity snapshot behind, even if the analyzer finishes later
+        for job in liquidity_jobs:
+            job.add_done_callback(lambda _: self.ctx.get("pending_data").pop(token_mint, None))
+
+    def resolve_signature(self, signature: str, tx_data=None, token_mint: str = None) -> tuple | None:
+        """Fetch the tx (if needed) and extract its mint; returns (tx_data, token_mint) or None."""
+        if not tx_data:
+            with span("get_transaction", signature):
+                tx_data = self._fetch_transaction(signature)
             if not tx_data:
-                tx_data = self.ctx.get("solana_manager").get_transaction_data(signature)
+                self.logger.warning(f"❌ Could not fetch transaction data for: {signature}")
+                return None
+        self.ctx.get("decimals_index").learn_from_transaction(tx_data)
+        if not token_mint:
+            with span("extract_mint", signature):
+                token_mint = self.ctx.get("solana_manager").extract_token_mint(tx_data)
+            if not token_mint:
+                return None
+        return tx_data, token_mint
+
+    def _fetch_transaction(self, signature: str) -> dict | None:
+        """getTransaction, retrying null results with a doubling delay (FAST_DETECTION.TX_FETCH_RETRIES)."""
+        sm = self.ctx.get("solana_manager")
+        tx_data = sm.get_transaction_data(signature)
+        delay = self.tx_fetch_delay
+        for _ in range(self.tx_fetch_retries):
+            if tx_data:
+                break
+            time.sleep(delay)
+            delay *= 2
+            tx_data = sm.get_transaction_data(signature)
+        return tx_data
+
+    async def _fetch_transaction_async(self, signature: str) -> dict | None:
+        """Coroutine twin of _fetch_transaction."""
+        hel = self.ctx.get("async_helius_client")
+        tx_data = await hel.get_transaction(signature)
+        delay = self.tx_fetch_delay
+        for _ in range(self.tx_fetch_retries):
+            if tx_data:
+                break
+            await asyncio.sleep(delay)
+            delay *= 2
+            tx_data = await hel.get_transaction(signature)
+        return tx_data
+
+    async def process_signature_async(self, signature: str, tx_data=None, token_mint: str = None) -> None:
+        """Coroutine twin of process_signature: RPCs are awaited, DB/trade work runs in threads."""
+        hel = self.ctx.get("async_helius_client")
+        try:
+            bind_trace(signature, token_mint)
+            if not tx_data:
+                with span("get_transaction"):
+                    tx_data = await self._fetch_transaction_async(signature)
                 if not tx_data:
                     self.logger.warning(f"❌ Could not fetch transaction data for: {signature}")
                     return
-            result = tx_data  
-            blocktime = result.get("blockTime")    
+            self.ctx.get("decimals_index").learn_from_transaction(tx_data)
+            blocktime = tx_data.get("blockTime")
 
             if not token_mint:
-                token_mint = self.ctx.get("solana_manager").extract_token_mint(tx_data)
+                with span("extract_mint"):
+                    token_mint = self.ctx.get("solana_manager").extract_token_mint(tx_data)
                 if not token_mint:
                     return
-            #map signature to token
-            self.ctx.get("sig_to_mint")[signature] = token_mint
-            
-            #start timer and prefecth transactions
-            self.start_flow_timer(token_mint)
-            run_prefetch(self._prefetch, token_mint, name=f"prefetch-{token_mint[:6]}")      
-            if token_mint in BLACK_LIST:
-                self.logger.info(f"⛔ Blacklisted token {token_mint}, skipping.")
-                return
-            
-            #if token in base tokens ignore
-            if token_mint in KNOWN_TOKENS.values():
+            bind_trace(signature, token_mint)
+            if not self._passes_prefilters(signature, token_mint):
                 return
-            
-            #if token has liquidity dont proccess it again
-            with self.ctx.get("known_tokens_lock"):
-                if token_mint in self.ctx.get("known_tokens"):
-                    self._cleanup_mint(token_mint)
-                    return
 
-            # age
-            age = self.ctx.get("solana_manager").get_token_age(token_mint)
-            if age is None or age > self.max_age:
-                self.logger.info(f"⏳ Token too old / not resolved (age={age}), skip {token_mint}.")
+            # age / liquidity (sync analyzer in a thread) / scam checks run together
+            verdicts, timings = await self._run_gates_async(tx_data, token_mint)
+            if verdicts.get("age") is False:
                 self._cleanup_mint(token_mint)
                 return
-
-            #liquidity check
-            if not self.ctx.get("solana_manager").analyze_liquidty(result, token_mint, self.min_liq):
+            if verdicts.get("liquidity") is False:
                 return
 
             self.logger.info(f"✅ Passed liquidity test — {token_mint}")
 
-            
-            market_cap = self.ctx.get("solana_manager").get_token_marketcap(token_mint)
-
             # record new token
-            pending = self.ctx.get("pending_data").pop(token_mint, None)
-            if pending:
-                try:
-                    token_id = self.ctx.get("token_dao").insert_new_token(signature, token_mint)
+            await asyncio.to_thread(self._record_new_token, signature, token_mint)
 
-                    pool_addr = pending.get("pool_address")
-                    dex = pending.get("dex")
-                    if pool_addr and dex:
-                        self.ctx.get("liquidity_dao").insert_pool(token_id, pool_addr, dex)
-
-                    self.ctx.get("liquidity_dao").insert_snapshot(token_id, pending)
-                except Exception as db_err:
-                    self.logger.error(f"💾 DB insert failed for {token_mint}: {db_err}", exc_info=True)
-            
             # scam checks
-            if not self.ctx.get("solana_manager").first_phase_tests(token_mint):
+            if not verdicts.get("scam"):
                 self.logger.warning(f"❌ Scam check failed — skipping {token_mint}")
                 self._cleanup_mint(token_mint)
                 return
-            
-            #add tokens passed liquidity and first pahse of tests
-            with self.ctx.get("known_tokens_lock"):   
-                self.ctx.get("known_tokens").add(token_mint)
-                self._cleanup_mint(token_mint)
 
-            # volume snapshot async
-            future = run_bg(self.ctx.get("volume_tracker")._volume_worker, token_mint,signature,blocktime, name=f"vol-{token_mint[:6]}")
-            self.ctx.get("volume_tracker").volume_futures[token_mint] = future
+            self._mark_known(token_mint, signature, blocktime)
 
+            # market cap + metadata only feed the notification: fetch them while the buy goes out
+            market_cap_t = asyncio.ensure_future(self._get_token_marketcap_async(token_mint))
+            meta_t = asyncio.ensure_future(hel.get_token_meta_data(token_mint))
 
             # BUY / SIM
             if not self.ctx.get("trade_counter").reached_limit():
-                self.ctx.get("solana_manager").buy("So11111111111111111111111111111111111111112", token_mint, self.trade_amount, self.sim_mode)
+                await asyncio.to_thread(
+                    self.ctx.get("solana_manager").buy,
+                    "So11111111111111111111111111111111111111112", token_mint, self.trade_amount, self.sim_mode,
+                )
             else:
                 self.logger.critical("💥 MAXIMUM_TRADES reached — skipping trade.")
-            
-            #get token metadata
-            name,image,_=self.ctx.get("helius_client").get_token_meta_data(token_mint)
-
-
-            # Notify
-            dur = self._pop_flow_duration(token_mint)
-            msg = (
-                f"🟢 **New token detected**\n"
-                f"• token_name:`{name}`\n"
-                f"• token_address: `{token_mint}`\n"
-                f"• signature: `{signature}`\n"
-                f"• Flow duration: {dur:,.2f}\n"
-            )
-            self.ctx.get("notification_manager").notify_text(msg, self.new_tokens_channel)
-
-            # delayed post-buy checks
-            run_timer(
-                60.0,
-                self._delayed_post_buy_handler,
-                token_mint,signature, market_cap,
-                name=f"postcheck-{token_mint[:6]}"
-            )
+
+            market_cap, meta = await asyncio.gather(market_cap_t, meta_t)
+            await asyncio.to_thread(self._notify_and_schedule, token_mint, signature, meta.get("name"), market_cap, timings)
 
         except Exception as e:
-            self.logger.error(f"❌ process_signature error: {e}", exc_info=True)
-    
-    def _cleanup_mint(self, token_mint: str) -> None:
-        for sig, mint in list(self.ctx.get("sig_to_mint").items()):
-            if mint == token_mint:
-                self.ctx.get("sig_to_mint").pop(sig, None)
-        try:
-            q = self.ctx.get("signature_queue")
-            items = []
-            while not q.empty():
-                sig, tx_data, mint, source = q.get_nowait()
-                if mint != token_mint:
-                    items.append((sig, tx_data, mint, source))
-            for item in items:
-                q.put(item)
-        except Exception:
-            pass
+            self.logger.error(f"❌ process_signature_async error: {e}", exc_info=True)
+
+    async def _get_token_marketcap_async(self, token_mint: str) -> float:
         try:
-            q = self.ctx.get("prefetch_queue")
-            items = []
-            while not q.empty():
-                sig, tx_data, mint, source = q.get_nowait()
-                if mint != token_mint:
-                    items.append((sig, tx_data, mint, source))
-            for item in items:
-                q.put(item)
-        except Exception:
-            pass
+            with span("market_cap"):
+                supply, price = await asyncio.gather(
+                    self.ctx.get("async_helius_client").get_token_supply(token_mint),
+                    self.ctx.get("async_jupiter_client").get_token_price(token_mint),
+                )
+            return price * supply
+        except Exception as e:
+            self.logger.error(f"error retriving market cap {e}")
+
+    def _passes_prefilters(self, signature: str, token_mint: str) -> bool:
+        #start timer and prefecth transactions
+        self.start_flow_timer(token_mint)
+        run_prefetch(self._prefetch, token_mint, name=f"prefetch-{token_mint[:6]}")
+        if token_mint in BLACK_LIST:
+            self.logger.info(f"⛔ Blacklisted token {token_mint}, skipping.")
+            return False
+
+        #if token in base tokens ignore
+        if token_mint in KNOWN_TOKENS.values():
+            return False
 
+        #if token has liquidity dont proccess it again
+        with self.ctx.get("known_tokens_lock"):
+            if token_mint in self.ctx.get("known_tokens"):
+                self._cleanup_mint(token_mint)
+                return False
+        return True
+
+    def _record_new_token(self, signature: str, token_mint: str) -> None:
+        pending = self.ctx.get("pending_data").pop(token_mint, None)
+        if pending:
+            try:
+                token_id = self.ctx.get("token_dao").insert_new_token(signature, token_mint)
+
+                pool_addr = pending.get("pool_address")
+                dex = pending.get("dex")
+                if pool_addr and dex:
+                    self.ctx.get("liquidity_dao").insert_pool(token_id, pool_addr, dex)
+
+                self.ctx.get("liquidity_dao").insert_snapshot(token_id, pending)
+            except Exception as db_err:
+                self.logger.error(f"💾 DB insert failed for {token_mint}: {db_err}", exc_info=True)
+
+        # FAST_DETECTION: the detection tx is not final yet; undo this record if it gets dropped
+        finality = self.ctx.get("finality_checker")
+        if finality:
+            finality.track(signature, token_mint)
+
+    def _mark_known(self, token_mint: str, signature: str, blocktime: int) -> None:
+        #add tokens passed liquidity and first pahse of tests
+        with self.ctx.get("known_tokens_lock"):   
+            self.ctx.get("known_tokens").add(token_mint)
+            self._cleanup_mint(token_mint)
+        self.ctx.get("decimals_index").keep(token_mint)
+
+        # volume snapshot async
+        future = run_bg(self.ctx.get("volume_tracker")._volume_worker, token_mint,signature,blocktime, name=f"vol-{token_mint[:6]}")
+        self.ctx.get("volume_tracker").volume_futures[token_mint] = future
+
+    def _notify_and_schedule(self, token_mint: str, signature: str, name: str, market_cap: float, timings: dict = None) -> None:
+        # Notify (flow duration = critical path: slowest parallel check + record + buy + notification data)
+        dur = self._pop_flow_duration(token_mint)
+        record_span("flow", dur, signature, token_mint)
+        slowest = max(timings, key=timings.get) if timings else None
+        checks = ", ".join(f"{check} {secs:.2f}s" for check, secs in (timings or {}).items())
+        self.logger.info(f"⏱️ Flow {token_mint}: {dur:.2f}s, checks: {checks or 'n/a'}")
+        msg = (
+            f"🟢 **New token detected**\n"
+            f"• token_name:`{name}`\n"
+            f"• token_address: `{token_mint}`\n"
+            f"• signature: `{signature}`\n"
+            f"• Flow duration: {dur:,.2f}" + (f" (slowest check: {slowest} {timings[slowest]:.2f}s)" if slowest else "") + "\n"
+        )
+        self.ctx.get("notification_manager").notify_text(msg, self.new_tokens_channel)
+
+        # delayed post-buy checks
+        run_timer(
+            60.0,
+            self._delayed_post_buy_handler,
+            token_mint,signature, market_cap,
+            name=f"postcheck-{token_mint[:6]}"
+        )
+    
+    def _cleanup_mint(self, token_mint: str) -> None:
+        # O(1): queued items for this mint become stale and are skipped when dequeued
+        self.ctx.get("signature_queue").cancel(token_mint)
         self.logger.debug(f"🧹 Cleaned up {token_mint} from queues + sig map")
 
     def start_flow_timer(self, token_mint:str)->None:
@@ -189,12 +415,19 @@ class TransactionManager:
     def _prefetch(self, token_mint: str):
         try:
             sinagures = self.ctx.get("solana_manager").get_recent_transactions_signatures_for_token(token_mint)
+            fresh = []
             for tx_sig in sinagures[1:5]:
-                with self.ctx.get("signature_seen_lock"):
-                    if tx_sig in self.ctx.get("signature_seen"):
-                        continue
-                    self.ctx.get("signature_seen").add(tx_sig)
-                self.ctx.get("prefetch_queue").put((tx_sig, None, token_mint, "PREFETCH"))
+                if self.ctx.get("signature_seen").check_and_add(tx_sig):
+                    continue
+                fresh.append(tx_sig)
+            if not fresh:
+                return
+
+            # one batched getTransaction for all early txs instead of one per worker pickup
+            txs = self.ctx.get("solana_manager").get_transactions_data(fresh)
+            for tx_sig in fresh:
+                mark_queued(tx_sig)
+                self.ctx.get("signature_queue").put((tx_sig, txs.get(tx_sig), token_mint, "PREFETCH", None), lane="PREFETCH")
                 self.logger.debug(f"🧊 Queued early tx: {tx_sig}")
         except Exception as e:
             self.logger.error(f"❌ Prefetch extra txs failed for {token_mint}: {e}")
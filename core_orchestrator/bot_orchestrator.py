@@ -2,6 +2,7 @@ import threading
 import time
 from services.open_positions import OpenPositionTracker
 from connectors.helius_connector import HeliusConnector
+from connectors.pool_price_feed import PoolPriceFeed
 from helpers.logging_manager import LoggingHandler
 from notification.notification_manager import NotificationManager
 from services.bot_context import BotContext
@@ -11,25 +12,41 @@ from helpers.rate_limiter import RateLimiter
 from helpers.rug_check_utility import RugCheckUtility
 from services.trade_counter import TradeCounter
 from helpers.requests_utility import RequestsUtility
+from helpers.host_throttle import HostThrottle
 from config.third_parties import JUPITER_STATION,BIRDEYE
 from config.network import HELIUS_URL,HELIUS_ENHANCED
 from clients.wallet_client import WalletClient
 from clients.birdeye_client import BirdeyeClient
 from clients.jupiter_client import JupiterClient
 from clients.helius_client import HeliusClient
+from clients.async_helius_client import AsyncHeliusClient
+from clients.async_jupiter_client import AsyncJupiterClient
+from helpers.async_runtime import AsyncRuntime
+from helpers.async_requests_utility import AsyncRequestsUtility
+from helpers.mint_work_queue import MintWorkQueue
+from helpers.signature_dedupe import SignatureDedupe
+from helpers.pipeline_recorder import PipelineRecorder
+from helpers.span_tracker import SpanTracker
+from helpers.framework_utils import start_check_executor
+from helpers.metrics import metrics, MetricsServer
+from services.bot_metrics import BotMetrics
 from services.liquidity_analyzer import LiquidityAnalyzer
 from services.scam_checker import ScamChecker
 from core.transaction_manager import TransactionManager
-import queue
+from core.signature_worker_pool import SignatureWorkerPool
 from core.trade_manager import TraderManager
 from threading import Lock
 from services.sql_db_utility import SqlDBUtility
+from services.trade_change_listener import TradeChangeListener
 from dao.token_dao import TokenDAO
 from dao.liquidity_dao import LiquidityDAO
 from dao.volume_dao import VolumeDAO
 from dao.scam_checker_dao import ScamCheckerDao
 from dao.trade_dao import TradeDAO
 from dao.signature_dao import SignatureDAO
+from dao.decimals_dao import DecimalsDAO
+from services.decimals_index import DecimalsIndex
+from services.finality_checker import FinalityChecker
 from config.network import HELIUS_SENDER, DEFAULT_SENDER_REGION,HELIUS_WS
 
 
@@ -43,6 +60,7 @@ class BotOrchestrator:
     def __init__(self, ctx: BotContext):
         self.ctx = ctx 
         self.settings = self.ctx.settings
+        HostThrottle.configure(self.settings["HOST_THROTTLE"])
 
         #register plain rpcs
         api_key = ctx.api_keys["helius"]
@@ -50,16 +68,18 @@ class BotOrchestrator:
         ctx.register("ws_url",  HELIUS_WS[self.settings["NETWORK"]] + api_key)
 
 
-        # shared pipelines / caches
-        ctx.register("prefetch_queue", queue.Queue(maxsize=1000))
-        ctx.register("signature_queue", queue.Queue(maxsize=1000))
+        # shared pipelines / caches (prefetched txs are a higher-priority lane of the same queue)
+        ctx.register("signature_queue", MintWorkQueue(maxsize=1000))
 
-        # dedupe structures
-        ctx.register("signature_seen", set())
-        ctx.register("signature_seen_lock", Lock())
+        # dedupe structures (bounded: recent signatures exactly, older ones in an optional Bloom filter)
+        dedupe = self.settings["SIGNATURE_DEDUPE"]
+        ctx.register("signature_seen", SignatureDedupe(
+            window=dedupe["WINDOW_SECONDS"],
+            max_entries=dedupe["MAX_ENTRIES"],
+            bloom_capacity=dedupe["BLOOM_CAPACITY"],
+            bloom_error_rate=dedupe["BLOOM_ERROR_RATE"],
+        ))
         
-
-        ctx.register("sig_to_mint", {})
         ctx.register("pending_data", {})
 
 
@@ -75,6 +95,21 @@ class BotOrchestrator:
         ctx.register("tracker_logger", LoggingHandler.get_named_logger("tracker"))
         ctx.register("notification_manager", NotificationManager(ctx))
 
+        # stage latency spans (histograms + recent per-token traces in a rolling JSON file)
+        spans_cfg = self.settings["SPANS"]
+        if spans_cfg["ENABLED"]:
+            tracker = SpanTracker(spans_cfg["FILE"], spans_cfg["INTERVAL"], spans_cfg["MAX_TRACES"])
+            ctx.register("span_tracker", tracker)
+            SpanTracker.active = tracker
+
+        # optional capture of WS frames + HTTP responses for offline replay (bot_scripts/replay_pipeline.py)
+        recorder_cfg = self.settings["RECORDER"]
+        if recorder_cfg["ENABLED"]:
+            recorder = PipelineRecorder(recorder_cfg["DIR"], recorder_cfg["MAX_MB"], self.settings["NETWORK"])
+            ctx.register("pipeline_recorder", recorder)
+            RequestsUtility.recorder = recorder
+            AsyncRequestsUtility.recorder = recorder
+
 
         #1.1 register db and dao
         ctx.register("sql_db", SqlDBUtility(ctx))
@@ -84,6 +119,8 @@ class BotOrchestrator:
         ctx.register("scam_checker_dao", ScamCheckerDao(ctx))
         ctx.register("trade_dao", TradeDAO(ctx))
         ctx.register("signatures_dao", SignatureDAO(ctx))
+        ctx.register("decimals_dao", DecimalsDAO(ctx))
+        ctx.register("decimals_index", DecimalsIndex(ctx))
 
 
         # 2. Utilities  
@@ -92,12 +129,20 @@ class BotOrchestrator:
         ctx.register("liquidity_analyzer", LiquidityAnalyzer(ctx))
         ctx.register("scam_checker", ScamChecker(ctx))
 
-        # 3. Transport / HTTP Clients
-        ctx.register("helius_requests", RequestsUtility(HELIUS_URL[self.settings["NETWORK"]]))
-        ctx.register("helius_enhanced", RequestsUtility(HELIUS_ENHANCED[self.settings["NETWORK"]]))
-        ctx.register("jupiter_requests", RequestsUtility(JUPITER_STATION["BASE_URL"]))
-        ctx.register("birdye_requests", RequestsUtility(BIRDEYE["BASE_URL"]))
-        ctx.register("helius_sender_requests",RequestsUtility(HELIUS_SENDER[self.settings["USE_SENDER"]["REGION"]]))
+        # 3. Transport / HTTP Clients (pooled keep-alive sessions)
+        ctx.register("helius_requests", self._requests(HELIUS_URL[self.settings["NETWORK"]]))
+        ctx.register("helius_enhanced", self._requests(HELIUS_ENHANCED[self.settings["NETWORK"]]))
+        ctx.register("jupiter_requests", self._requests(JUPITER_STATION["BASE_URL"]))
+        ctx.register("birdye_requests", self._requests(BIRDEYE["BASE_URL"]))
+        ctx.register("helius_sender_requests",self._requests(HELIUS_SENDER[self.settings["USE_SENDER"]["REGION"]]))
+
+        # 3.1 Async transport (pipeline mode only): one event loop + one connection pool
+        self.async_pipeline = self.settings["PIPELINE"]["MODE"] == "async"
+        if self.async_pipeline:
+            runtime = AsyncRuntime(self.settings["HTTP_POOL"])
+            ctx.register("async_runtime", runtime)
+            ctx.register("helius_async_requests", AsyncRequestsUtility(HELIUS_URL[self.settings["NETWORK"]], runtime))
+            ctx.register("jupiter_async_requests", AsyncRequestsUtility(JUPITER_STATION["BASE_URL"], runtime))
 
 
         # 4. Domain clients
@@ -105,15 +150,26 @@ class BotOrchestrator:
         ctx.register("jupiter_client", JupiterClient(ctx))
         ctx.register("birdeye_client", BirdeyeClient(ctx))
         ctx.register("wallet_client", WalletClient(ctx))
+        if self.async_pipeline:
+            ctx.register("async_helius_client", AsyncHeliusClient(ctx))
+            ctx.register("async_jupiter_client", AsyncJupiterClient(ctx))
 
         # 5. Core logic
         ctx.register("trader", TraderManager(ctx))
         ctx.register("solana_manager", SolanaManager(ctx))
         ctx.register("transaction_manager", TransactionManager(ctx))
+        workers = self.settings["PIPELINE"]["WORKERS"]
+        if not self.async_pipeline and workers > 1:
+            ctx.register("signature_worker_pool", SignatureWorkerPool(ctx, workers))
+        start_check_executor(workers)
 
         # 6. Supporting services
         ctx.register("volume_tracker", VolumeTracker(ctx))
         ctx.register("open_position_tracker", OpenPositionTracker(ctx))
+        if self.settings["TRADE_SYNC"]["LISTEN"]:
+            ctx.register("trade_change_listener", TradeChangeListener(ctx))
+        if self.settings["FAST_DETECTION"]["ENABLED"]:
+            ctx.register("finality_checker", FinalityChecker(ctx))
 
 
         self.logger = ctx.get("logger")
@@ -140,7 +196,26 @@ class BotOrchestrator:
             stop_ws=self.stops["ws"],
         )
 
+        # streamed pool prices for open positions (accountSubscribe on the pool vaults)
+        if self.settings["PRICE_FEED"]["ENABLED"]:
+            ctx.register("pool_price_feed", PoolPriceFeed(ctx, self.stops["tracker"]))
+
+        # Prometheus-style /metrics endpoint (scraped stats come from the services registered above)
+        metrics_cfg = self.settings["METRICS"]
+        if metrics_cfg["ENABLED"]:
+            metrics.add_collector(BotMetrics(ctx, self.helius_connector))
+            ctx.register("metrics_server", MetricsServer(metrics, metrics_cfg["HOST"], metrics_cfg["PORT"]))
+
         self.threads: list[threading.Thread] = []
+
+    def _requests(self, base_url: str) -> RequestsUtility:
+        pool = self.settings["HTTP_POOL"]
+        return RequestsUtility(
+            base_url,
+            pool_connections=pool["POOL_CONNECTIONS"],
+            pool_maxsize=pool["POOL_MAXSIZE"],
+            pool_block=pool["POOL_BLOCK"],
+        )
         
     def _safe_run(self, target, name, stop_event=None, *args):
         def wrapper():
@@ -161,12 +236,35 @@ class BotOrchestrator:
 
     def start(self):
         self._safe_run(self.helius_connector.start_ws, "WebSocket")
-        self._safe_run(self.transaction_handler.run, "TxHandler", self.stops["fetcher"])
+        self._safe_run(self.helius_connector.report_stats, "WsStats", self.stops["ws"])
+        self.start_pipeline()
+        if self.ctx.get("span_tracker"):
+            self._safe_run(self.ctx.get("span_tracker").run, "Spans", self.stops["tracker"])
         self._safe_run(self.tracker.track_positions, "Tracker", self.stops["tracker"])
+        if self.ctx.get("pool_price_feed"):
+            self._safe_run(self.ctx.get("pool_price_feed").run, "PriceFeed", self.stops["tracker"])
+        if self.ctx.get("finality_checker"):
+            self._safe_run(self.ctx.get("finality_checker").run, "Finality", self.stops["tracker"])
+        if self.ctx.get("trade_change_listener"):
+            self._safe_run(self.ctx.get("trade_change_listener").run, "TradeChanges", self.stops["tracker"])
         self.notification_manager.start()
+        if self.ctx.get("metrics_server"):
+            self.ctx.get("metrics_server").start()
 
         logger.info("🚀 Bot started with all components")
 
+    def start_pipeline(self):
+        """Start the signature_queue consumers for the configured PIPELINE mode."""
+        if self.async_pipeline:
+            self._safe_run(self.transaction_handler.run_async, "TxPipeline", self.stops["fetcher"])
+        elif self.ctx.get("signature_worker_pool"):
+            pool = self.ctx.get("signature_worker_pool")
+            for i in range(pool.workers):
+                self._safe_run(pool.run_worker, f"TxHandler-{i}", self.stops["fetcher"], i)
+            self._safe_run(pool.report_stats, "TxPoolStats", self.stops["fetcher"])
+        else:
+            self._safe_run(self.transaction_handler.run, "TxHandler", self.stops["fetcher"])
+
     def run_cli_loop(self):
         """Blocking CLI watcher until trades complete."""
         while True:
@@ -194,6 +292,12 @@ class BotOrchestrator:
         except Exception as e:
             logger.warning(f"⚠️ Failed to close WebSocket: {e}")
 
+        try:
+            if self.ctx.get("pool_price_feed"):
+                self.ctx.get("pool_price_feed").close()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to close price feed: {e}")
+
         # 3. Stop notifier
         try:
             self.notification_manager.shutdown()
@@ -205,5 +309,18 @@ class BotOrchestrator:
             if t.is_alive():
                 t.join(timeout=2)
 
+        # 5. Stop async runtime + release pooled HTTP connections
+        if self.async_pipeline:
+            self.ctx.get("async_runtime").shutdown()
+        for name in ("helius_requests", "helius_enhanced", "jupiter_requests", "birdye_requests", "helius_sender_requests"):
+            try:
+                self.ctx.get(name).close()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to close HTTP session {name}: {e}")
+        if self.ctx.get("pipeline_recorder"):
+            self.ctx.get("pipeline_recorder").close()
+        if self.ctx.get("metrics_server"):
+            self.ctx.get("metrics_server").stop()
+
         logger.info("🛑 Bot fully shutdown.")
     
@@ -0,0 +1,20 @@
+from services.sql_db_utility import SqlDBUtility
+from services.bot_context import BotContext
+
+
+class DecimalsDAO:
+    def __init__(self, ctx: BotContext):
+        self.sql_helper: SqlDBUtility = ctx.get("sql_db")
+
+    def get_recent_decimals(self, limit: int) -> dict[str, int]:
+        sql = "SELECT mint, decimals FROM token_decimals ORDER BY learned_at DESC LIMIT %s;"
+        rows = self.sql_helper.execute_select(sql, (limit,)) or []
+        return {r[0]: int(r[1]) for r in rows}
+
+    def insert_decimals(self, mint: str, decimals: int):
+        sql = """
+            INSERT INTO token_decimals (mint, decimals)
+            VALUES (%s, %s)
+            ON CONFLICT (mint) DO NOTHING;
+        """
+        return self.sql_helper.execute_insert(sql, (mint, decimals))
@@ -22,6 +22,20 @@ class TokenDAO:
         params = (token_mint, signature, timestamp)
         return self.sql_helper.execute_insert(sql, params)
 
+    def set_finality(self, token_mint: str, finality: str):
+        sql = "UPDATE tokens SET finality = %s WHERE token_address = %s;"
+        return self.sql_helper.execute_update(sql, (finality, token_mint))
+
+    def delete_unfinalized_token(self, token_mint: str, signature: str) -> int:
+        """Delete a token (cascading its stats/pools/snapshots) detected from `signature`, unless it was traded."""
+        sql = """
+            DELETE FROM tokens t
+            WHERE t.token_address = %s
+              AND t.signature = %s
+              AND NOT EXISTS (SELECT 1 FROM trades tr WHERE tr.token_id = t.id);
+        """
+        return self.sql_helper.execute_delete(sql, (token_mint, signature))
+
     def get_or_create_token(self, token_mint: str, signature: str | None):
         """Return token.id if exists, otherwise create it."""
         sql = "SELECT id FROM tokens WHERE token_address = %s;"
@@ -2,6 +2,9 @@ from services.sql_db_utility import SqlDBUtility
 from services.bot_context import BotContext
 from datetime import datetime, timezone
 
+# statuses of a trade the tracker still has to exit
+OPEN_TRADE_STATUSES = ("FINALIZED", "SELLING", "SIMULATED", "RECOVERED")
+
 
 class TradeDAO:
     def __init__(self, ctx: BotContext):
@@ -53,13 +56,15 @@ class TradeDAO:
                 t.trade_type,
                 t.entry_usd,
                 t.timestamp,
-                t.simulation
+                t.simulation,
+                t.status,
+                t.version
             FROM trades t
             JOIN tokens tok ON t.token_id = tok.id
-            WHERE t.status IN ('FINALIZED', 'SELLING', 'SIMULATED', 'RECOVERED')
+            WHERE t.status IN %s
             AND t.simulation = %s;
         """
-        return self.sql_helper.execute_select(sql, (sim_mode,))
+        return self.sql_helper.execute_select(sql, (OPEN_TRADE_STATUSES, sim_mode))
 
     def update_trade_status(self, trade_id: int, status: str):
         sql = """
@@ -0,0 +1,49 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class AssetCache:
+    """Per-mint getAsset results with LRU eviction and separate TTLs for immutable / mutable fields."""
+
+    def __init__(self, max_entries: int = 5000, immutable_ttl: float = 3600, mutable_ttl: float = 30):
+        self.max_entries = max_entries
+        self.immutable_ttl = immutable_ttl
+        self.mutable_ttl = mutable_ttl
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, mint: str, mutable: bool = False) -> dict | None:
+        """Cached asset if fresh enough: decimals/name/image use immutable_ttl, supply/authorities mutable_ttl."""
+        ttl = self.mutable_ttl if mutable else self.immutable_ttl
+        with self.lock:
+            entry = self.entries.get(mint)
+            if entry and time.time() - entry[0] < ttl:
+                self.entries.move_to_end(mint)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, mint: str, asset: dict) -> None:
+        with self.lock:
+            self.entries[mint] = (time.time(), asset)
+            self.entries.move_to_end(mint)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, mint: str) -> None:
+        with self.lock:
+            self.entries.pop(mint, None)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
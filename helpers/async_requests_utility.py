@@ -0,0 +1,92 @@
+import json
+import time
+import aiohttp
+from helpers.logging_manager import LoggingHandler
+from helpers.host_throttle import HostThrottle
+from helpers.metrics import metrics, endpoint_label, count_rpc_errors
+from helpers.async_runtime import AsyncRuntime
+
+# set up logger
+logger = LoggingHandler.get_logger()
+
+
+class AsyncRequestsUtility:
+    """Awaitable counterpart of RequestsUtility, sharing its per-host throttle state."""
+
+    recorder = None  # PipelineRecorder while RECORDER.ENABLED
+
+    def __init__(self, base_url: str, runtime: AsyncRuntime):
+        self.base_url = base_url
+        self.runtime = runtime
+        self.throttle = HostThrottle.for_url(base_url)
+
+    async def _send(self, method: str, url: str, expected_status_code: int, call: str = None, **kwargs) -> dict:
+        started = time.monotonic()
+        call = call or endpoint_label(url)
+        outcome = "exception"
+        try:
+            for attempt in range(1, HostThrottle.max_retries + 1):
+                await self.throttle.acquire_async()
+                status = None
+                retry_after = None
+                try:
+                    async with self.runtime.session.request(method, url, **kwargs) as rs_api:
+                        status = rs_api.status
+                        if status == 429:
+                            retry_after = rs_api.headers.get("Retry-After")
+                            continue
+
+                        try:
+                            rs_json = await rs_api.json(content_type=None)
+                        except (aiohttp.ContentTypeError, json.JSONDecodeError):
+                            body = await rs_api.text()
+                            logger.error(f"❌ Failed to decode JSON from {url}")
+                            logger.debug(f"🔻 Response body:\n{body[:300]}...")
+                            rs_json = {}
+
+                        if self.recorder:
+                            self.recorder.http(method, url, kwargs.get("params"), kwargs.get("data"), status, rs_json, time.monotonic() - started)
+                        if status != expected_status_code:
+                            logger.error(
+                                f"Expected status code {expected_status_code} but actual status code is {status}\n"
+                                f"URL:{url}, Response Json: {rs_json}"
+                            )
+                            outcome = "http_error"
+                            return {}
+                        outcome = "ok"
+                        count_rpc_errors(metrics, self.throttle.host, call, rs_json)
+                        return rs_json
+                finally:
+                    backoff = self.throttle.release(status, retry_after)
+                    if status == 429 and attempt < HostThrottle.max_retries:
+                        logger.warning(f"⏳ 429 from {url} (attempt {attempt}/{HostThrottle.max_retries}), retrying in {backoff:.1f}s")
+
+            outcome = "throttled"
+            logger.error(f"❌ {method} {url} still throttled after {HostThrottle.max_retries} attempts")
+            return {}
+        finally:
+            labels = {"host": self.throttle.host, "call": call}
+            metrics.observe("sniper_http_request_seconds", time.monotonic() - started, **labels)
+            metrics.inc("sniper_http_requests_total", outcome=outcome, **labels)
+
+    async def get(self, endpoint: str = None, payload: dict = None, headers: dict = None, expected_status_code: int = 200) -> dict:
+        url = self.base_url + (endpoint or "")
+        logger.debug(f"Sending async GET request to: {url} with params: {payload}")
+        try:
+            if payload:
+                return await self._send("GET", url, expected_status_code, params=payload,
+                                        headers=headers or {"Content-Type": "application/json"})
+            return await self._send("GET", url, expected_status_code)
+        except Exception as e:
+            logger.error(f"❌ Async GET request to {url} failed: {e}", exc_info=True)
+            return {}
+
+    async def post(self, endpoint: str, payload=None, headers=None, expected_status_code=200) -> dict:
+        url = self.base_url + endpoint
+        logger.debug(f"Sending async POST request to: {url}")
+        try:
+            return await self._send("POST", url, expected_status_code, endpoint_label(url, payload), data=json.dumps(payload),
+                                    headers=headers or {"Content-Type": "application/json"})
+        except Exception as e:
+            logger.error(f"❌ Async POST request to {url} failed: {e}", exc_info=True)
+            return {}
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+import aiohttp
+from helpers.logging_manager import LoggingHandler
+
+logger = LoggingHandler.get_logger()
+
+
+class AsyncRuntime:
+    """One shared event loop (own thread) + one pooled aiohttp session for all async clients."""
+
+    def __init__(self, pool_settings: dict):
+        self.limit_per_host = pool_settings["POOL_MAXSIZE"]
+        self.limit = pool_settings["POOL_MAXSIZE"] * pool_settings["POOL_CONNECTIONS"]
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.session: aiohttp.ClientSession | None = None
+        self.thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    def start(self):
+        if self.thread:
+            return
+
+        def runner():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.session = self.loop.run_until_complete(self._create_session())
+            self._ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=runner, daemon=True, name="AsyncRuntime")
+        self.thread.start()
+        self._ready.wait()
+        logger.info(f"⚡ Async runtime started (connections={self.limit}, per host={self.limit_per_host})")
+
+    async def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+        return aiohttp.ClientSession(connector=connector)
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the shared loop from any thread."""
+        if not self.loop:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float | None = None):
+        """Blocking helper for sync callers."""
+        return self.submit(coro).result(timeout=timeout)
+
+    def shutdown(self):
+        if not self.loop:
+            return
+        try:
+            self.run(self.session.close(), timeout=5)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to close async HTTP session: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        logger.info("🛑 Async runtime stopped.")
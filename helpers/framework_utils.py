@@ -1,6 +1,7 @@
 import os
 import json
 import threading
+import contextvars
 import traceback
 import logging
 from datetime import datetime
@@ -12,8 +13,69 @@ import random
 
 
 logger = logging.getLogger("logger")
-bg_executor = ThreadPoolExecutor(max_workers=10)
-prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+
+class TrackedExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that counts running and waiting tasks, for the metrics endpoint."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = ""):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.workers = max_workers
+        self.counts_lock = threading.Lock()
+        self.pending = 0
+        self.busy = 0
+        self.completed = 0
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        def tracked():
+            with self.counts_lock:
+                self.busy += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self.counts_lock:
+                    self.busy -= 1
+                    self.pending -= 1
+                    self.completed += 1
+
+        with self.counts_lock:
+            self.pending += 1
+        try:
+            return super().submit(tracked)
+        except RuntimeError:  # shut down
+            with self.counts_lock:
+                self.pending -= 1
+            raise
+
+    def get_stats(self) -> dict:
+        with self.counts_lock:
+            busy, queued = self.busy, self.pending - self.busy
+            completed = self.completed
+        return {
+            "workers": self.workers,
+            "busy": busy,
+            "queued": queued,
+            "completed": completed,
+            "saturation": round(busy / self.workers, 3),
+        }
+
+
+bg_executor = TrackedExecutor(max_workers=10)
+prefetch_executor = TrackedExecutor(max_workers=2, thread_name_prefix="prefetch")
+check_executor: TrackedExecutor | None = None  # built by start_check_executor once PIPELINE.WORKERS is known
+CHECKS_PER_WORKER = 8  # gates + notification lookups of one token, plus checks still running for rejected ones
+_check_executor_lock = threading.Lock()
+
+
+def start_check_executor(pipeline_workers: int) -> TrackedExecutor:
+    """Create the detection-check pool with CHECKS_PER_WORKER threads per pipeline worker (at least 16)."""
+    global check_executor
+    with _check_executor_lock:
+        if check_executor is None:
+            check_executor = TrackedExecutor(
+                max_workers=max(16, CHECKS_PER_WORKER * pipeline_workers), thread_name_prefix="check"
+            )
+        return check_executor
 
 
 
@@ -81,6 +143,11 @@ def run_prefetch(target, *args, name=None, **kwargs) -> Future:
             logger.error(f"❌ Prefetch thread {task_name} failed:\n{traceback.format_exc()}")
     return prefetch_executor.submit(wrapper)
 
+def run_check(target, *args, **kwargs) -> Future:
+    """Run one detection check in parallel; exceptions surface through the Future, context (rate priority) is kept."""
+    executor = check_executor or start_check_executor(1)
+    return executor.submit(contextvars.copy_context().run, target, *args, **kwargs)
+
 # --- math ---
 def calculate_tokens(accounts:list):
     token_balances = []
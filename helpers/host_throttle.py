@@ -0,0 +1,118 @@
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from helpers.logging_manager import LoggingHandler
+
+logger = LoggingHandler.get_logger()
+
+
+class HostThrottle:
+    """Per-host 429 cooldown + AIMD concurrency window, so one throttled provider never stalls the others."""
+
+    initial_concurrency = 16
+    max_concurrency = 64
+    max_retries = 4
+    max_backoff = 60
+
+    _hosts: dict[str, "HostThrottle"] = {}
+    _hosts_lock = threading.Lock()
+
+    def __init__(self, host: str):
+        self.host = host
+        self.limit = float(self.initial_concurrency)
+        self.in_flight = 0
+        self.backoff_until = 0.0
+        self.consecutive_429 = 0
+        self.throttled = 0
+        self.cond = threading.Condition()
+
+    @classmethod
+    def configure(cls, settings: dict) -> None:
+        cls.initial_concurrency = settings["INITIAL_CONCURRENCY"]
+        cls.max_concurrency = settings["MAX_CONCURRENCY"]
+        cls.max_retries = settings["MAX_RETRIES"]
+        cls.max_backoff = settings["MAX_BACKOFF"]
+
+    @classmethod
+    def for_url(cls, url: str) -> "HostThrottle":
+        host = urlparse(url).netloc or url
+        with cls._hosts_lock:
+            if host not in cls._hosts:
+                cls._hosts[host] = cls(host)
+            return cls._hosts[host]
+
+    @classmethod
+    def get_all_stats(cls) -> dict:
+        with cls._hosts_lock:
+            hosts = list(cls._hosts.values())
+        return {t.host: t.get_stats() for t in hosts}
+
+    def _wait_time(self) -> float:
+        """0 if a request may start now (cond held), else seconds to wait."""
+        cooldown = self.backoff_until - time.time()
+        if cooldown > 0:
+            return cooldown
+        if self.in_flight >= int(self.limit):
+            return 0.5  # woken early by release()
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self) -> None:
+        with self.cond:
+            while (delay := self._wait_time()) > 0:
+                self.cond.wait(delay)
+
+    async def acquire_async(self) -> None:
+        while True:
+            with self.cond:
+                delay = self._wait_time()
+            if delay <= 0:
+                return
+            await asyncio.sleep(min(delay, 0.05))
+
+    def release(self, status: int | None, retry_after: str | None = None) -> float:
+        """Record the outcome; returns the backoff (s) to apply before retrying a 429, else 0."""
+        with self.cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            backoff = 0.0
+            if status == 429:
+                # multiplicative decrease + cooldown for this host only
+                self.throttled += 1
+                self.consecutive_429 += 1
+                self.limit = max(1.0, self.limit / 2)
+                backoff = self._parse_retry_after(retry_after)
+                if backoff is None:
+                    backoff = min(self.max_backoff, 0.5 * 2 ** self.consecutive_429)
+                backoff += random.uniform(0, backoff * 0.25)
+                self.backoff_until = max(self.backoff_until, time.time() + backoff)
+                logger.warning(f"🚦 {self.host} throttled: backoff {backoff:.1f}s, concurrency → {int(self.limit)}")
+            elif status is not None and status < 500:
+                # additive increase: about +1 per window of successful calls
+                self.consecutive_429 = 0
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self.cond.notify_all()
+            return backoff
+
+    def _parse_retry_after(self, retry_after: str | None) -> float | None:
+        if not retry_after:
+            return None
+        try:
+            return min(self.max_backoff, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+        try:
+            return min(self.max_backoff, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+        except (TypeError, ValueError):
+            return None
+
+    def get_stats(self) -> dict:
+        with self.cond:
+            return {
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "throttled": self.throttled,
+                "cooldown": round(max(0.0, self.backoff_until - time.time()), 2),
+            }
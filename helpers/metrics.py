@@ -0,0 +1,182 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from helpers.span_tracker import Histogram
+from helpers.logging_manager import LoggingHandler
+
+logger = LoggingHandler.get_logger()
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def endpoint_label(url: str, body=None) -> str:
+    """Per-endpoint label of an HTTP call: the JSON-RPC method, "batch", or the URL path."""
+    if isinstance(body, dict) and "method" in body and "jsonrpc" in body:
+        return body["method"]
+    if isinstance(body, list):
+        return "batch"
+    return urlsplit(url).path or "/"
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms, rendered in the Prometheus text format.
+
+    Values recorded with inc/set/observe live here; collectors (callables returning
+    `(name, kind, help, [(labels, value), ...])`) are read at scrape time for stats kept elsewhere.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.meta: dict[str, tuple[str, str]] = {}
+        self.values: dict[str, dict[tuple, float]] = {}
+        self.histograms: dict[str, dict[tuple, Histogram]] = {}
+        self.collectors: list = []
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self.meta[name] = (kind, help_text)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _labels_key(labels)
+        with self.lock:
+            series = self.values.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self.lock:
+            self.values.setdefault(name, {})[_labels_key(labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = _labels_key(labels)
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds * 1000)
+
+    def add_collector(self, collector) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            values = {name: dict(series) for name, series in self.values.items()}
+            histograms = {name: dict(series) for name, series in self.histograms.items()}
+        for name, series in sorted(values.items()):
+            kind, help_text = self.meta.get(name, ("counter" if name.endswith("_total") else "gauge", name))
+            self._header(lines, name, kind, help_text)
+            for key, value in series.items():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        for name, series in sorted(histograms.items()):
+            _, help_text = self.meta.get(name, ("histogram", name))
+            self._header(lines, name, "histogram", help_text)
+            for key, histogram in series.items():
+                lines.extend(self.histogram_lines(name, key, histogram))
+        for collector in self.collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.warning(f"⚠️ Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for name, kind, help_text, samples in families:
+                self._header(lines, name, kind, help_text)
+                for labels, value in samples:
+                    if kind == "histogram":
+                        lines.extend(self.histogram_lines(name, _labels_key(labels), value))
+                    elif value is not None:
+                        lines.append(f"{name}{_format_labels(_labels_key(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _header(lines: list, name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    @staticmethod
+    def histogram_lines(name: str, key: tuple, histogram: Histogram) -> list[str]:
+        """A millisecond `Histogram` as a Prometheus histogram in seconds."""
+        lines, cumulative = [], 0
+        for bound_ms, count in zip(Histogram.BUCKETS_MS, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(key, (('le', repr(bound_ms / 1000)),))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(key, (('le', '+Inf'),))} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum_ms / 1000}")
+        lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return lines
+
+
+def count_rpc_errors(registry: "MetricsRegistry", host: str, call: str, response) -> None:
+    """Count error replies inside a 200 response (a JSON-RPC error, or one per failed call of a batch)."""
+    if isinstance(response, dict):
+        errors = 1 if response.get("error") else 0
+    elif isinstance(response, list):
+        errors = sum(1 for r in response if isinstance(r, dict) and r.get("error"))
+    else:
+        errors = 0
+    if errors:
+        registry.inc("sniper_rpc_errors_total", errors, host=host, call=call)
+
+
+# process-wide registry (like HostThrottle's per-host registry, shared by every client)
+metrics = MetricsRegistry()
+metrics.describe("sniper_http_request_seconds", "histogram", "HTTP/RPC call latency by host and endpoint, retries included")
+metrics.describe("sniper_http_requests_total", "counter", "HTTP/RPC calls by host, endpoint and outcome (ok, http_error, throttled, exception)")
+metrics.describe("sniper_rpc_errors_total", "counter", "Error replies inside successful HTTP responses (JSON-RPC errors, per batched call)")
+metrics.describe("sniper_tracker_cycle_seconds", "histogram", "Open-position tracker loop cycle time (work only, without the sleep)")
+
+
+class MetricsServer:
+    """Serves the registry on GET /metrics (and /healthz) from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, host: str, port: int):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd = None
+
+    def start(self) -> None:
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    body, status, ctype = registry.render().encode(), 200, "text/plain; version=0.0.4; charset=utf-8"
+                elif path == "/healthz":
+                    body, status, ctype = b"ok\n", 200, "text/plain"
+                else:
+                    body, status, ctype = b"not found\n", 404, "text/plain"
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True, name="Metrics").start()
+        logger.info(f"📈 Metrics on http://{self.host}:{self.httpd.server_address[1]}/metrics")
+
+    def stop(self) -> None:
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
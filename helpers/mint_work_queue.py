@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import deque
+from queue import Empty, Full
+
+# Served in this order; FIFO inside each lane.
+LANES = ("PREFETCH", "LIVE")
+
+
+class MintGenerations:
+    """mint -> [generation, pending items]; entries live only while a mint has queued work."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: dict[str, list] = {}
+
+    def stamp(self, token_mint: str) -> int:
+        with self.lock:
+            entry = self.entries.setdefault(token_mint, [0, 0])
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, token_mint: str, generation: int) -> bool:
+        """Account for a popped item; True if it is still current (not cancelled)."""
+        with self.lock:
+            entry = self.entries.get(token_mint)
+            if entry is None:
+                return False
+            entry[1] -= 1
+            current = entry[0] == generation
+            if entry[1] <= 0:
+                del self.entries[token_mint]
+            return current
+
+    def bump(self, token_mint: str) -> None:
+        with self.lock:
+            entry = self.entries.get(token_mint)
+            if entry:
+                entry[0] += 1
+
+
+class MintWorkQueue:
+    """Pipeline queue of (sig, tx_data, token_mint, source, dex) items with O(1) per-mint cancellation.
+
+    Every mint with queued work has a generation counter; items are stamped with it on put and
+    `cancel(mint)` just bumps it, so stale items are dropped when they reach the head instead of
+    scrubbing the queue. Queues built with the same `generations` (e.g. worker shards) share cancellations.
+    """
+
+    def __init__(self, maxsize: int = 0, generations: MintGenerations | None = None):
+        self.maxsize = maxsize
+        self.generations = generations or MintGenerations()
+        self.lanes = {lane: deque() for lane in LANES}
+        self.size = 0
+        self.cancelled = 0
+        self.cond = threading.Condition()
+
+    def put(self, item: tuple, lane: str = "LIVE", block: bool = True, timeout: float | None = None) -> None:
+        token_mint = item[2]
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.cond:
+            while self.maxsize and self.size >= self.maxsize:
+                if not block:
+                    raise Full
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise Full
+                self.cond.wait(remaining)
+            generation = self.generations.stamp(token_mint) if token_mint else None
+            self.lanes[lane].append((item, generation))
+            self.size += 1
+            self.cond.notify_all()
+
+    def get(self, block: bool = True, timeout: float | None = None) -> tuple:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.cond:
+            while True:
+                item = self._pop_live_item()
+                if item is not None:
+                    return item
+                if not block:
+                    raise Empty
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise Empty
+                self.cond.wait(remaining)
+
+    def get_nowait(self) -> tuple:
+        return self.get(block=False)
+
+    def _pop_live_item(self) -> tuple | None:
+        for lane in LANES:
+            q = self.lanes[lane]
+            while q:
+                item, generation = q.popleft()
+                self.size -= 1
+                self.cond.notify_all()
+                token_mint = item[2]
+                if token_mint and not self.generations.release(token_mint, generation):
+                    self.cancelled += 1
+                    continue
+                return item
+        return None
+
+    def cancel(self, token_mint: str) -> None:
+        """Drop all pending work for `token_mint` in O(1)."""
+        with self.cond:
+            self.generations.bump(token_mint)
+
+    def qsize(self) -> int:
+        return self.size
+
+    def lane_sizes(self) -> dict:
+        with self.cond:
+            return {lane: len(q) for lane, q in self.lanes.items()}
+
+    def empty(self) -> bool:
+        return self.size == 0
@@ -0,0 +1,112 @@
+import os
+import gzip
+import json
+import time
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qsl
+from helpers.logging_manager import LoggingHandler
+
+logger = LoggingHandler.get_logger()
+
+SECRET_PARAMS = {"api-key", "api_key", "apikey"}
+
+
+def request_key(method: str, url: str, params: dict = None, body=None) -> str:
+    """Stable key of one HTTP call (or one JSON-RPC call inside a batch), without ids or API keys.
+
+    Used by the recorder and by the replay server, so both sides must build it the same way.
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS]
+    query += [(str(k), str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS]
+    if isinstance(body, dict) and "jsonrpc" in body:
+        body = {"method": body.get("method"), "params": body.get("params")}
+    return json.dumps(
+        [method.upper(), parts.netloc + parts.path, sorted(query), body],
+        sort_keys=True, separators=(",", ":"),
+    )
+
+
+def split_exchange(method: str, url: str, params: dict, body, response) -> list[tuple[str, object]]:
+    """One (key, response) per call; a JSON-RPC batch is split into its calls, matched by id."""
+    if isinstance(body, list) and isinstance(response, list):
+        by_id = {r.get("id"): r for r in response if isinstance(r, dict)}
+        return [(request_key(method, url, params, call), by_id.get(call.get("id"), {}))
+                for call in body if isinstance(call, dict)]
+    return [(request_key(method, url, params, body), response)]
+
+
+def read_archive(path: str):
+    """Yield the records of a recording (gzip JSONL, one record per line)."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class PipelineRecorder:
+    """Writes raw WebSocket frames and every HTTP response of a live run to a gzip JSONL archive.
+
+    Records (`t` = seconds since the recording started):
+      {"type": "meta", "t", "started_at", "network"}   first line; wall clock of t=0
+      {"type": "ws", "t", "link", "frame"}                  raw logsNotification frame, per WS link
+      {"type": "ws_sub", "t", "link", "subscription", "dex"}  subscription ack, so replay can map frames to DEXes
+      {"type": "http", "t", "key", "ms", "status", "response"}  one per call (batches are split)
+    """
+
+    def __init__(self, directory: str, max_mb: float, network: str = None):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"capture_{datetime.now():%Y%m%d_%H%M%S}.jsonl.gz")
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.file = gzip.open(self.path, "wt", encoding="utf-8")
+        self.started = time.monotonic()
+        self.written = 0
+        self.counts = {"meta": 0, "ws": 0, "ws_sub": 0, "http": 0}
+        self.full = False
+        self._write({"type": "meta", "started_at": time.time(), "network": network})
+        logger.info(f"🎙️ Recording WebSocket frames + HTTP responses to {self.path}")
+
+    def ws_frame(self, link: int, frame) -> None:
+        if isinstance(frame, (bytes, bytearray)):
+            frame = frame.decode("utf-8", errors="replace")
+        self._write({"type": "ws", "link": link, "frame": frame})
+
+    def ws_subscription(self, link: int, subscription, dex: str) -> None:
+        self._write({"type": "ws_sub", "link": link, "subscription": subscription, "dex": dex})
+
+    def http(self, method: str, url: str, params: dict, body, status: int, response, elapsed: float) -> None:
+        if isinstance(body, str):
+            try:
+                body = json.loads(body)
+            except ValueError:
+                pass
+        ms = round(elapsed * 1000, 1)
+        for key, part in split_exchange(method, url, params, body, response):
+            self._write({"type": "http", "key": key, "ms": ms, "status": status, "response": part})
+
+    def _write(self, record: dict) -> None:
+        record["t"] = round(time.monotonic() - self.started, 4)
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self.lock:
+            if self.full or self.file.closed:
+                return
+            if self.written + len(line) > self.max_bytes:
+                self.full = True
+                logger.warning(f"🎙️ Recording reached RECORDER.MAX_MB — no further records written to {self.path}")
+                return
+            self.file.write(line)
+            self.written += len(line)
+            self.counts[record["type"]] += 1
+
+    def close(self) -> None:
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.close()
+        logger.info(f"🎙️ Recording closed: {self.path} ({self.counts})")
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {"path": self.path, "bytes": self.written, "full": self.full, **self.counts}
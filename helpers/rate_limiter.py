@@ -1,53 +1,241 @@
 import time
+import heapq
 import random
+import asyncio
+import itertools
 import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+# Highest first: a waiting call of an earlier class always gets the next token.
+PRIORITIES = ("EXECUTION", "EXIT_PRICING", "DETECTION", "ANALYTICS")
+_RANK = {name: i for i, name in enumerate(PRIORITIES)}
+_priority = contextvars.ContextVar("rate_priority", default="DETECTION")
+
+
+@contextmanager
+def rate_priority(name: str):
+    """Tag every rate-limited call made inside the block (same thread/task) with a priority class."""
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
 
 class RateLimiter:
-    def __init__(self, min_interval=1.1, jitter_range=(0.05, 0.15), max_requests_per_minute=None,name=None):
+    """Token bucket: refills at min(1/min_interval, max_requests_per_minute/60) per second, holds up to `burst`.
+
+    Waiting callers are served by priority class (see PRIORITIES), then arrival order; `quotas` caps the
+    share of the per-minute budget a class may use so background work cannot crowd out detection.
+    """
+
+    def __init__(self, min_interval=1.1, jitter_range=(0.05, 0.15), max_requests_per_minute=None, name=None,
+                 burst=1, weights=None, quotas=None):
         self.min_interval = min_interval
         self.jitter_range = jitter_range
         self.max_requests_per_minute = max_requests_per_minute
-        self.last_call = 0
+        self.name = name
+        self.burst = max(1, burst)
+        self.weights = weights or {}  # endpoint/method -> tokens per call (default 1)
+
+        rates = []
+        if min_interval and min_interval > 0:
+            rates.append(1 / min_interval)
+        if max_requests_per_minute:
+            rates.append(max_requests_per_minute / 60)
+        self.rate = min(rates) if rates else None  # None = unlimited
+
+        # class -> max tokens per rolling 60s
+        self.quotas = {
+            cls: share * self.rate * 60
+            for cls, share in (quotas or {}).items()
+            if share is not None and self.rate
+        }
+
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
         self.lock = threading.Lock()
-        self.request_times = []  # list of timestamps of the last 60s
+        self.cond = threading.Condition(self.lock)
+        self.waiters: list[list] = []  # heap of [rank, seq, cls, cost]
+        self.seq = itertools.count()
+        self.class_usage = {cls: deque() for cls in PRIORITIES}  # (timestamp, cost) of the last 60s
+        self.class_totals = dict.fromkeys(PRIORITIES, 0)
+        self.last_call = 0
+        self.request_times = deque()  # timestamps of the last 60s
         self.total_requests = 0      # tracks full session
-        self.name = name
 
-    def wait(self):
+    def cost(self, endpoint: str = None) -> float:
+        return self.weights.get(endpoint, 1) if endpoint else 1
+
+    def _ticket(self, cost: float, cls: str) -> list:
+        return [_RANK.get(cls, _RANK["DETECTION"]), next(self.seq), cls, cost]
+
+    def _prune(self, now: float) -> None:
+        while self.request_times and now - self.request_times[0] >= 60:
+            self.request_times.popleft()
+        for usage in self.class_usage.values():
+            while usage and now - usage[0][0] >= 60:
+                usage.popleft()
+
+    def _quota_wait(self, cls: str, cost: float, now: float) -> float:
+        """0 if `cls` may spend `cost` now, else seconds until enough of its window expires."""
+        limit = self.quotas.get(cls)
+        if limit is None:
+            return 0.0
+        usage = self.class_usage[cls]
+        used = sum(c for _, c in usage)
+        if used + cost <= limit or not usage:
+            return 0.0
+        for ts, c in usage:
+            used -= c
+            if used + cost <= limit:
+                return max(0.0, 60 - (now - ts))
+        return 60.0
+
+    def _refill(self) -> None:
+        if self.rate is not None:
+            mono = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (mono - self.updated) * self.rate)
+            self.updated = mono
+
+    def _take(self, cls: str, cost: float, now: float) -> None:
+        if self.rate is not None:
+            self.tokens -= cost
+        self.last_call = now
+        self.total_requests += 1
+        self.request_times.append(now)
+        self.class_usage[cls].append((now, cost))
+        self.class_totals[cls] += 1
+
+    def _token_wait(self, cost: float) -> float:
+        needed = min(cost, self.burst)  # calls heavier than the bucket go once it is full
+        if self.rate is not None and self.tokens < needed:
+            return (needed - self.tokens) / self.rate
+        return 0.0
+
+    def _try_uncontended(self, cls: str, cost: float) -> bool:
+        """Fast path: with nobody waiting, take the tokens without queueing a ticket."""
+        if self.waiters:  # unlocked peek; rechecked under the lock
+            return False
         with self.lock:
+            if self.waiters:
+                return False
             now = time.time()
+            self._prune(now)
+            self._refill()
+            if self._quota_wait(cls, cost, now) > 0 or self._token_wait(cost) > 0:
+                return False
+            self._take(cls, cost, now)
+            return True
+
+    def _waiter_ahead(self, ticket: list, now: float) -> bool:
+        """True if an in-quota waiter precedes `ticket`; walks the heap in order, usually only its root."""
+        heap = self.waiters
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            other, i = heapq.heappop(frontier)
+            if other is ticket:
+                return False
+            if self._quota_wait(other[2], other[3], now) == 0:
+                return True
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return False
+
+    def _discard(self, ticket: list) -> None:
+        if self.waiters and self.waiters[0] is ticket:
+            heapq.heappop(self.waiters)
+        elif ticket in self.waiters:
+            self.waiters.remove(ticket)
+            heapq.heapify(self.waiters)
 
-            # Purge old timestamps (only keep last 60s)
-            self.request_times = [t for t in self.request_times if now - t < 60]
+    def _attempt(self, ticket: list) -> float:
+        """Grant `ticket` if it is the first in-quota waiter and tokens allow; else return a wait hint (lock held)."""
+        now = time.time()
+        self._prune(now)
+        _, _, cls, cost = ticket
+        self._refill()
 
-            # Enforce RPM limit
-            if self.max_requests_per_minute and len(self.request_times) >= self.max_requests_per_minute:
-                sleep_time = 60 - (now - self.request_times[0])
-                time.sleep(sleep_time)
-                now = time.time()
-                self.request_times = [t for t in self.request_times if now - t < 60]
+        quota_wait = self._quota_wait(cls, cost, now)
+        if quota_wait > 0:
+            return quota_wait
+        if self._waiter_ahead(ticket, now):
+            return 0.05  # a higher-priority / earlier waiter goes first; it notifies when granted
+        token_wait = self._token_wait(cost)
+        if token_wait > 0:
+            return token_wait
 
-            # Enforce spacing
-            elapsed = now - self.last_call
-            jitter = random.uniform(*self.jitter_range)
-            wait_time = max(0, (self.min_interval + jitter) - elapsed)
-            if wait_time > 0:
-                time.sleep(wait_time)
+        self._discard(ticket)
+        self._take(cls, cost, now)
+        self.cond.notify_all()
+        return 0.0
 
-            # Record this call
-            self.last_call = time.time()
-            self.request_times.append(self.last_call)
-            self.total_requests += 1
+    def _jitter(self, delay: float) -> float:
+        return delay + random.uniform(*self.jitter_range) if self.jitter_range else delay
+
+    def wait(self, endpoint: str = None, cost: float = None, priority: str = None):
+        """Block until the call may go out. The lock is released while waiting (Condition.wait)."""
+        cls = priority or current_priority()
+        cost = cost if cost is not None else self.cost(endpoint)
+        if self._try_uncontended(cls, cost):
+            return
+        ticket = self._ticket(cost, cls)
+        with self.cond:
+            heapq.heappush(self.waiters, ticket)
+            try:
+                while True:
+                    delay = self._attempt(ticket)
+                    if delay <= 0:
+                        return
+                    self.cond.wait(self._jitter(delay))
+            except BaseException:
+                self._discard(ticket)
+                self.cond.notify_all()
+                raise
+
+    async def wait_async(self, endpoint: str = None, cost: float = None, priority: str = None):
+        """Awaitable `wait` for coroutines on the async runtime."""
+        cls = priority or current_priority()
+        cost = cost if cost is not None else self.cost(endpoint)
+        if self._try_uncontended(cls, cost):
+            return
+        ticket = self._ticket(cost, cls)
+        with self.lock:
+            heapq.heappush(self.waiters, ticket)
+        try:
+            while True:
+                with self.lock:
+                    delay = self._attempt(ticket)
+                if delay <= 0:
+                    return
+                await asyncio.sleep(min(self._jitter(delay), 0.05))
+        except BaseException:
+            with self.lock:
+                self._discard(ticket)
+                self.cond.notify_all()
+            raise
 
     def get_stats(self) -> dict:
         """Return current limiter stats for monitoring."""
         with self.lock:
             now = time.time()
-            self.request_times = [t for t in self.request_times if now - t < 60]
+            self._prune(now)
             return {
                 "name": self.name,
                 "last_60s": len(self.request_times),
                 "limit_per_minute": self.max_requests_per_minute,
                 "total_requests": self.total_requests,
                 "last_call": self.last_call,
+                "by_priority": {
+                    cls: {"last_60s": len(self.class_usage[cls]), "total": self.class_totals[cls]}
+                    for cls in PRIORITIES
+                },
+                "waiting": len(self.waiters),
             }
@@ -0,0 +1,155 @@
+import copy
+import json
+import time
+import threading
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from helpers.pipeline_recorder import request_key
+from helpers.logging_manager import LoggingHandler
+
+logger = LoggingHandler.get_logger()
+
+
+class ReplayServer:
+    """Local stand-in for every recorded API host: answers each call with its recorded response.
+
+    Clients are pointed at it with `url_for(base_url)`, which moves the original host into the path
+    (`https://mainnet.helius-rpc.com/?api-key=` -> `http://127.0.0.1:<port>/mainnet.helius-rpc.com/?api-key=`).
+    Repeated calls get the recorded responses in order (the last one repeats); JSON-RPC batches are answered
+    call by call. `latency` (seconds) is added to every response; `None` replays each call's recorded latency.
+    `blockTime` values are shifted by the time passed since the recording, so token ages match the live run.
+    """
+
+    MISS_CODE = -32004
+
+    def __init__(self, records, latency: float | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.responses: dict[str, deque] = defaultdict(deque)
+        self.last: dict[str, tuple] = {}
+        recorded_start = None
+        for record in records:
+            if record["type"] == "meta":
+                recorded_start = record.get("started_at")
+            elif record["type"] == "http":
+                recorded_at = recorded_start + record["t"] if recorded_start else None
+                self.responses[record["key"]].append((record["ms"], record["status"], record["response"], recorded_at))
+        self.lock = threading.Lock()
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, base_url: str) -> str:
+        parts = urlsplit(base_url)
+        return f"{self.address}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="ReplayServer")
+        self.thread.start()
+        logger.info(f"🎞️ Replay server on {self.address} ({len(self.responses)} recorded calls)")
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _next(self, key: str) -> tuple | None:
+        with self.lock:
+            queue = self.responses.get(key)
+            if queue:
+                self.last[key] = queue.popleft()
+            return self.last.get(key)
+
+    def answer(self, method: str, url: str, body) -> tuple[int, object, float]:
+        """(status, response, recorded ms) for one HTTP request; batches are answered call by call."""
+        if isinstance(body, list):
+            answers = [self._answer_one(method, url, call) for call in body]
+            return 200, [response for _, response, _ in answers], max((ms for _, _, ms in answers), default=0.0)
+        return self._answer_one(method, url, body)
+
+    def _answer_one(self, method: str, url: str, body) -> tuple[int, object, float]:
+        rpc = isinstance(body, dict) and "jsonrpc" in body
+        label = body.get("method") if rpc else f"{method} {urlsplit(url).path}"
+        found = self._next(request_key(method, url, None, body))
+        if found is None:
+            with self.lock:
+                self.misses[label] += 1
+            if rpc:
+                error = {"code": self.MISS_CODE, "message": "not in recording"}
+                return 200, {"jsonrpc": "2.0", "id": body.get("id"), "error": error}, 0.0
+            return 404, {}, 0.0
+        with self.lock:
+            self.hits[label] += 1
+        ms, status, response, recorded_at = found
+        response = copy.deepcopy(response)
+        if rpc and isinstance(response, dict):
+            response["id"] = body.get("id")
+        if recorded_at:
+            _shift_block_times(response, int(time.time() - recorded_at))
+        return status, response, ms
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "hits": sum(self.hits.values()),
+                "misses": sum(self.misses.values()),
+                "by_call": {
+                    label: {"hits": self.hits.get(label, 0), "misses": self.misses.get(label, 0)}
+                    for label in sorted(set(self.hits) | set(self.misses))
+                },
+            }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = raw.decode("utf-8", errors="replace")
+                # "/<host>/<path>?<query>" -> the URL the client originally called
+                url = "http://" + self.path.lstrip("/")
+                status, response, ms = server.answer(method, url, body)
+                delay = server.latency if server.latency is not None else ms / 1000
+                if delay:
+                    time.sleep(delay)
+                payload = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _shift_block_times(node, offset: int) -> None:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "blockTime" and isinstance(value, int):
+                node[key] = value + offset
+            else:
+                _shift_block_times(value, offset)
+    elif isinstance(node, list):
+        for item in node:
+            _shift_block_times(item, offset)
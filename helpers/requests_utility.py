@@ -1,113 +1,128 @@
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from helpers.logging_manager import LoggingHandler
+from helpers.host_throttle import HostThrottle
+from helpers.metrics import metrics, endpoint_label, count_rpc_errors
 
 # set up logger
 logger = LoggingHandler.get_logger()
 
 
 class RequestsUtility:
-    _backoff_until = 0       
-    _backoff_delay = 0       
-    _max_backoff = 60        
+    recorder = None  # PipelineRecorder while RECORDER.ENABLED (shared by every client)
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False):
         self.base_url = base_url
-
-    def assert_status_code(self) -> None:
-        assert self.rs_status_code == self.expected_status_code, (
-            f"Expected status code {self.expected_status_code} but actual status code is {self.rs_status_code}\n"
-            f"URL:{self.url}, Response Json: {self.rs_json}"
+        self.session = self._build_session(pool_connections, pool_maxsize, pool_block)
+        self.throttle = HostThrottle.for_url(base_url)
+
+    @staticmethod
+    def _build_session(pool_connections: int, pool_maxsize: int, pool_block: bool) -> requests.Session:
+        """Keep-alive session so repeated calls reuse TCP+TLS connections."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Release pooled connections (called during bot shutdown)."""
+        self.session.close()
+
+    @staticmethod
+    def assert_status_code(url: str, rs_status_code: int, expected_status_code: int, rs_json) -> None:
+        # per-call values, not instance state: one utility is shared by several worker threads
+        assert rs_status_code == expected_status_code, (
+            f"Expected status code {expected_status_code} but actual status code is {rs_status_code}\n"
+            f"URL:{url}, Response Json: {rs_json}"
         )
 
-    @classmethod
-    def _apply_backoff(cls):
-        """If a global cooldown is active, wait until it's over."""
-        now = time.time()
-        if now < cls._backoff_until:
-            sleep_time = cls._backoff_until - now
-            logger.warning(f"⏳ Backing off requests for {sleep_time:.1f}s...")
-            time.sleep(sleep_time)
-
-    @classmethod
-    def _set_backoff(cls, base_seconds: int):
-        """Activate or increase global cooldown after 429."""
-        if cls._backoff_delay == 0:
-            cls._backoff_delay = base_seconds
-        else:
-            cls._backoff_delay = min(cls._backoff_delay * 2, cls._max_backoff)
-
-        cls._backoff_until = time.time() + cls._backoff_delay
-        logger.warning(f"🚦 Progressive backoff set: {cls._backoff_delay}s")
-
-    @classmethod
-    def _reset_backoff(cls):
-        """Reset backoff after a successful request."""
-        if cls._backoff_delay > 0:
-            logger.info("✅ Request succeeded, resetting backoff")
-        cls._backoff_delay = 0
-        cls._backoff_until = 0
+    def _send(self, method: str, url: str, call: str = None, **kwargs) -> requests.Response | None:
+        """Send through this host's throttle; 429s are retried (bounded, jittered), other statuses returned."""
+        started = time.monotonic()
+        outcome = "exception"
+        try:
+            for attempt in range(1, HostThrottle.max_retries + 1):
+                self.throttle.acquire()
+                status = None
+                try:
+                    rs_api = self.session.request(method, url, **kwargs)
+                    status = rs_api.status_code
+                finally:
+                    backoff = self.throttle.release(status, rs_api.headers.get("Retry-After") if status == 429 else None)
+                if status != 429:
+                    outcome = "ok" if status < 400 else "http_error"
+                    return rs_api
+                if attempt < HostThrottle.max_retries:
+                    logger.warning(f"⏳ 429 from {url} (attempt {attempt}/{HostThrottle.max_retries}), retrying in {backoff:.1f}s")
+            outcome = "throttled"
+            logger.error(f"❌ {method} {url} still throttled after {HostThrottle.max_retries} attempts")
+            return None
+        finally:
+            labels = {"host": self.throttle.host, "call": call or endpoint_label(url)}
+            metrics.observe("sniper_http_request_seconds", time.monotonic() - started, **labels)
+            metrics.inc("sniper_http_requests_total", outcome=outcome, **labels)
 
     def get(self, endpoint:str=None, payload:dict=None, headers:dict=None, expected_status_code:int=200) -> json:
         if not headers:
             headers = {"Content-Type": "application/json"}
-        self.url = self.base_url + endpoint
-        logger.debug(f"Sending GET request to: {self.url} with params: {payload}")
+        url = self.base_url + endpoint
+        logger.debug(f"Sending GET request to: {url} with params: {payload}")
 
         try:
-            self._apply_backoff()
-
-            rs_api = requests.get(url=self.url, params=payload, headers=headers) if payload else requests.get(url=self.url)
-            self.rs_status_code = rs_api.status_code
-            self.expected_status_code = expected_status_code
-
-            if self.rs_status_code == 429:
-                retry_after = int(rs_api.headers.get("Retry-After", 5))
-                self._set_backoff(retry_after)
-                time.sleep(self._backoff_delay)
-                return self.get(endpoint, payload, headers, expected_status_code)
+            started = time.monotonic()
+            call = endpoint_label(url)
+            rs_api = self._send("GET", url, call, params=payload, headers=headers) if payload else self._send("GET", url, call)
+            if rs_api is None:
+                return {}
+            rs_status_code = rs_api.status_code
 
             try:
-                self.rs_json = rs_api.json()
+                rs_json = rs_api.json()
             except requests.exceptions.JSONDecodeError:
-                logger.error(f"❌ Failed to decode JSON from {self.url}")
+                logger.error(f"❌ Failed to decode JSON from {url}")
                 logger.debug(f"🔻 Response body:\n{rs_api.text[:300]}...")
-                self.rs_json = {}
+                rs_json = {}
 
-            self.assert_status_code()
-            self._reset_backoff() 
-            logger.debug(f"✅ API GET Response is: {self.rs_json}")
-            return self.rs_json
+            count_rpc_errors(metrics, self.throttle.host, call, rs_json)
+            if self.recorder:
+                self.recorder.http("GET", url, payload, None, rs_status_code, rs_json, time.monotonic() - started)
+            self.assert_status_code(url, rs_status_code, expected_status_code, rs_json)
+            logger.debug(f"✅ API GET Response is: {rs_json}")
+            return rs_json
 
         except Exception as e:
-            logger.error(f"❌ GET request to {self.url} failed: {e}", exc_info=True)
+            logger.error(f"❌ GET request to {url} failed: {e}", exc_info=True)
             return {}
 
     def post(self, endpoint: str, payload=None, headers=None, expected_status_code=200) -> json:
         if not headers:
             headers = {"Content-Type": "application/json"}
-        self.url = self.base_url + endpoint
-        logger.debug(f"Sending POST request to: {self.url}")
+        url = self.base_url + endpoint
+        logger.debug(f"Sending POST request to: {url}")
 
         try:
-            self._apply_backoff()
-
-            rs_api = requests.post(url=self.url, data=json.dumps(payload), headers=headers)
-            self.rs_status_code = rs_api.status_code
-            self.expected_status_code = expected_status_code
-            if self.rs_status_code == 429:
-                retry_after = int(rs_api.headers.get("Retry-After", 5))
-                self._set_backoff(retry_after)
-                time.sleep(self._backoff_delay)
-                return self.post(endpoint, payload, headers, expected_status_code) 
-
-            self.rs_json = rs_api.json()
-            self.assert_status_code()
-            self._reset_backoff()
-            logger.debug(f"✅ API POST Response is: {self.rs_json}")
-            return self.rs_json
+            started = time.monotonic()
+            call = endpoint_label(url, payload)
+            rs_api = self._send("POST", url, call, data=json.dumps(payload), headers=headers)
+            if rs_api is None:
+                return {}
+            rs_status_code = rs_api.status_code
+
+            rs_json = rs_api.json()
+            count_rpc_errors(metrics, self.throttle.host, call, rs_json)
+            if self.recorder:
+                self.recorder.http("POST", url, None, payload, rs_status_code, rs_json, time.monotonic() - started)
+            self.assert_status_code(url, rs_status_code, expected_status_code, rs_json)
+            logger.debug(f"✅ API POST Response is: {rs_json}")
+            return rs_json
 
         except Exception as e:
-            logger.error(f"❌ POST request to {self.url} failed: {e}", exc_info=True)
+            logger.error(f"❌ POST request to {url} failed: {e}", exc_info=True)
             return {}
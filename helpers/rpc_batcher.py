@@ -0,0 +1,101 @@
+import time
+import threading
+from concurrent.futures import Future
+from helpers.logging_manager import LoggingHandler
+from helpers.requests_utility import RequestsUtility
+from helpers.rate_limiter import PRIORITIES, current_priority
+
+logger = LoggingHandler.get_logger()
+
+
+class RpcBatcher:
+    """Coalesces JSON-RPC calls made within a short window into one batch POST, demuxed by id.
+
+    The window is only waited for while other calls are in flight; a lone caller is sent at once.
+    """
+
+    def __init__(self, requests_utility: RequestsUtility, endpoint: str, window: float = 0.01,
+                 max_batch: int = 50, rate_limiter=None):
+        self.requests_utility = requests_utility
+        self.endpoint = endpoint
+        self.window = window
+        self.max_batch = max_batch
+        self.rate_limiter = rate_limiter
+        self.lock = threading.Lock()
+        self.pending: list[tuple[dict, Future, str]] = []
+        self.leader = False
+        self.in_flight = 0  # calls queued or awaiting their response
+        self.batches_sent = 0
+        self.calls_sent = 0
+
+    def call(self, payload: dict, timeout: float = 30) -> dict:
+        """Blocking single call; returns the raw JSON-RPC response object for this payload's id."""
+        return self.call_many([payload], timeout)[0]
+
+    def call_many(self, payloads: list[dict], timeout: float = 30) -> list[dict]:
+        """Queue several calls at once (they always share a batch); responses in payload order."""
+        futures = [Future() for _ in payloads]
+        priority = current_priority()
+        with self.lock:
+            self.pending.extend((payload, fut, priority) for payload, fut in zip(payloads, futures))
+            self.in_flight += len(payloads)
+            lead = not self.leader
+            self.leader = True
+            concurrent = self.in_flight > len(payloads)
+
+        try:
+            if lead:
+                # first caller collects; it waits for more calls only when others are in flight
+                if concurrent:
+                    time.sleep(self.window)
+                with self.lock:
+                    batch, self.pending = self.pending, []
+                    self.leader = False
+                for i in range(0, len(batch), self.max_batch):
+                    self._send(batch[i:i + self.max_batch])
+
+            results = []
+            for fut in futures:
+                try:
+                    results.append(fut.result(timeout=timeout))
+                except Exception as e:
+                    logger.error(f"❌ Batched RPC call failed: {e}")
+                    results.append({})
+            return results
+        finally:
+            with self.lock:
+                self.in_flight -= len(payloads)
+
+    def _send(self, batch: list[tuple[dict, Future, str]]) -> None:
+        try:
+            if self.rate_limiter:
+                # a batch waits at the priority of its most urgent caller
+                priority = min((p for _, _, p in batch), key=lambda p: PRIORITIES.index(p) if p in PRIORITIES else len(PRIORITIES))
+                self.rate_limiter.wait(
+                    cost=sum(self.rate_limiter.cost(p.get("method")) for p, _, _ in batch),
+                    priority=priority,
+                )
+            if len(batch) == 1:
+                response = [self.requests_utility.post(self.endpoint, payload=batch[0][0])]
+            else:
+                response = self.requests_utility.post(self.endpoint, payload=[p for p, _, _ in batch])
+            with self.lock:
+                self.batches_sent += 1
+                self.calls_sent += len(batch)
+
+            by_id = {r.get("id"): r for r in response if isinstance(r, dict)} if isinstance(response, list) else {}
+            for payload, fut, _ in batch:
+                fut.set_result(by_id.get(payload["id"], {}))
+        except Exception as e:
+            logger.error(f"❌ RPC batch of {len(batch)} failed: {e}", exc_info=True)
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_result({})
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "batches_sent": self.batches_sent,
+                "calls_sent": self.calls_sent,
+                "avg_batch": round(self.calls_sent / self.batches_sent, 2) if self.batches_sent else 0,
+            }
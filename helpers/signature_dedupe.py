@@ -0,0 +1,146 @@
+import math
+import time
+import hashlib
+import threading
+from helpers.logging_manager import LoggingHandler
+
+logger = LoggingHandler.get_logger()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over a bytearray; `add` and `__contains__` may report false positives, never negatives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def fp_rate(self) -> float:
+        """Estimated false-positive probability at the current fill."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def nbytes(self) -> int:
+        return len(self.array)
+
+
+class SignatureDedupe:
+    """Bounded "have we seen this signature" set.
+
+    Two exact generations rotate every `window` seconds (or once one holds half of `max_entries`), so a
+    signature is remembered exactly for at least one window. With `bloom_capacity` set, rotated-out
+    signatures also go into a Bloom filter, so older duplicates are still caught at a small, measured
+    false-positive cost; the filter is reset once it holds `bloom_capacity` signatures.
+
+    Rotation only swaps the generations under the lock: the rotated-out set stays an exact lookup until a
+    background thread has folded it into the filter, so `check_and_add` never does O(n) work.
+    """
+
+    def __init__(self, window: float = 900, max_entries: int = 200_000,
+                 bloom_capacity: int = 0, bloom_error_rate: float = 0.001):
+        self.window = window
+        self.max_entries = max_entries
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate) if bloom_capacity else None
+
+        self.lock = threading.Lock()
+        self.current: set[str] = set()
+        self.previous: set[str] = set()
+        self.retiring: set[str] = set()  # rotated out, not yet in the Bloom filter
+        self.folding = False
+        self.rotated_at = time.monotonic()
+        self.rotations = 0
+        self.duplicates = 0
+        self.bloom_hits = 0
+        self.bloom_resets = 0
+
+    def _rotate(self, now: float) -> None:
+        """Swap generations (called under the lock); the evicted one is folded into the filter off the lock."""
+        evicted = self.previous
+        self.previous, self.current = self.current, set()
+        self.rotated_at = now
+        self.rotations += 1
+        if self.bloom is not None and evicted:
+            self.retiring = evicted
+            self.folding = True
+            threading.Thread(target=self._fold, args=(evicted,), daemon=True, name="DedupeBloomFold").start()
+
+    def _fold(self, evicted: set[str]) -> None:
+        bloom = self.bloom
+        reset = bloom.count + len(evicted) > self.bloom_capacity
+        if reset:
+            bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+        try:
+            for sig in evicted:
+                bloom.add(sig)
+        finally:
+            with self.lock:
+                self.bloom = bloom
+                self.retiring = set()
+                self.folding = False
+                if reset:
+                    self.bloom_resets += 1
+        logger.debug(
+            f"🧹 Signature dedupe rotated: {len(self.previous)} recent, "
+            f"bloom={bloom.count} (est. FP {bloom.fp_rate():.4%})"
+        )
+
+    def check_and_add(self, signature: str) -> bool:
+        """True if `signature` was already seen; otherwise remember it and return False."""
+        with self.lock:
+            now = time.monotonic()
+            due = now - self.rotated_at >= self.window or len(self.current) >= self.max_entries // 2
+            if due and not self.folding:  # the last fold is done within about a second
+                self._rotate(now)
+            if signature in self.current or signature in self.previous or signature in self.retiring:
+                self.duplicates += 1
+                return True
+            if self.bloom is not None and signature in self.bloom:
+                self.bloom_hits += 1
+                return True
+            self.current.add(signature)
+            return False
+
+    def __contains__(self, signature: str) -> bool:
+        with self.lock:
+            return (
+                signature in self.current
+                or signature in self.previous
+                or signature in self.retiring
+                or (self.bloom is not None and signature in self.bloom)
+            )
+
+    def __len__(self) -> int:
+        return len(self.current) + len(self.previous)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.current) + len(self.previous),
+                "max_entries": self.max_entries,
+                "window": self.window,
+                "rotations": self.rotations,
+                "duplicates": self.duplicates,
+                "bloom_entries": self.bloom.count if self.bloom else 0,
+                "bloom_bytes": self.bloom.nbytes() if self.bloom else 0,
+                "bloom_fp_rate": round(self.bloom.fp_rate(), 6) if self.bloom else 0.0,
+                "bloom_hits": self.bloom_hits,
+                "bloom_resets": self.bloom_resets,
+            }
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import bisect
+import threading
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Event
+from helpers.logging_manager import LoggingHandler
+
+logger = LoggingHandler.get_logger()
+
+# (signature, mint) of the flow the current thread/task works on; copied into run_check / asyncio.to_thread
+_trace = contextvars.ContextVar("span_trace", default=(None, None))
+
+
+def bind_trace(signature: str = None, mint: str = None) -> None:
+    """Correlate every span recorded from here on (same thread/task) with this signature / mint."""
+    _trace.set((signature, mint))
+
+
+@contextmanager
+def span(stage: str, signature: str = None, mint: str = None):
+    """Time the block (or decorated function) as one `stage` span; a no-op while SPANS is disabled."""
+    tracker = SpanTracker.active
+    if tracker is None:
+        yield
+        return
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        tracker.record(stage, time.monotonic() - started, signature, mint)
+
+
+def record_span(stage: str, seconds: float, signature: str = None, mint: str = None) -> None:
+    if SpanTracker.active is not None:
+        SpanTracker.active.record(stage, seconds, signature, mint)
+
+
+def mark_queued(signature: str) -> None:
+    if SpanTracker.active is not None:
+        SpanTracker.active.mark(signature)
+
+
+def record_queue_wait(signature: str) -> None:
+    if SpanTracker.active is not None:
+        SpanTracker.active.record_since_mark(signature, "queue_wait")
+
+
+class Histogram:
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)  # last bucket = +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max observed value for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(min(self.BUCKETS_MS[i], self.max_ms)) if i < len(self.BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5), 2),
+            "p90_ms": round(self.quantile(0.9), 2),
+            "p99_ms": round(self.quantile(0.99), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class SpanTracker:
+    """Per-stage latency histograms plus recent per-token traces, exported as a rolling JSON file.
+
+    A trace collects every span of one token: spans recorded before the mint is known (WS receive, queue
+    wait, getTransaction) are keyed by signature and move into the mint's trace once both are seen together.
+    """
+
+    active: "SpanTracker | None" = None
+    MAX_SPANS_PER_TRACE = 100
+
+    def __init__(self, path: str, interval: float, max_traces: int, max_marks: int = 50_000):
+        self.path = path
+        self.interval = interval
+        self.max_traces = max_traces
+        self.max_marks = max_marks
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.total: dict[str, Histogram] = {}
+        self.window: dict[str, Histogram] = {}
+        self.window_started = time.time()
+        self.traces: OrderedDict[str, dict] = OrderedDict()
+        self.marks: OrderedDict[str, float] = OrderedDict()
+
+    def record(self, stage: str, seconds: float, signature: str = None, mint: str = None) -> None:
+        if mint is None:
+            bound_signature, bound_mint = _trace.get()
+            if signature is None or signature == bound_signature:
+                signature, mint = signature or bound_signature, bound_mint
+        ms = seconds * 1000
+        now = time.monotonic()
+        with self.lock:
+            for histograms in (self.total, self.window):
+                histograms.setdefault(stage, Histogram()).observe(ms)
+            entry = self._trace_entry(signature, mint, now - seconds)
+            if entry is not None and len(entry["spans"]) < self.MAX_SPANS_PER_TRACE:
+                entry["spans"].append([stage, round((now - seconds - entry["t0"]) * 1000, 1), round(ms, 1)])
+
+    def _trace_entry(self, signature: str, mint: str, started: float) -> dict | None:
+        key = mint or signature
+        if key is None:
+            return None
+        entry = self.traces.get(key)
+        if mint and signature and signature != mint and signature in self.traces:
+            early = self.traces.pop(signature)
+            if entry is None:
+                entry = self.traces[mint] = early
+            else:
+                shift = (early["t0"] - entry["t0"]) * 1000
+                room = self.MAX_SPANS_PER_TRACE - len(entry["spans"])
+                entry["spans"].extend([stage, round(offset + shift, 1), ms] for stage, offset, ms in early["spans"][:room])
+        if entry is None:
+            entry = self.traces[key] = {"signature": signature, "mint": mint, "started_at": time.time(), "t0": started, "spans": []}
+            while len(self.traces) > self.max_traces:
+                self.traces.popitem(last=False)
+        entry["signature"] = entry["signature"] or signature
+        entry["mint"] = entry["mint"] or mint
+        self.traces.move_to_end(key)
+        return entry
+
+    def mark(self, signature: str) -> None:
+        with self.lock:
+            self.marks[signature] = time.monotonic()
+            if len(self.marks) > self.max_marks:
+                self.marks.popitem(last=False)
+
+    def record_since_mark(self, signature: str, stage: str) -> None:
+        with self.lock:
+            marked = self.marks.pop(signature, None)
+        if marked is not None:
+            self.record(stage, time.monotonic() - marked, signature)
+
+    def get_stats(self, reset_window: bool = False) -> dict:
+        with self.lock:
+            stats = {
+                "updated_at": time.time(),
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "window_s": round(time.time() - self.window_started, 1),
+                "stages": {stage: h.summary() for stage, h in sorted(self.total.items())},
+                "window": {stage: h.summary() for stage, h in sorted(self.window.items())},
+                "traces": [
+                    {k: v for k, v in entry.items() if k != "t0"}
+                    for entry in reversed(self.traces.values())
+                ],
+            }
+            if reset_window:
+                self.window = {}
+                self.window_started = time.time()
+        return stats
+
+    def histograms(self) -> dict[str, Histogram]:
+        with self.lock:
+            return dict(self.total)
+
+    def export(self) -> None:
+        """Atomically rewrite the JSON file with cumulative + last-interval histograms and recent traces."""
+        stats = self.get_stats(reset_window=True)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def run(self, stop_event: Event) -> None:
+        while not stop_event.wait(self.interval):
+            try:
+                self.export()
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write spans to {self.path}: {e}")
+        self.export()
@@ -0,0 +1,80 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def get_decoder(preferred: str = "auto"):
+    """Return (name, loads) for the fastest available JSON decoder, or the one asked for."""
+    if preferred in ("auto", "orjson") and orjson is not None:
+        return "orjson", orjson.loads
+    if preferred in ("auto", "msgspec") and msgspec is not None:
+        return "msgspec", msgspec.json.Decoder().decode
+    return "json", json.loads
+
+
+class WsFrameFilter:
+    """Rejects `logsSubscribe` frames that cannot match the DEX rules before they are JSON-decoded.
+
+    A rule that appears in some log line also appears verbatim (JSON-escaped) in the raw frame, so a plain
+    substring scan over the frame is a safe pre-check; only frames that pass it are decoded and checked
+    line by line.
+    """
+
+    def __init__(self, rules: list[str], decoder: str = "auto"):
+        self.rules = tuple(rules)
+        text = []
+        for rule in self.rules:
+            for form in (json.dumps(rule)[1:-1], json.dumps(rule, ensure_ascii=False)[1:-1]):
+                if form not in text:
+                    text.append(form)
+        self.text_patterns = tuple(text)
+        self.byte_patterns = tuple(p.encode() for p in text)
+        self.decoder_name, self.loads = get_decoder(decoder)
+        self.seen = 0
+        self.rejected = 0
+
+    def accepts(self, frame: str | bytes) -> bool:
+        self.seen += 1
+        if not self.rules:
+            return True
+        patterns = self.byte_patterns if isinstance(frame, (bytes, bytearray)) else self.text_patterns
+        for pattern in patterns:
+            if pattern in frame:
+                return True
+        self.rejected += 1
+        return False
+
+    def logs_match(self, logs: list[str]) -> bool:
+        if not self.rules:
+            return True
+        return any(rule in log for log in logs for rule in self.rules)
+
+    def parse(self, frame: str | bytes) -> tuple[str, list[str], int | None] | None:
+        """(signature, logs, subscription id) of a matching notification, else None."""
+        if not self.accepts(frame):
+            return None
+        data = self.loads(frame)
+        params = data.get("params", {})
+        value = params.get("result", {}).get("value", {})
+        if not value:
+            return None
+        signature = value.get("signature")
+        logs = value.get("logs", [])
+        if not signature or not self.logs_match(logs):
+            return None
+        return signature, logs, params.get("subscription")
+
+    def get_stats(self) -> dict:
+        return {
+            "decoder": self.decoder_name,
+            "frames": self.seen,
+            "rejected_raw": self.rejected,
+            "reject_rate": round(self.rejected / self.seen, 4) if self.seen else 0.0,
+        }
@@ -0,0 +1,173 @@
+from services.bot_context import BotContext
+from helpers.host_throttle import HostThrottle
+from helpers import framework_utils
+
+# signature_queue lanes under the names the pipeline logs use
+QUEUE_NAMES = {"LIVE": "signature_queue", "PREFETCH": "prefetch_queue"}
+
+
+class BotMetrics:
+    """Scrape-time collector: turns the bot's existing get_stats() snapshots into metric families."""
+
+    def __init__(self, ctx: BotContext, connector=None):
+        self.ctx = ctx
+        self.connector = connector
+
+    def __call__(self):
+        yield from self._queues()
+        yield from self._executors()
+        yield from self._http()
+        yield from self._caches()
+        yield from self._connector()
+        yield from self._positions()
+        yield from self._stages()
+
+    def _queues(self):
+        lanes = self.ctx.get("signature_queue").lane_sizes()
+        yield "sniper_queue_depth", "gauge", "Items waiting in the detection queues", [
+            ({"queue": QUEUE_NAMES.get(lane, lane)}, depth) for lane, depth in lanes.items()
+        ]
+        pool = self.ctx.get("signature_worker_pool")
+        if pool:
+            stats = pool.get_stats()
+            yield "sniper_worker_shard_depth", "gauge", "Signatures waiting in each worker's shard", [
+                ({"worker": w["worker"]}, w["shard_depth"]) for w in stats["workers"]
+            ]
+            yield "sniper_worker_utilisation", "gauge", "Busy share of each pipeline worker over the last 60s", [
+                ({"worker": w["worker"]}, w["utilisation"]) for w in stats["workers"]
+            ]
+            yield "sniper_worker_processed_total", "counter", "Signatures processed per pipeline worker", [
+                ({"worker": w["worker"]}, w["processed"]) for w in stats["workers"]
+            ]
+
+    def _executors(self):
+        stats = {
+            "bg": framework_utils.bg_executor.get_stats(),
+            "prefetch": framework_utils.prefetch_executor.get_stats(),
+        }
+        if framework_utils.check_executor:  # built at startup from PIPELINE.WORKERS
+            stats["check"] = framework_utils.check_executor.get_stats()
+        for key, kind, help_text in (
+            ("workers", "gauge", "Threads of each background executor"),
+            ("busy", "gauge", "Tasks running on each background executor"),
+            ("queued", "gauge", "Tasks waiting for a free thread on each background executor"),
+            ("saturation", "gauge", "Busy threads / threads of each background executor"),
+            ("completed", "counter", "Tasks finished by each background executor"),
+        ):
+            name = f"sniper_executor_{key}_total" if kind == "counter" else f"sniper_executor_{key}"
+            yield name, kind, help_text, [({"executor": e}, s[key]) for e, s in stats.items()]
+
+    def _http(self):
+        hosts = HostThrottle.get_all_stats()
+        yield "sniper_host_in_flight", "gauge", "Requests in flight per API host", [
+            ({"host": h}, s["in_flight"]) for h, s in hosts.items()
+        ]
+        yield "sniper_host_concurrency_limit", "gauge", "Adaptive concurrency limit per API host", [
+            ({"host": h}, s["concurrency_limit"]) for h, s in hosts.items()
+        ]
+        yield "sniper_host_throttled_total", "counter", "429 responses per API host", [
+            ({"host": h}, s["throttled"]) for h, s in hosts.items()
+        ]
+        yield "sniper_host_cooldown_seconds", "gauge", "Remaining 429 backoff per API host", [
+            ({"host": h}, s["cooldown"]) for h, s in hosts.items()
+        ]
+
+        limiters = [self.ctx.get(name).get_stats() for name in ("helius_rl", "jupiter_rl") if self.ctx.get(name)]
+        yield "sniper_rate_limiter_last_60s", "gauge", "Requests granted in the last 60s per rate limiter", [
+            ({"limiter": s["name"]}, s["last_60s"]) for s in limiters
+        ]
+        yield "sniper_rate_limiter_limit_per_minute", "gauge", "Configured requests per minute per rate limiter", [
+            ({"limiter": s["name"]}, s["limit_per_minute"]) for s in limiters
+        ]
+        yield "sniper_rate_limiter_waiting", "gauge", "Callers blocked on each rate limiter", [
+            ({"limiter": s["name"]}, s["waiting"]) for s in limiters
+        ]
+
+        helius = self.ctx.get("helius_client")
+        if helius and helius.batcher:  # None with RPC_BATCH.ENABLED off
+            batcher = helius.batcher.get_stats()
+            yield "sniper_rpc_batches_total", "counter", "JSON-RPC batches sent", [({}, batcher["batches_sent"])]
+            yield "sniper_rpc_batched_calls_total", "counter", "Calls sent inside JSON-RPC batches", [
+                ({}, batcher["calls_sent"])
+            ]
+
+    def _caches(self):
+        caches = {}
+        helius = self.ctx.get("helius_client")
+        if helius:
+            caches["asset"] = helius.asset_cache.get_stats()
+        yield "sniper_cache_hits_total", "counter", "Cache hits", [({"cache": c}, s["hits"]) for c, s in caches.items()]
+        yield "sniper_cache_misses_total", "counter", "Cache misses", [
+            ({"cache": c}, s["misses"]) for c, s in caches.items()
+        ]
+        yield "sniper_cache_hit_ratio", "gauge", "Cache hits / lookups since start", [
+            ({"cache": c}, s["hit_rate"]) for c, s in caches.items()
+        ]
+        yield "sniper_cache_entries", "gauge", "Entries held per cache", [
+            ({"cache": c}, s["entries"]) for c, s in caches.items()
+        ]
+
+        dedupe = self.ctx.get("signature_seen").get_stats()
+        yield "sniper_dedupe_entries", "gauge", "Signatures held by the exact dedupe window", [({}, dedupe["entries"])]
+        yield "sniper_dedupe_duplicates_total", "counter", "Duplicate signatures dropped", [({}, dedupe["duplicates"])]
+
+    def _connector(self):
+        if self.connector is None:
+            return
+        stats = self.connector.get_stats()
+        links = stats["connections"]
+        yield "sniper_ws_connected", "gauge", "1 while the WebSocket link is connected", [
+            ({"link": c["connection"]}, c["connected"]) for c in links
+        ]
+        yield "sniper_ws_messages_total", "counter", "Frames received per WebSocket link", [
+            ({"link": c["connection"]}, c["messages"]) for c in links
+        ]
+        yield "sniper_ws_reconnects_total", "counter", "Reconnects per WebSocket link", [
+            ({"link": c["connection"]}, c["reconnects"]) for c in links
+        ]
+        yield "sniper_ws_frames_rejected_total", "counter", "Frames dropped by the raw pre-filter", [
+            ({}, stats["filter"]["rejected_raw"])
+        ]
+        yield "sniper_tokens_detected_total", "counter", "Tokens detected per DEX", [
+            ({"dex": dex}, n) for dex, n in stats["detected"].items()
+        ]
+
+    def _positions(self):
+        tracker = self.ctx.get("open_position_tracker")
+        with tracker.tokens_lock:
+            open_positions = len(tracker.active_trades)
+        yield "sniper_open_positions", "gauge", "Open positions watched by the tracker", [({}, open_positions)]
+
+        feed = self.ctx.get("pool_price_feed")
+        if feed:
+            stats = feed.get_stats()
+            yield "sniper_price_feed_connected", "gauge", "1 while the pool price feed WebSocket is connected", [
+                ({}, stats["connected"])
+            ]
+            yield "sniper_price_feed_pools", "gauge", "Open positions priced from their pool vaults", [
+                ({"state": "live"}, stats["live"]),
+                ({"state": "subscribing"}, stats["pools"] - stats["live"]),
+                ({"state": "unresolved"}, stats["unresolved"]),
+            ]
+            yield "sniper_price_feed_ticks_total", "counter", "Pool reserve updates received", [({}, stats["ticks"])]
+
+        listener = self.ctx.get("trade_change_listener")
+        if listener:
+            stats = listener.get_stats()
+            yield "sniper_trade_listener_connected", "gauge", "1 while the trades_changed LISTEN connection is up", [
+                ({}, stats["connected"])
+            ]
+            yield "sniper_trade_changes_total", "counter", "Trade changes pushed by Postgres", [({}, stats["changes"])]
+
+        finality = self.ctx.get("finality_checker")
+        if finality:
+            stats = finality.get_stats()
+            yield "sniper_finality_pending", "gauge", "Fast-detected tokens awaiting finality", [({}, stats["pending"])]
+            yield "sniper_finality_dropped_total", "counter", "Fast-detected tokens rolled back", [({}, stats["dropped"])]
+
+    def _stages(self):
+        tracker = self.ctx.get("span_tracker")
+        if tracker:
+            yield "sniper_stage_seconds", "histogram", "Detection / buy stage latency (SPANS)", [
+                ({"stage": stage}, histogram) for stage, histogram in sorted(tracker.histograms().items())
+            ]
@@ -0,0 +1,90 @@
+import time
+import threading
+from collections import OrderedDict
+from config.dex_detection_rules import KNOWN_BASES
+from helpers.framework_utils import run_bg
+from services.bot_context import BotContext
+
+
+class DecimalsIndex:
+    """mint -> decimals (decimals never change): KNOWN_BASES + Postgres + learned from txs.
+
+    Every resolved tx teaches the decimals of all its mints, mostly launches the gates reject, so learned
+    mints live in a bounded LRU; only mints passed to `keep` (tokens that passed the gates) are stored.
+    """
+
+    MAX_ENTRIES = 50_000  # learned / loaded mints held in memory
+    LOAD_RETRY = 30       # seconds before a failed DB load is tried again
+
+    def __init__(self, ctx: BotContext):
+        self.ctx = ctx
+        self.logger = ctx.get("logger")
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+        self.bases = {mint: info["decimals"] for mint, info in KNOWN_BASES.items()}
+        self.decimals: OrderedDict[str, int] = OrderedDict()
+        self.loaded = False
+        self.retry_at = 0.0
+
+    def load(self) -> bool:
+        """Pull the most recent stored mints from the DB; lookups during the load wait for it."""
+        with self.load_lock:
+            if self.loaded or time.monotonic() < self.retry_at:
+                return self.loaded
+            try:
+                stored = self.ctx.get("decimals_dao").get_recent_decimals(self.MAX_ENTRIES)
+            except Exception as e:
+                self.retry_at = time.monotonic() + self.LOAD_RETRY
+                self.logger.warning(f"⚠️ Could not load decimals index from DB (retry in {self.LOAD_RETRY}s): {e}")
+                return False
+            with self.lock:
+                for mint, decimals in stored.items():
+                    if mint not in self.decimals:
+                        self.decimals[mint] = decimals
+                        self.decimals.move_to_end(mint, last=False)  # older than anything learned meanwhile
+                self._trim()
+            self.loaded = True
+        self.logger.info(f"🔢 Decimals index loaded {len(stored)} mints from DB.")
+        return True
+
+    def get(self, mint: str) -> int | None:
+        if mint in self.bases:
+            return self.bases[mint]
+        if not self.loaded:
+            self.load()
+        with self.lock:
+            decimals = self.decimals.get(mint)
+            if decimals is not None:
+                self.decimals.move_to_end(mint)
+        return decimals
+
+    def learn(self, mint: str, decimals) -> None:
+        if not mint or not isinstance(decimals, int) or mint in self.bases:
+            return
+        with self.lock:
+            self.decimals[mint] = decimals
+            self.decimals.move_to_end(mint)
+            self._trim()
+
+    def learn_from_transaction(self, tx_data: dict) -> None:
+        """Harvest decimals from pre/postTokenBalances of a tx we already fetched."""
+        meta = (tx_data or {}).get("meta") or {}
+        for balance in (meta.get("postTokenBalances") or []) + (meta.get("preTokenBalances") or []):
+            self.learn(balance.get("mint"), (balance.get("uiTokenAmount") or {}).get("decimals"))
+
+    def keep(self, mint: str) -> None:
+        """Store a token's decimals for later runs (called once it passed the detection gates)."""
+        with self.lock:
+            decimals = self.decimals.get(mint)
+        if decimals is not None:
+            run_bg(self._persist, mint, decimals, name=f"decimals-{mint[:6]}")
+
+    def _trim(self) -> None:
+        while len(self.decimals) > self.MAX_ENTRIES:
+            self.decimals.popitem(last=False)
+
+    def _persist(self, mint: str, decimals: int) -> None:
+        try:
+            self.ctx.get("decimals_dao").insert_decimals(mint, decimals)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to store decimals for {mint}: {e}")
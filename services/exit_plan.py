@@ -0,0 +1,160 @@
+import math
+from datetime import datetime, timezone
+import numpy as np
+
+# settings an ExitPlan is compiled from; a change to any of them recompiles every open position's plan
+PLAN_SETTINGS = (
+    "TP", "SL", "EARLY_SL_PCT", "EARLY_SL_SECONDS", "MIN_TSL_TRIGGER_MULTIPLIER", "TRAILING_STOP",
+    "TIMEOUT_SECONDS", "TIMEOUT_PNL_FLOOR", "TIMEOUT_PROFIT_THRESHOLD",
+)
+RULES = ("USE_SL", "USE_TP", "USE_TSL", "USE_TIMEOUT")
+TRIGGERS = (None, "EARLY_STOP", "SL", "TP", "TSL", "TIMEOUT")
+
+
+def bought_at(trade: dict) -> float | None:
+    """Epoch seconds of the buy (naive timestamps are UTC), None if the trade has no timestamp."""
+    buy_time = trade.get("timestamp")
+    if not isinstance(buy_time, datetime):
+        return None
+    if buy_time.tzinfo is None:
+        buy_time = buy_time.replace(tzinfo=timezone.utc)
+    return buy_time.timestamp()
+
+
+class ExitPlan:
+    """Absolute trigger prices and deadlines of one open position, compiled once from the exit settings."""
+
+    def __init__(self, trade_id, entry_usd: float, bought: float | None, settings: dict, peak: float = None):
+        rules = settings.get("EXIT_RULES", {})
+        self.trade_id = trade_id
+        self.use_sl = bool(rules.get("USE_SL", False))
+        self.use_tp = bool(rules.get("USE_TP", False))
+        self.use_tsl = bool(rules.get("USE_TSL", False))
+        self.use_timeout = bool(rules.get("USE_TIMEOUT", False))
+
+        self.entry = entry_usd
+        self.valid = entry_usd > 0
+        self.tp_price = entry_usd * settings.get("TP", 2.0)
+        self.sl_price = entry_usd * (1.0 - settings.get("SL", 0.1))
+        self.early_price = entry_usd * (1.0 - settings.get("EARLY_SL_PCT", 0.10))
+        self.early_at = bought + settings.get("EARLY_SL_SECONDS", 30) if bought is not None else math.inf
+        self.pumped_price = entry_usd * settings.get("MIN_TSL_TRIGGER_MULTIPLIER", 1.3)   # SL off from here
+        self.tsl_armed_price = entry_usd * settings.get("MIN_TSL_TRIGGER_MULTIPLIER", 1.15)
+        self.tsl_factor = 1.0 - settings.get("TRAILING_STOP", 0.2)
+        self.timeout_at = bought + settings.get("TIMEOUT_SECONDS", 300) if bought is not None else math.inf
+        self.timeout_low = entry_usd * (1.0 + settings.get("TIMEOUT_PNL_FLOOR", -0.03))
+        self.timeout_high = entry_usd * settings.get("TIMEOUT_PROFIT_THRESHOLD", 1.2)
+
+        self.peak = entry_usd if peak is None else peak
+        self.tsl_stop = self.peak * self.tsl_factor
+
+    @classmethod
+    def from_trade(cls, trade: dict, settings: dict, peak: float = None) -> "ExitPlan":
+        return cls(trade.get("id"), float(trade["entry_usd"]), bought_at(trade), settings, peak)
+
+    def deadlines(self) -> list[float]:
+        """Times at which a rule can fire without a price move (early stop arming, timeout)."""
+        times = []
+        if self.use_sl and self.early_at != math.inf:
+            times.append(self.early_at)
+        if self.use_timeout and self.timeout_at != math.inf:
+            times.append(self.timeout_at)
+        return times
+
+
+def settings_key(settings: dict) -> tuple:
+    rules = settings.get("EXIT_RULES", {})
+    return tuple(settings.get(k) for k in PLAN_SETTINGS) + tuple(bool(rules.get(k, False)) for k in RULES)
+
+
+class ExitPlanBook:
+    """Every open position's ExitPlan as rows of NumPy arrays.
+
+    `evaluate` checks a batch of prices with one vectorised compare per rule, in the usual rule order
+    (SL / EARLY_STOP, TP, TSL, TIMEOUT: the first rule that fires wins). A new peak only moves that row's
+    trailing stop; the TSL peak moves only while TSL is on and no earlier rule fired, as before.
+    """
+
+    FIELDS = (
+        "entry", "tp_price", "sl_price", "early_price", "early_at", "pumped_price", "tsl_armed_price",
+        "tsl_factor", "timeout_at", "timeout_low", "timeout_high", "peak", "tsl_stop",
+    )
+    FLAGS = ("valid", "use_sl", "use_tp", "use_tsl", "use_timeout")
+
+    def __init__(self, capacity: int = 64):
+        self.mints: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.trade_ids: dict[str, object] = {}
+        self.columns = {f: np.zeros(capacity) for f in self.FIELDS}
+        self.columns.update({f: np.zeros(capacity, dtype=bool) for f in self.FLAGS})
+
+    def __len__(self) -> int:
+        return len(self.mints)
+
+    def __contains__(self, mint: str) -> bool:
+        return mint in self.rows
+
+    def __iter__(self):
+        return iter(list(self.mints))
+
+    def add(self, mint: str, plan: ExitPlan) -> None:
+        row = self.rows.get(mint)
+        if row is None:
+            row = len(self.mints)
+            if row == len(self.columns["entry"]):
+                self.columns = {f: np.resize(c, 2 * len(c)) for f, c in self.columns.items()}
+            self.mints.append(mint)
+            self.rows[mint] = row
+        self.trade_ids[mint] = plan.trade_id
+        for field in self.FIELDS + self.FLAGS:
+            self.columns[field][row] = getattr(plan, field)
+
+    def remove(self, mint: str) -> None:
+        row = self.rows.pop(mint, None)
+        if row is None:
+            return
+        self.trade_ids.pop(mint, None)
+        last = len(self.mints) - 1
+        if row != last:  # move the last row into the hole
+            moved = self.mints[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+            self.mints[row] = moved
+            self.rows[moved] = row
+        self.mints.pop()
+
+    def trade_id(self, mint: str):
+        return self.trade_ids.get(mint)
+
+    def entry(self, mint: str) -> float:
+        return float(self.columns["entry"][self.rows[mint]])
+
+    def peak(self, mint: str) -> float:
+        return float(self.columns["peak"][self.rows[mint]])
+
+    def evaluate(self, prices: dict[str, float], now: float) -> dict[str, str]:
+        """Trigger per mint for the positions in `prices` whose exit rule fired (others are left out)."""
+        mints = [m for m, p in prices.items() if p is not None and m in self.rows]
+        if not mints:
+            return {}
+        rows = np.fromiter((self.rows[m] for m in mints), dtype=np.intp, count=len(mints))
+        p = np.fromiter((prices[m] for m in mints), dtype=float, count=len(mints))
+        c = {field: column[rows] for field, column in self.columns.items()}
+
+        sl_active = c["use_sl"] & (c["peak"] < c["pumped_price"])
+        early = sl_active & (now >= c["early_at"]) & (p <= c["early_price"])
+        sl = sl_active & (p <= c["sl_price"])
+        tp = c["use_tp"] & (p >= c["tp_price"])
+        new_peak = c["use_tsl"] & (p > c["peak"])
+        tsl = c["use_tsl"] & ~new_peak & (c["peak"] >= c["tsl_armed_price"]) & (p <= c["tsl_stop"])
+        timeout = c["use_timeout"] & (now > c["timeout_at"]) & (c["timeout_low"] <= p) & (p < c["timeout_high"])
+
+        code = np.select([early, sl, tp, tsl, timeout], [1, 2, 3, 4, 5], default=0)
+        code[~c["valid"]] = 0
+
+        moved = new_peak & c["valid"] & ~(early | sl | tp)
+        if moved.any():
+            self.columns["peak"][rows[moved]] = p[moved]
+            self.columns["tsl_stop"][rows[moved]] = p[moved] * c["tsl_factor"][moved]
+
+        return {mints[i]: TRIGGERS[code[i]] for i in np.flatnonzero(code)}
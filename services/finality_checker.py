@@ -0,0 +1,82 @@
+import threading
+import time
+from threading import Event
+from services.bot_context import BotContext
+
+
+class FinalityChecker:
+    """FAST_DETECTION: confirms that tokens detected at processed/confirmed reach finality, else rolls them back."""
+
+    MAX_STATUSES = 256  # getSignatureStatuses limit per call
+
+    def __init__(self, ctx: BotContext):
+        self.ctx = ctx
+        self.logger = ctx.get("logger")
+        fast = ctx.settings["FAST_DETECTION"]
+        self.timeout = fast["FINALITY_TIMEOUT"]
+        self.interval = fast["CHECK_INTERVAL"]
+        self.lock = threading.Lock()
+        self.pending: dict[str, tuple[str, float]] = {}  # signature -> (token_mint, tracked_at)
+        self.finalized = 0
+        self.dropped = 0
+
+    def track(self, signature: str, token_mint: str) -> None:
+        with self.lock:
+            self.pending.setdefault(signature, (token_mint, time.time()))
+
+    def run(self, stop_event: Event) -> None:
+        while not stop_event.wait(self.interval):
+            with self.lock:
+                batch = list(self.pending.items())[:self.MAX_STATUSES]
+            if batch:
+                self._check(batch)
+
+    def _check(self, batch: list) -> None:
+        signatures = [sig for sig, _ in batch]
+        statuses = self.ctx.get("helius_client").get_signature_statuses(signatures)
+        if statuses is None:
+            return  # RPC failed; retry next round
+        now = time.time()
+        for (signature, (token_mint, tracked_at)), status in zip(batch, statuses):
+            if status and status.get("err") is None and status.get("confirmationStatus") == "finalized":
+                self._resolve(signature)
+                self._mark_finalized(signature, token_mint)
+            elif status and status.get("err") is not None:
+                self._resolve(signature)
+                self._rollback(signature, token_mint, f"failed on-chain: {status['err']}")
+            elif now - tracked_at > self.timeout:
+                self._resolve(signature)
+                self._rollback(signature, token_mint, f"not finalized after {self.timeout}s")
+
+    def _resolve(self, signature: str) -> None:
+        with self.lock:
+            self.pending.pop(signature, None)
+
+    def _mark_finalized(self, signature: str, token_mint: str) -> None:
+        self.finalized += 1
+        self.logger.debug(f"🧱 Detection tx {signature} for {token_mint} finalized.")
+        try:
+            self.ctx.get("token_dao").set_finality(token_mint, "finalized")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not mark {token_mint} finalized: {e}")
+
+    def _rollback(self, signature: str, token_mint: str, reason: str) -> None:
+        """The detection tx was dropped: forget the token and undo its DB rows (kept, flagged, if it was traded)."""
+        self.dropped += 1
+        self.logger.warning(f"🪦 Detection tx {signature} for {token_mint} dropped ({reason}) — rolling back.")
+        with self.ctx.get("known_tokens_lock"):
+            self.ctx.get("known_tokens").discard(token_mint)
+        self.ctx.get("signature_queue").cancel(token_mint)
+        try:
+            if self.ctx.get("token_dao").delete_unfinalized_token(token_mint, signature):
+                return
+            # nothing deleted: either never stored, or already traded (kept and flagged)
+            if self.ctx.get("token_dao").set_finality(token_mint, "dropped"):
+                self.logger.critical(f"🚨 {token_mint} was traded before its detection tx was dropped — check the open position.")
+        except Exception as e:
+            self.logger.error(f"❌ Rollback of {token_mint} failed: {e}", exc_info=True)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            pending = len(self.pending)
+        return {"pending": pending, "finalized": self.finalized, "dropped": self.dropped}
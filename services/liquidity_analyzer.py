@@ -233,6 +233,27 @@ class LiquidityAnalyzer:
         best_owner, _ = max(valid_pools, key=lambda x: x[1])
         return best_owner
 
+    def creation_blocktime(self, tx_data: dict, token_mint: str) -> int | None:
+        """blockTime of `tx_data` if it is the tx that initialised `token_mint` (InitializeMint* + mint in its accounts)."""
+        try:
+            meta = tx_data.get("meta") or {}
+            block_time = tx_data.get("blockTime")
+            if not block_time or meta.get("err") is not None:
+                return None
+            if not any("Instruction: InitializeMint" in log for log in meta.get("logMessages") or []):
+                return None
+            keys = tx_data.get("transaction", {}).get("message", {}).get("accountKeys", [])
+            keys = [k.get("pubkey") if isinstance(k, dict) else k for k in keys]
+            loaded = meta.get("loadedAddresses") or {}
+            if token_mint not in keys + loaded.get("writable", []) + loaded.get("readonly", []):
+                return None
+            # a freshly initialised mint has no balances before this tx
+            if any(b.get("mint") == token_mint for b in meta.get("preTokenBalances") or []):
+                return None
+            return int(block_time)
+        except Exception:
+            return None
+
     def extract_token_mint(self,tx_data:dict) -> str:
         try:
             post_balances = tx_data.get("meta", {}).get("postTokenBalances", [])
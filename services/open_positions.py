@@ -1,14 +1,23 @@
 import time
-from datetime import datetime, timezone
+import math
+import heapq
+import queue
+from datetime import datetime
 import threading
 from services.bot_context import BotContext
-from helpers.framework_utils import get_formatted_date_str,unique_recovery_sig
+from helpers.framework_utils import get_formatted_date_str,unique_recovery_sig,run_bg
 from config.dex_detection_rules import KNOWN_TOKENS
+from helpers.rate_limiter import rate_priority
+from helpers.metrics import metrics
+from services.exit_plan import ExitPlan, ExitPlanBook, settings_key
+from dao.trade_dao import OPEN_TRADE_STATUSES
 
 
 
 
 class OpenPositionTracker:
+    SELL_RETRY_AFTER = 30  # seconds a sent (unconfirmed) sell blocks a new exit for the same position
+
     def __init__(self, ctx: BotContext):
         self.ctx = ctx
         self.settings = ctx.settings
@@ -19,101 +28,299 @@ class OpenPositionTracker:
         self.notifier = ctx.get("notification_manager")
 
         self.active_trades = {}
-        self.peak_price_dict = {}
+        self.token_meta = {}  # mint -> {"name", "image"}, fetched once per position
         self.buy_timestamp = {}
-        self.sync_interval = 30 
+        self.sync_interval = 30  # full DB sync while no TradeChangeListener is connected
+        self.resync_interval = self.settings["TRADE_SYNC"]["RESYNC_INTERVAL"]  # ... and while one is
         self.reconcile_interval = 120 
         self.last_reconcile = 0
         self.last_sync = 0
+        self.changes = queue.Queue()  # trade rows pushed by TradeChangeListener
+        self.closed_ids = set()       # trades seen closed that a stale full sync or change may still show open
+
+        # exit engine: compiled trigger levels per position, evaluated in one batch per wake-up;
+        # positions without a tick for `poll_interval` seconds are priced by polling instead
+        self.poll_interval = 3
+        self.last_poll = 0
+        self.ticks = queue.Queue()
+        self.plans = ExitPlanBook()
+        self.plan_key = settings_key(self.settings)  # plans are recompiled when the exit settings change
+        self.deadlines: list[tuple[float, str]] = []  # heap of (time, mint): early-stop arming, timeout
+        self.last_price: dict[str, float] = {}
+        self.priced_at: dict[str, float] = {}
+        self.logged_at: dict[str, float] = {}
+        self.exiting: dict[str, float] = {}  # mint -> no new exit before this time (inf while a sell is in flight)
 
         self.base_token = "So11111111111111111111111111111111111111112"
         self.tokens_lock = threading.Lock()
 
-        self.exit_checks = {
-            "USE_SL": self.check_emergency_sl,
-            "USE_TP": self.check_take_profit,
-            "USE_TSL": self.check_trailing_stop,
-            "USE_TIMEOUT": self.check_timeout,
-        }
-
     def track_positions(self, stop_event):
         self.logger.info("📊 Starting DB-aware OpenPositionTracker...")
 
         while not stop_event.is_set():
+            ticks = self._next_ticks(self._next_wakeup())
             try:
+                started = time.monotonic()
                 now = time.time()
                 if now - self.last_reconcile > self.reconcile_interval:
                     self._reconcile_wallet_with_db()
                     self.last_reconcile = now
-                if now - self.last_sync > self.sync_interval:
+                if now - self.last_sync > self._sync_interval():
                     self._sync_from_db()
                     self.last_sync = now
+                self._apply_trade_changes()
+
+                self._sync_plans()
+                feed = self.ctx.get("pool_price_feed")
+                if feed:
+                    feed.track(list(self.plans))
 
-                if not self.active_trades:
+                if not self.plans:
                     time.sleep(1)
                     continue
 
-                self._evaluate_trades()
+                self._evaluate_trades(ticks)
+                metrics.observe("sniper_tracker_cycle_seconds", time.monotonic() - started)
 
             except Exception as e:
                 self.logger.error(f"❌ Error in OpenPositionTracker: {e}", exc_info=True)
 
-            time.sleep(3)
+    def on_price_tick(self, token_mint: str, price: float):
+        """Called by PoolPriceFeed on every reserve change of an open position's pool."""
+        self.ticks.put((token_mint, price))
+
+    def on_trade_change(self, change: dict):
+        """Called by TradeChangeListener with every trade row Postgres pushes on `trades_changed`."""
+        self.changes.put(change)
+        self.ticks.put(None)  # wake the loop: a new buy is tracked right away
+
+    def request_resync(self):
+        """Full DB sync on the next cycle (the change listener (re)connected and may have missed changes)."""
+        self.last_sync = 0
+        self.ticks.put(None)
+
+    def _sync_interval(self) -> float:
+        listener = self.ctx.get("trade_change_listener")
+        return self.resync_interval if listener and listener.connected else self.sync_interval
+
+    def _next_wakeup(self) -> float:
+        """Seconds until the next poll or deadline, whichever comes first."""
+        wake = self.last_poll + self.poll_interval
+        if self.deadlines:
+            wake = min(wake, self.deadlines[0][0])
+        return max(0.0, wake - time.time())
+
+    def _next_ticks(self, timeout: float) -> dict[str, float]:
+        """Block until a tick arrives (or `timeout`), then drain the queue: latest price per mint."""
+        ticks = {}
+        try:
+            item = self.ticks.get(timeout=timeout)
+            while True:
+                if item is not None:  # None only wakes the loop
+                    ticks[item[0]] = item[1]
+                item = self.ticks.get_nowait()
+        except queue.Empty:
+            pass
+        return ticks
 
     def _sync_from_db(self):
+        """Full sync: merge the DB's open trades into active_trades instead of replacing it."""
         try:
             sim_mode = self.settings["SIM_MODE"]
-            open_trades = self.trade_dao.get_open_trades(sim_mode)
+            open_trades = {t["token_address"]: t for t in self.trade_dao.get_open_trades(sim_mode)}
             with self.tokens_lock:
-                self.active_trades = {t["token_address"]: t for t in open_trades}
+                self.closed_ids &= {t["id"] for t in open_trades.values()}  # the DB agrees on the others
+                for mint in [m for m in self.active_trades if m not in open_trades]:
+                    self.active_trades.pop(mint)
+                for mint, trade in open_trades.items():
+                    if trade["id"] not in self.closed_ids and not self._is_newer(self.active_trades.get(mint), trade):
+                        self.active_trades[mint] = trade
             self.logger.debug(f"🔄 Synced {len(open_trades)} {'SIMULATED' if sim_mode else 'REAL'} trades from DB.")
         except Exception as e:
             self.logger.error(f"❌ Failed DB sync: {e}", exc_info=True)
 
-    def _evaluate_trades(self):
-        jup = self.ctx.get("jupiter_client")
-        hel = self.ctx.get("helius_client")
-        exit_rules = self.settings.get("EXIT_RULES", {})
+    def _apply_trade_changes(self):
+        """Apply pushed trade rows: open trades are (re)tracked, closed or deleted ones dropped."""
+        sim_mode = self.settings["SIM_MODE"]
+        while True:
+            try:
+                change = self.changes.get_nowait()
+            except queue.Empty:
+                return
+            mint = change.get("token_address")
+            if not mint or change.get("simulation") != sim_mode:
+                continue
+            is_open = (
+                change.get("op") != "DELETE"
+                and change.get("status") in OPEN_TRADE_STATUSES
+                and change["id"] not in self.closed_ids
+            )
+            with self.tokens_lock:
+                current = self.active_trades.get(mint)
+                if self._is_newer(current, change):
+                    continue  # a full sync already brought a later version
+                if is_open:
+                    self.active_trades[mint] = self._trade_row(change)
+                    continue
+                self.closed_ids.add(change["id"])
+                if current is not None and current.get("id") == change["id"]:
+                    self.active_trades.pop(mint)
+                    self.logger.debug(f"🔄 Trade {change['id']} of {mint} is {change.get('status') or 'deleted'}, untracked.")
+
+    @staticmethod
+    def _is_newer(current, trade) -> bool:
+        """True if `current` is a later version of the same trade row."""
+        return (
+            current is not None and current.get("id") == trade["id"]
+            and (current.get("version") or 0) > (trade.get("version") or 0)
+        )
+
+    @staticmethod
+    def _trade_row(change: dict) -> dict:
+        """A pushed change in the shape of a `get_open_trades` row."""
+        trade = {k: change.get(k) for k in (
+            "id", "token_id", "token_address", "trade_type", "entry_usd", "simulation", "status", "version"
+        )}
+        trade["timestamp"] = datetime.fromisoformat(change["timestamp"]) if change.get("timestamp") else None
+        return trade
+
+    def drop_trade(self, token_mint: str):
+        """Untrack a trade this process just closed, so a full sync read before the close cannot bring it back."""
         with self.tokens_lock:
-            tokens = list(self.active_trades.keys())
+            trade = self.active_trades.pop(token_mint, None)
+            if trade is not None:
+                self.closed_ids.add(trade["id"])
 
-        for token_mint in tokens:
-            trade = self.active_trades.get(token_mint)
-            if not trade:
-                continue
+    def _sync_plans(self):
+        """Compile plans for new positions (buys add themselves to active_trades) and drop closed ones.
 
+        A change to the exit settings (settings window) recompiles every plan, keeping the TSL peaks.
+        """
+        with self.tokens_lock:
+            trades = {m: t for m, t in self.active_trades.items() if m not in (self.base_token, "SOL")}
+        for mint in [m for m in self.plans if m not in trades]:
+            self._forget(mint)
+
+        key = settings_key(self.settings)
+        recompile = key != self.plan_key
+        if recompile:
+            self.plan_key = key
+            self.deadlines = []
+            self.logger.info(f"🔧 Exit settings changed, recompiling {len(self.plans)} exit plan(s).")
+
+        for mint, trade in trades.items():
+            same_trade = mint in self.plans and self.plans.trade_id(mint) == trade.get("id")
+            if same_trade and not recompile:
+                continue
             try:
-                if token_mint == self.base_token or token_mint == "SOL":
-                    continue
-                data = hel.get_token_meta_data(token_mint)
-                token_image = data["image"]
-                token_name = data["name"]
-                entry_usd = float(trade["entry_usd"])
-                current_price_usd = jup.get_token_price(token_mint)
-                pnl = ((current_price_usd - entry_usd) / entry_usd) * 100
-
-                self.tracker_logger.info({
-                    "event": "track",
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "token_mint": token_mint,
-                    "entry_price": entry_usd,
-                    "current_price": current_price_usd,
-                    "pnl": pnl,
-                    "token_image":token_image,
-                    "token_name":token_name
-                })
-
-                for rule, func in self.exit_checks.items():
-                    if exit_rules.get(rule, False):
-                        result = func(token_mint, entry_usd, current_price_usd, trade)
-                        if result:
-                            trigger = result["trigger"]
-                            self.logger.info(f"⚡ Exit triggered: {trigger} for {token_mint} ({pnl:.2f}%)")
-                            self._handle_exit(token_mint, trade, current_price_usd, pnl, trigger)
-                            break
+                plan = ExitPlan.from_trade(trade, self.settings, self.plans.peak(mint) if same_trade else None)
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.warning(f"⚠️ Cannot plan exits for {mint}: {e}")
+                continue
+            self.plans.add(mint, plan)
+            for deadline in plan.deadlines():
+                heapq.heappush(self.deadlines, (deadline, mint))
+
+    def _forget(self, mint: str):
+        self.plans.remove(mint)
+        for state in (self.last_price, self.priced_at, self.logged_at, self.exiting, self.token_meta):
+            state.pop(mint, None)
+
+    def _evaluate_trades(self, ticks: dict[str, float]):
+        """Check ticked positions, positions whose deadline passed, and poll prices for positions without ticks."""
+        now = time.time()
+        prices = {mint: price for mint, price in ticks.items() if mint in self.plans}
+        while self.deadlines and self.deadlines[0][0] <= now:
+            _, mint = heapq.heappop(self.deadlines)
+            if mint in self.plans and mint not in prices and mint in self.last_price:
+                prices[mint] = self.last_price[mint]
+        if now - self.last_poll >= self.poll_interval:
+            self.last_poll = now
+            stale = [mint for mint in self.plans if mint not in prices and now - self.priced_at.get(mint, 0) >= self.poll_interval]
+            if stale:
+                prices.update(self._poll_prices(stale))
+
+        ready = {}  # priced positions without a sell in flight
+        for token_mint, current_price_usd in prices.items():
+            if current_price_usd is None:
+                continue
+            self.last_price[token_mint] = current_price_usd
+            self.priced_at[token_mint] = now
+            if now < self.exiting.get(token_mint, 0):
+                continue
+            ready[token_mint] = current_price_usd
+            if now - self.logged_at.get(token_mint, 0) >= self.poll_interval:  # not on every tick
+                self.logged_at[token_mint] = now
+                try:
+                    self._log_track(token_mint, current_price_usd)
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Tracking log failed for {token_mint}: {e}")
 
+        # one vectorised pass over all of them
+        for token_mint, trigger in self.plans.evaluate(ready, now).items():
+            try:
+                self._exit(token_mint, ready[token_mint], trigger)
             except Exception as e:
                 self.logger.warning(f"⚠️ Evaluation error for {token_mint}: {e}")
+
+    @rate_priority("EXIT_PRICING")
+    def _poll_prices(self, mints: list) -> dict:
+        """Streamed price where the pool feed has one, one batched Jupiter fetch for the rest."""
+        prices = {}
+        feed = self.ctx.get("pool_price_feed")
+        if feed:
+            for mint in mints:
+                price = feed.get_price(mint)
+                if price is not None:
+                    prices[mint] = price
+        polled = [mint for mint in mints if mint not in prices]
+        if polled:
+            prices.update(self.ctx.get("jupiter_client").get_token_prices(polled))
+        return prices
+
+    def _pnl(self, token_mint: str, current_price_usd: float) -> float:
+        entry_usd = self.plans.entry(token_mint)
+        return ((current_price_usd - entry_usd) / entry_usd) * 100 if entry_usd else 0.0
+
+    def _log_track(self, token_mint: str, current_price_usd: float):
+        meta = self._token_meta(token_mint)
+        self.tracker_logger.info({
+            "event": "track",
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "token_mint": token_mint,
+            "entry_price": self.plans.entry(token_mint),
+            "current_price": current_price_usd,
+            "pnl": self._pnl(token_mint, current_price_usd),
+            "token_image": meta.get("image"),
+            "token_name": meta.get("name")
+        })
+
+    def _exit(self, token_mint: str, current_price_usd: float, trigger: str):
+        trade = self.active_trades.get(token_mint)
+        if not trade:
+            return  # closed meanwhile
+        pnl = self._pnl(token_mint, current_price_usd)
+        self.logger.info(f"⚡ Exit triggered: {trigger} for {token_mint} ({pnl:.2f}%)")
+        self.exiting[token_mint] = math.inf
+        run_bg(self._dispatch_exit, token_mint, trade, current_price_usd, pnl, trigger, name=f"Exit-{token_mint[:6]}")
+
+    def _dispatch_exit(self, token_mint, trade, current_price_usd, pnl, trigger):
+        try:
+            closed = self._handle_exit(token_mint, trade, current_price_usd, pnl, trigger)
+        except Exception as e:
+            self.logger.error(f"❌ Exit for {token_mint} failed: {e}", exc_info=True)
+            closed = False
+        # a failed sell is retried after a poll interval; a sent one once it had time to confirm and close
+        if token_mint in self.exiting:
+            self.exiting[token_mint] = time.time() + (self.SELL_RETRY_AFTER if closed else self.poll_interval)
+
+    def _token_meta(self, token_mint: str) -> dict:
+        meta = self.token_meta.get(token_mint)
+        if meta is None:
+            meta = self.ctx.get("helius_client").get_token_meta_data(token_mint)
+            if meta:
+                self.token_meta[token_mint] = meta
+        return meta or {}
     
     def _handle_exit(self, token_mint, trade, current_price_usd, pnl, trigger):
         trade_dao = self.ctx.get("trade_dao")
@@ -148,14 +355,15 @@ class OpenPositionTracker:
                 f"PnL: {pnl:.2f}% | Exit USD: {current_price_usd:.8f}"
             )
 
-            with self.tokens_lock:
-                self.active_trades.pop(token_mint, None)
-            return
+            self.drop_trade(token_mint)
+            return True
         sig = self.trader.sell(token_mint, self.base_token, trigger_reason=trigger)
         self.tracker_logger.info({"event": "sell", "token_mint": token_mint})
 
         if not sig:
             self.logger.warning(f"⚠️ Real SELL failed for {token_mint}, keeping trade open.")
+            return False
+        return True
 
     def manual_close(self, token_mint: str,trigger = "MANUAL") -> bool:
         try:
@@ -213,8 +421,7 @@ class OpenPositionTracker:
                     f"✅ Manual real closure for {token_mint} — TX: {sig} | "
                     f"PnL: {pnl:.2f}% | Exit USD: {current_price_usd:.6f}"
                 )
-            with self.tokens_lock:
-                self.active_trades.pop(token_mint, None)
+            self.drop_trade(token_mint)
 
             self.tracker_logger.info({
                 "event": "sell",
@@ -247,6 +454,7 @@ class OpenPositionTracker:
             self.logger.error(f"⚠️ has_open_positions failed: {e}", exc_info=True)
             return False
 
+    @rate_priority("ANALYTICS")
     def _reconcile_wallet_with_db(self):
         try:
             wallet = self.ctx.get("wallet_client")
@@ -344,8 +552,7 @@ class OpenPositionTracker:
                         pnl_percent=-100.0,
                         trigger_reason="LOST",
                     )
-                    with self.tokens_lock:
-                        self.active_trades.pop(token_mint, None)
+                    self.drop_trade(token_mint)
 
             self.logger.info(
                 f"🔍 Reconciliation complete — Wallet={len(wallet_tokens)}, DB={len(db_tokens)}"
@@ -353,83 +560,3 @@ class OpenPositionTracker:
 
         except Exception as e:
             self.logger.error(f"❌ Wallet↔DB reconciliation failed: {e}", exc_info=True)
-
-    def check_take_profit(self, token_mint, buy_usd, curr_usd, trade):
-        tp = self.settings.get("TP", 2.0)
-        return {"trigger": "TP"} if curr_usd >= buy_usd * tp else None
-
-    def check_trailing_stop(self, token_mint, buy_usd, curr_usd, trade):
-        sl = self.settings.get("TRAILING_STOP", 0.2)
-        min_trigger = self.settings.get("MIN_TSL_TRIGGER_MULTIPLIER", 1.15)
-        peak = self.peak_price_dict.get(token_mint, buy_usd)
-        if curr_usd > peak:
-            self.peak_price_dict[token_mint] = curr_usd
-        if peak >= buy_usd * min_trigger and curr_usd <= peak * (1 - sl):
-            return {"trigger": "TSL"}
-        return None
-
-    def check_emergency_sl(self, token_mint, buy_usd, curr_usd, trade):
-        sl_pct = self.settings.get("SL", 0.1)
-        early_pct = self.settings.get("EARLY_SL_PCT", 0.10)
-        early_seconds = self.settings.get("EARLY_SL_SECONDS", 30)
-
-        peak = self.peak_price_dict.get(token_mint, buy_usd)
-        min_tsl_mult = self.settings.get("MIN_TSL_TRIGGER_MULTIPLIER", 1.3)
-        has_pumped = peak >= buy_usd * min_tsl_mult
-        if has_pumped:
-            return None
-        seconds_since = None
-        try:
-            buy_time = trade.get("timestamp")
-            if isinstance(buy_time, datetime):
-                if buy_time.tzinfo is None:
-                    buy_time = buy_time.replace(tzinfo=timezone.utc)
-                now = datetime.now(timezone.utc)
-                seconds_since = (now - buy_time).total_seconds()
-        except Exception as e:
-            self.logger.warning(f"⚠️ SL time calc failed for {token_mint}: {e}")
-        if not buy_usd:
-            return None
-        price_ratio = curr_usd / buy_usd
-        if (
-            seconds_since is not None
-            and seconds_since >= early_seconds
-            and price_ratio <= (1.0 - early_pct) 
-        ):
-            return {"trigger": "EARLY_STOP"}
-        if price_ratio <= (1.0 - sl_pct):         
-            return {"trigger": "SL"}
-
-        return None
-
-    def check_timeout(self, token_mint, buy_usd, curr_usd, trade):
-        timeout = self.settings.get("TIMEOUT_SECONDS", 300)
-        threshold = self.settings.get("TIMEOUT_PROFIT_THRESHOLD", 1.2)
-        pnl_floor = self.settings.get("TIMEOUT_PNL_FLOOR", -0.03)  # e.g. -3%
-
-        try:
-            buy_time = trade.get("timestamp")
-            if isinstance(buy_time, datetime):
-                if buy_time.tzinfo is None:
-                    buy_time = buy_time.replace(tzinfo=timezone.utc)
-                now = datetime.now(timezone.utc)
-                seconds_since = (now - buy_time).total_seconds()
-            else:
-                seconds_since = 0
-
-            if not buy_usd:
-                return None
-            price_ratio = curr_usd / buy_usd
-            pnl_frac = price_ratio - 1.0
-            if (
-                seconds_since > timeout
-                and curr_usd < buy_usd * threshold
-                and pnl_frac >= pnl_floor
-            ):
-                return {"trigger": "TIMEOUT"}
-
-        except Exception as e:
-            self.logger.warning(f"⚠️ Timeout check failed for {token_mint}: {e}")
-
-        return None
-
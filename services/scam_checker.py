@@ -1,4 +1,8 @@
+import asyncio
+from threading import Event
 from services.bot_context import BotContext
+from helpers.rate_limiter import rate_priority
+from helpers.span_tracker import span
 
 class ScamChecker:
     def __init__(self, ctx:BotContext):
@@ -32,54 +36,91 @@ class ScamChecker:
         self.logger.info(f"✅ Token {token_mint} passed quote sanity checks.")
         return False
   
-    def first_phase_tests(self, token_mint: str) -> bool:
+    def first_phase_tests(self, token_mint: str, cancel: Event = None) -> bool:
+        """Quote, mint info and (mutable tokens) RugCheck; returns False early once `cancel` is set."""
         token_amount = self.ctx.get("jupiter_client").get_solana_token_worth_in_dollars(
             self.ctx.settings["TRADE_AMOUNT"]
         )
+        if cancel and cancel.is_set():
+            return False
         quote = self.ctx.get("jupiter_client").get_quote_dict(
             token_mint,
             "So11111111111111111111111111111111111111112",  # WSOL
             token_amount,
         )
+        if not self._quote_passes(token_mint, quote):
+            return False
+        try:
+            if cancel and cancel.is_set():
+                return False
+            with span("mint_info"):
+                mint_info = self.ctx.get("helius_client").get_mint_account_info(token_mint) or {}
+            return self._mint_info_passes(token_mint, mint_info, cancel)
+        except Exception as e:
+            self.logger.error(f"❌ Error checking scam tests for {token_mint}: {e}", exc_info=True)
+            return False
 
+    async def first_phase_tests_async(self, token_mint: str, cancel: Event = None) -> bool:
+        jup = self.ctx.get("async_jupiter_client")
+        token_amount = await jup.get_solana_token_worth_in_dollars(self.ctx.settings["TRADE_AMOUNT"])
+        if cancel and cancel.is_set():
+            return False
+        quote = await jup.get_quote_dict(
+            token_mint,
+            "So11111111111111111111111111111111111111112",  # WSOL
+            token_amount,
+        )
+        if not self._quote_passes(token_mint, quote):
+            return False
+        try:
+            if cancel and cancel.is_set():
+                return False
+            with span("mint_info"):
+                mint_info = await self.ctx.get("async_helius_client").get_mint_account_info(token_mint) or {}
+            # may call RugCheck (blocking) for mutable tokens; a thread is not cancelled with its task, `cancel` is
+            return await asyncio.to_thread(self._mint_info_passes, token_mint, mint_info, cancel)
+        except Exception as e:
+            self.logger.error(f"❌ Error checking scam tests for {token_mint}: {e}", exc_info=True)
+            return False
+
+    def _quote_passes(self, token_mint: str, quote: dict) -> bool:
         if not quote.get("quote") or not quote.get("quote_price"):
             return False
+        return not self.is_token_scam(quote["quote"], token_mint)
 
-        if self.is_token_scam(quote["quote"], token_mint):
+    def _mint_info_passes(self, token_mint: str, mint_info: dict, cancel: Event = None) -> bool:
+        token_info = mint_info.get("token_info") or {}
+        mint_authority = token_info.get("mint_authority")
+        freeze_authority = token_info.get("freeze_authority")
+        if mint_authority is not None:
+            self.logger.warning(
+                f"🚨 Token {token_mint} mint authority still exists ({mint_authority}). HIGH RISK."
+            )
             return False
-        try:
-            mint_info = self.ctx.get("helius_client").get_mint_account_info(token_mint) or {}
-            token_info = mint_info.get("token_info") or {}
-            mint_authority = token_info.get("mint_authority")
-            freeze_authority = token_info.get("freeze_authority")
-            if mint_authority is not None:
-                self.logger.warning(
-                    f"🚨 Token {token_mint} mint authority still exists ({mint_authority}). HIGH RISK."
-                )
+        if freeze_authority is not None:
+            self.logger.warning(
+                f"🚨 Token {token_mint} freeze authority still exists ({freeze_authority}). HIGH RISK."
+            )
+            return False
+        if mint_info.get("mutable", False):
+            if cancel and cancel.is_set():
                 return False
-            if freeze_authority is not None:
+            with span("rugcheck"):
+                unlocked = self.ctx.get("rug_check").is_liquidity_unlocked(token_mint)
+            if unlocked:
                 self.logger.warning(
-                    f"🚨 Token {token_mint} freeze authority still exists ({freeze_authority}). HIGH RISK."
+                    f"🚨 Token {token_mint} is mutable & liquidity is NOT locked! HIGH RISK."
                 )
                 return False
-            if mint_info.get("mutable", False):
-                if self.ctx.get("rug_check").is_liquidity_unlocked(token_mint):
-                    self.logger.warning(
-                        f"🚨 Token {token_mint} is mutable & liquidity is NOT locked! HIGH RISK."
-                    )
-                    return False
-                else:
-                    self.logger.info(
-                        f"⚠️ Token {token_mint} is mutable but liquidity is locked. Still some risk."
-                    )
-
-            self.logger.info(f"✅ Token {token_mint} passed first-phase scam checks.")
-            return True
+            else:
+                self.logger.info(
+                    f"⚠️ Token {token_mint} is mutable but liquidity is locked. Still some risk."
+                )
 
-        except Exception as e:
-            self.logger.error(f"❌ Error checking scam tests for {token_mint}: {e}", exc_info=True)
-            return False
+        self.logger.info(f"✅ Token {token_mint} passed first-phase scam checks.")
+        return True
  
+    @rate_priority("ANALYTICS")
     def second_phase_tests(self, token_mint:str,signature:str,market_cap:float, attempt:int=1):
         self.logger.info(f"⏳ Running DELAYED post-buy check (attempt {attempt}) for {token_mint}...")
 
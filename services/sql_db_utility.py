@@ -29,6 +29,21 @@ class SqlDBUtility:
             Logger.info("✅ Connected to SQL database.")
         return self.conn
 
+    def listen(self, channel: str):
+        """Separate autocommit connection LISTENing on `channel` (poll it for `notifies`)."""
+        conn = psycopg2.connect(
+            host=self.creds["DB_HOST"],
+            port=self.creds["DB_PORT"],
+            user=self.creds["DB_USER"],
+            password=self.creds["DB_PASSWORD"],
+            dbname=self.creds["DB_NAME"]
+        )
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {channel};")
+        Logger.info(f"👂 Listening on DB channel '{channel}'.")
+        return conn
+
     def execute_select(self, sql: str, params: tuple = None):
         conn = self.create_connection()
         try:
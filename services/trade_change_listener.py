@@ -0,0 +1,67 @@
+import json
+import select
+from threading import Event
+from services.bot_context import BotContext
+
+
+class TradeChangeListener:
+    """TRADE_SYNC: LISTENs on `trades_changed` and hands every trade change to the OpenPositionTracker.
+
+    The `trades_notify` trigger (bot_scripts/db_initializer.py) pushes the changed row; changes made
+    while the connection was down are picked up by a full resync of the tracker after reconnecting.
+    """
+
+    CHANNEL = "trades_changed"
+    RECONNECT_MAX_DELAY = 30
+
+    def __init__(self, ctx: BotContext):
+        self.ctx = ctx
+        self.logger = ctx.get("logger")
+        self.connected = False
+        self.changes = 0
+        self.reconnects = 0
+
+    def run(self, stop_event: Event) -> None:
+        delay = 1
+        while not stop_event.is_set():
+            try:
+                conn = self.ctx.get("sql_db").listen(self.CHANNEL)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Trade change listener cannot connect: {e} (retry in {delay}s)")
+                stop_event.wait(delay)
+                delay = min(self.RECONNECT_MAX_DELAY, delay * 2)
+                continue
+
+            delay = 1
+            self.connected = True
+            self.ctx.get("open_position_tracker").request_resync()  # changes missed while not listening
+            try:
+                self._listen(conn, stop_event)
+            except Exception as e:
+                self.logger.error(f"❌ Trade change listener lost its connection: {e}")
+                self.reconnects += 1
+            finally:
+                self.connected = False
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _listen(self, conn, stop_event: Event) -> None:
+        tracker = self.ctx.get("open_position_tracker")
+        while not stop_event.is_set():
+            if not select.select([conn], [], [], 1)[0]:  # short timeout so the stop event is noticed
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                try:
+                    change = json.loads(notify.payload)
+                except ValueError:
+                    self.logger.warning(f"⚠️ Unreadable trade change: {notify.payload[:200]}")
+                    continue
+                self.changes += 1
+                tracker.on_trade_change(change)
+
+    def get_stats(self) -> dict:
+        return {"connected": self.connected, "changes": self.changes, "reconnects": self.reconnects}
@@ -1,6 +1,7 @@
 import time
 from collections import deque
 from services.bot_context import BotContext
+from helpers.rate_limiter import rate_priority
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from concurrent.futures import Future
 
@@ -108,6 +109,7 @@ class VolumeTracker:
         volumes[mint][f"{label}_usd"] += usd_value
         volumes[mint]["total_usd"] = volumes[mint]["buy_usd"] + volumes[mint]["sell_usd"]
 
+    @rate_priority("ANALYTICS")
     def _volume_worker(self, token_mint:str, signature:str,block_time:int)->None:
         pool_address = self.ctx.get("liquidity_dao").get_pool_address(token_mint)
         snap = self.parse_helius_swap_volume(pool_address)
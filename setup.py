@@ -13,6 +13,7 @@ setup(
         "pillow==11.3.0",
         "psycopg2-binary==2.9.11",
         "requests==2.32.3",
+        "aiohttp==3.10.11",
         "base58==2.1.1",
         "solana==0.35.0",
         "solders==0.21.0",
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+
+from helpers import asset_cache
+from helpers.asset_cache import AssetCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(asset_cache, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_immutable_and_mutable_fields_expire_separately(clock):
+    cache = AssetCache(immutable_ttl=3600, mutable_ttl=30)
+    cache.put("A", {"id": "A"})
+
+    clock.now += 29
+    assert cache.get("A", mutable=True) == {"id": "A"}
+    clock.now += 2
+    assert cache.get("A", mutable=True) is None  # supply/authorities are stale
+    assert cache.get("A") == {"id": "A"}  # name/decimals still fresh
+    clock.now += 3600
+    assert cache.get("A") is None
+
+
+def test_put_refreshes_the_entry(clock):
+    cache = AssetCache(mutable_ttl=30)
+    cache.put("A", {"supply": 1})
+    clock.now += 31
+    cache.put("A", {"supply": 2})
+    assert cache.get("A", mutable=True) == {"supply": 2}
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = AssetCache(max_entries=2)
+    cache.put("A", {"id": "A"})
+    cache.put("B", {"id": "B"})
+    cache.get("A")  # A is now the most recently used
+    cache.put("C", {"id": "C"})
+    assert cache.get("B") is None
+    assert cache.get("A") and cache.get("C")
+
+
+def test_invalidate_and_stats(clock):
+    cache = AssetCache()
+    cache.put("A", {"id": "A"})
+    cache.get("A")
+    cache.invalidate("A")
+    cache.invalidate("missing")
+    assert cache.get("A") is None
+    assert cache.get_stats() == {"entries": 0, "hits": 1, "misses": 1, "hit_rate": 0.5}
@@ -0,0 +1,48 @@
+import asyncio
+import logging
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils
+
+from clients.async_jupiter_client import AsyncJupiterClient
+from config.third_parties import JUPITER_STATION
+from helpers.rate_limiter import RateLimiter
+
+
+class FakeContext:
+    def __init__(self, **services):
+        self.services = services
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+class FakePriceApi:
+    def __init__(self, unpriced=()):
+        self.unpriced = set(unpriced)
+        self.requests = []
+
+    async def get(self, endpoint):
+        ids = parse_qs(urlsplit(endpoint).query)["ids"][0].split(",")
+        self.requests.append(ids)
+        return {mint: {"usdPrice": i + 1.0} for i, mint in enumerate(ids) if mint not in self.unpriced}
+
+
+def test_prices_are_requested_in_chunks_of_price_max_ids():
+    api = FakePriceApi(unpriced={"mint7"})
+    client = AsyncJupiterClient(FakeContext(
+        logger=logging.getLogger("test_async_jupiter_client"),
+        jupiter_async_requests=api,
+        jupiter_rl=RateLimiter(min_interval=0, jitter_range=None),
+    ))
+    size = JUPITER_STATION["PRICE_MAX_IDS"]
+    mints = [f"mint{i}" for i in range(2 * size + 5)] + ["mint0"]
+
+    prices = asyncio.run(client.get_token_prices(mints))
+
+    assert [len(ids) for ids in api.requests] == [size, size, 5]
+    assert sorted(m for ids in api.requests for m in ids) == sorted(set(mints))
+    assert set(prices) == set(mints)
+    assert prices["mint7"] is None and prices["mint0"] == 1.0
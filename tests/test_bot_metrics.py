@@ -0,0 +1,50 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils (executors)
+
+from helpers.asset_cache import AssetCache
+from helpers.metrics import MetricsRegistry
+from helpers.mint_work_queue import MintWorkQueue
+from helpers.signature_dedupe import SignatureDedupe
+from services.bot_metrics import BotMetrics
+
+
+class FakeContext:
+    def __init__(self, **services):
+        self.services = services
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+def render(helius) -> str:
+    queue = MintWorkQueue()
+    queue.put(("sig", None, "mint", "ws", "pumpfun"))
+    tracker = SimpleNamespace(tokens_lock=threading.Lock(), active_trades={"mint": {"id": 1}})
+    ctx = FakeContext(
+        signature_queue=queue,
+        signature_seen=SignatureDedupe(),
+        open_position_tracker=tracker,
+        helius_client=helius,
+    )
+    registry = MetricsRegistry()
+    registry.add_collector(BotMetrics(ctx))
+    return registry.render()
+
+
+def test_metrics_render_with_rpc_batching_disabled():
+    text = render(SimpleNamespace(batcher=None, asset_cache=AssetCache()))
+    assert "sniper_queue_depth" in text
+    assert "sniper_open_positions 1" in text
+    assert 'sniper_cache_entries{cache="asset"} 0' in text
+    assert "sniper_rpc_batches_total" not in text
+
+
+def test_metrics_render_batcher_stats():
+    batcher = SimpleNamespace(get_stats=lambda: {"batches_sent": 3, "calls_sent": 7})
+    text = render(SimpleNamespace(batcher=batcher, asset_cache=AssetCache()))
+    assert "sniper_rpc_batches_total 3" in text
+    assert "sniper_rpc_batched_calls_total 7" in text
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils
+
+from config.dex_detection_rules import KNOWN_BASES
+from services.decimals_index import DecimalsIndex
+
+
+class FakeContext:
+    def __init__(self, **services):
+        self.services = {"logger": logging.getLogger("test_decimals_index"), **services}
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+class FakeDecimalsDAO:
+    def __init__(self, stored=None, fail=0, delay=0.0):
+        self.stored = stored or {}
+        self.fail = fail
+        self.delay = delay
+        self.loads = 0
+        self.inserted = {}
+        self.insert_done = threading.Event()
+
+    def get_recent_decimals(self, limit):
+        self.loads += 1
+        time.sleep(self.delay)
+        if self.loads <= self.fail:
+            raise ConnectionError("db down")
+        return dict(list(self.stored.items())[:limit])
+
+    def insert_decimals(self, mint, decimals):
+        self.inserted[mint] = decimals
+        self.insert_done.set()
+
+
+def tx(*balances) -> dict:
+    return {"meta": {"postTokenBalances": [
+        {"mint": mint, "uiTokenAmount": {"decimals": decimals}} for mint, decimals in balances
+    ]}}
+
+
+def test_learned_mints_are_bounded_lru():
+    index = DecimalsIndex(FakeContext(decimals_dao=FakeDecimalsDAO()))
+    index.MAX_ENTRIES = 3
+    for i in range(3):
+        index.learn(f"mint{i}", 6)
+    assert index.get("mint0") == 6  # refreshed, so mint1 is now the oldest
+    index.learn("mint3", 9)
+    assert len(index.decimals) == 3
+    assert index.get("mint1") is None
+    assert index.get("mint0") == 6 and index.get("mint3") == 9
+
+
+def test_only_kept_mints_are_persisted():
+    dao = FakeDecimalsDAO()
+    index = DecimalsIndex(FakeContext(decimals_dao=dao))
+    index.learn_from_transaction(tx(("rejected", 6), ("passed", 9)))
+    index.keep("passed")
+    index.keep("never-seen")
+    assert dao.insert_done.wait(2)
+    time.sleep(0.05)
+    assert dao.inserted == {"passed": 9}
+
+
+def test_known_bases_need_no_lookup():
+    dao = FakeDecimalsDAO(fail=1)
+    index = DecimalsIndex(FakeContext(decimals_dao=dao))
+    mint, info = next(iter(KNOWN_BASES.items()))
+    index.learn(mint, 0)
+    assert index.get(mint) == info["decimals"]
+    assert dao.loads == 0
+
+
+def test_failed_load_is_retried():
+    dao = FakeDecimalsDAO(stored={"stored": 6}, fail=1)
+    index = DecimalsIndex(FakeContext(decimals_dao=dao))
+    index.LOAD_RETRY = 0.05
+    assert index.get("stored") is None and not index.loaded
+    assert index.get("stored") is None and dao.loads == 1  # backing off
+    time.sleep(0.06)
+    assert index.get("stored") == 6 and index.loaded and dao.loads == 2
+
+
+def test_lookups_wait_for_a_running_load():
+    dao = FakeDecimalsDAO(stored={"stored": 6}, delay=0.2)
+    index = DecimalsIndex(FakeContext(decimals_dao=dao))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(index.get("stored"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+    assert results == [6] * 5
+    assert dao.loads == 1
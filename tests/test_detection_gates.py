@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils
+
+from core.transaction_manager import TransactionManager
+
+
+class FakeContext:
+    def __init__(self, **services):
+        self.services = services
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+class FakeAsyncHelius:
+    def __init__(self, checks):
+        self.checks = checks
+
+    async def get_token_age(self, token_mint):
+        await asyncio.sleep(self.checks.age_delay)
+        return self.checks.age
+
+
+class FakeChecks:
+    """solana_manager / scam_checker stand-in with scripted delays and results."""
+
+    def __init__(self, age=(0.0, 5), liquidity=(0.0, True), scam_seconds=0.0):
+        self.age_delay, self.age = age
+        self.liquidity_delay, self.liquidity = liquidity
+        self.scam_seconds = scam_seconds
+        self.scam_started = False
+        self.scam_cancelled = False
+
+    # sync pipeline
+    def get_token_age(self, token_mint, tx_data):
+        time.sleep(self.age_delay)
+        return self.age
+
+    def analyze_liquidty(self, tx_data, token_mint, min_liq):
+        time.sleep(self.liquidity_delay)
+        return self.liquidity
+
+    def first_phase_tests(self, token_mint, cancel=None):
+        self.scam_started = True
+        return self._blocking_scam_calls(cancel)
+
+    def _blocking_scam_calls(self, cancel):
+        self.scam_cancelled = cancel.wait(self.scam_seconds)
+        return not self.scam_cancelled
+
+    # async pipeline
+    def token_age_from_transaction(self, tx_data, token_mint):
+        return None
+
+    async def first_phase_tests_async(self, token_mint, cancel=None):
+        self.scam_started = True
+        # like RugCheck: a thread keeps running when its task is cancelled, only `cancel` stops it
+        return await asyncio.to_thread(self._blocking_scam_calls, cancel)
+
+
+def run_gates(checks: FakeChecks, use_async: bool) -> dict:
+    tm = object.__new__(TransactionManager)
+    tm.ctx = FakeContext(
+        solana_manager=checks, scam_checker=checks, async_helius_client=FakeAsyncHelius(checks), pending_data={},
+    )
+    tm.logger = logging.getLogger("test_detection_gates")
+    tm.min_liq, tm.max_age = 1000, 60
+    if use_async:
+        verdicts, _ = asyncio.run(tm._run_gates_async({}, "mint"))
+    else:
+        verdicts, _ = tm._run_gates({}, "mint")
+    return verdicts
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def use_async(request):
+    return request.param
+
+
+def test_all_gates_pass(use_async):
+    checks = FakeChecks()
+    assert run_gates(checks, use_async) == {"age": True, "liquidity": True, "scam": True}
+
+
+def test_scam_check_not_started_before_age_passes(use_async):
+    checks = FakeChecks(age=(0.2, 5), liquidity=(0.0, False))
+    assert run_gates(checks, use_async) == {"liquidity": False}
+    assert not checks.scam_started
+
+
+def test_scam_check_not_started_when_age_fails(use_async):
+    checks = FakeChecks(age=(0.0, 600), liquidity=(0.2, True))
+    assert run_gates(checks, use_async) == {"age": False}
+    assert not checks.scam_started
+
+
+def test_scam_check_cancelled_when_liquidity_fails(use_async):
+    checks = FakeChecks(liquidity=(0.2, False), scam_seconds=2)
+    started = time.monotonic()
+    assert run_gates(checks, use_async)["liquidity"] is False
+    time.sleep(0.1)
+    assert checks.scam_started and checks.scam_cancelled
+    assert time.monotonic() - started < 1
+
+
+def test_check_executor_built_once_at_its_configured_size():
+    from helpers import framework_utils
+
+    executor = framework_utils.start_check_executor(4)
+    assert framework_utils.check_executor is executor
+    assert executor.workers == executor._max_workers >= framework_utils.CHECKS_PER_WORKER * 2
+    assert framework_utils.start_check_executor(8) is executor  # never rebuilt or resized
+    assert framework_utils.run_check(lambda: 42).result(1) == 42
@@ -0,0 +1,267 @@
+import random
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from services.exit_plan import ExitPlan, ExitPlanBook, settings_key
+
+
+class LegacyExitChecks:
+    """Oracle: the tracker's exit rules before ExitPlan (check_emergency_sl, check_take_profit,
+    check_trailing_stop, check_timeout), run in the EXIT_RULES order, with `now` passed in."""
+
+    def __init__(self, settings: dict):
+        self.settings = settings
+        self.peak_price_dict = {}
+
+    def _seconds_since(self, trade, now):
+        buy_time = trade.get("timestamp")
+        if not isinstance(buy_time, datetime):
+            return None
+        if buy_time.tzinfo is None:
+            buy_time = buy_time.replace(tzinfo=timezone.utc)
+        return now - buy_time.timestamp()
+
+    def check_take_profit(self, token_mint, buy_usd, curr_usd, trade, now):
+        tp = self.settings.get("TP", 2.0)
+        return "TP" if curr_usd >= buy_usd * tp else None
+
+    def check_trailing_stop(self, token_mint, buy_usd, curr_usd, trade, now):
+        sl = self.settings.get("TRAILING_STOP", 0.2)
+        min_trigger = self.settings.get("MIN_TSL_TRIGGER_MULTIPLIER", 1.15)
+        peak = self.peak_price_dict.get(token_mint, buy_usd)
+        if curr_usd > peak:
+            self.peak_price_dict[token_mint] = curr_usd
+        if peak >= buy_usd * min_trigger and curr_usd <= peak * (1 - sl):
+            return "TSL"
+        return None
+
+    def check_emergency_sl(self, token_mint, buy_usd, curr_usd, trade, now):
+        sl_pct = self.settings.get("SL", 0.1)
+        early_pct = self.settings.get("EARLY_SL_PCT", 0.10)
+        early_seconds = self.settings.get("EARLY_SL_SECONDS", 30)
+        peak = self.peak_price_dict.get(token_mint, buy_usd)
+        if peak >= buy_usd * self.settings.get("MIN_TSL_TRIGGER_MULTIPLIER", 1.3):
+            return None
+        seconds_since = self._seconds_since(trade, now)
+        price_ratio = curr_usd / buy_usd
+        if seconds_since is not None and seconds_since >= early_seconds and price_ratio <= (1.0 - early_pct):
+            return "EARLY_STOP"
+        if price_ratio <= (1.0 - sl_pct):
+            return "SL"
+        return None
+
+    def check_timeout(self, token_mint, buy_usd, curr_usd, trade, now):
+        timeout = self.settings.get("TIMEOUT_SECONDS", 300)
+        threshold = self.settings.get("TIMEOUT_PROFIT_THRESHOLD", 1.2)
+        pnl_floor = self.settings.get("TIMEOUT_PNL_FLOOR", -0.03)
+        seconds_since = self._seconds_since(trade, now) or 0
+        pnl_frac = curr_usd / buy_usd - 1.0
+        if seconds_since > timeout and curr_usd < buy_usd * threshold and pnl_frac >= pnl_floor:
+            return "TIMEOUT"
+        return None
+
+    def evaluate(self, token_mint, trade, curr_usd, now):
+        buy_usd = float(trade["entry_usd"])
+        if not buy_usd:
+            return None  # the old loop failed on the PnL division and skipped the position
+        exit_rules = self.settings.get("EXIT_RULES", {})
+        for rule, check in (
+            ("USE_SL", self.check_emergency_sl),
+            ("USE_TP", self.check_take_profit),
+            ("USE_TSL", self.check_trailing_stop),
+            ("USE_TIMEOUT", self.check_timeout),
+        ):
+            if exit_rules.get(rule, False):
+                trigger = check(token_mint, buy_usd, curr_usd, trade, now)
+                if trigger:
+                    return trigger
+        return None
+
+
+def random_settings(rng: random.Random) -> dict:
+    settings = {
+        "TP": rng.choice([1.5, 2.0, 3.0]),
+        "SL": rng.choice([0.05, 0.1, 0.3]),
+        "EARLY_SL_PCT": rng.choice([0.05, 0.1]),
+        "EARLY_SL_SECONDS": rng.choice([10, 30]),
+        "TRAILING_STOP": rng.choice([0.1, 0.2]),
+        "TIMEOUT_SECONDS": rng.choice([60, 300]),
+        "TIMEOUT_PNL_FLOOR": -0.03,
+        "TIMEOUT_PROFIT_THRESHOLD": 1.2,
+        "EXIT_RULES": {rule: rng.random() < 0.7 for rule in ("USE_SL", "USE_TP", "USE_TSL", "USE_TIMEOUT")},
+    }
+    if rng.random() < 0.5:  # unset, the SL and TSL rules fall back to different defaults (1.3 / 1.15)
+        settings["MIN_TSL_TRIGGER_MULTIPLIER"] = rng.choice([1.1, 1.3, 1.5])
+    return settings
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_book_matches_legacy_checks(seed):
+    rng = random.Random(seed)
+    for _ in range(15):
+        settings = random_settings(rng)
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        trades = {}
+        for i in range(rng.randint(1, 20)):
+            trade = {"id": i, "entry_usd": rng.choice([0.0, rng.uniform(0.001, 5)])}
+            if rng.random() < 0.9:
+                trade["timestamp"] = (start - timedelta(seconds=rng.uniform(0, 30))).replace(tzinfo=None)
+            trades[f"mint{i}"] = trade
+
+        legacy = LegacyExitChecks(settings)
+        book = ExitPlanBook(capacity=2)
+        for mint, trade in trades.items():
+            book.add(mint, ExitPlan.from_trade(trade, settings))
+
+        now = start.timestamp()
+        for _ in range(60):
+            now += rng.uniform(0, 15)
+            prices = {
+                mint: (trade["entry_usd"] or 1.0) * rng.uniform(0.5, 3.5)
+                for mint, trade in trades.items() if rng.random() < 0.7
+            }
+            fired = book.evaluate(prices, now)
+            for mint, price in prices.items():
+                assert fired.get(mint) == legacy.evaluate(mint, trades[mint], price, now), (mint, price, now)
+            for mint in fired:  # an exit closes the position
+                del trades[mint]
+                book.remove(mint)
+
+
+ALL_RULES = {"USE_SL": True, "USE_TP": True, "USE_TSL": True, "USE_TIMEOUT": True}
+
+
+def make_settings(**overrides) -> dict:
+    settings = {
+        "TP": 2.0, "SL": 0.1, "EARLY_SL_PCT": 0.1, "EARLY_SL_SECONDS": 30, "TRAILING_STOP": 0.2,
+        "TIMEOUT_SECONDS": 300, "TIMEOUT_PNL_FLOOR": -0.03, "TIMEOUT_PROFIT_THRESHOLD": 1.2,
+        "EXIT_RULES": dict(ALL_RULES),
+    }
+    settings.update(overrides)
+    return settings
+
+
+def make_book(settings: dict, peak: float = None, entry: float = 1.0, mint: str = "mint") -> ExitPlanBook:
+    book = ExitPlanBook()
+    book.add(mint, ExitPlan(1, entry, 0.0, settings, peak))
+    return book
+
+
+@pytest.mark.parametrize("overrides, peak, price, now, expected, runner_up", [
+    ({}, None, 0.85, 100, "EARLY_STOP", "SL"),                          # past EARLY_SL_SECONDS, below both stops
+    ({"TP": 0.5}, None, 0.85, 10, "SL", "TP"),
+    ({}, 5.0, 2.5, 10, "TP", "TSL"),                                    # pumped: SL off, 2.5 under the 4.0 trail
+    ({"TRAILING_STOP": 0.1}, 1.2, 1.0, 400, "TSL", "TIMEOUT"),
+])
+def test_rule_precedence(overrides, peak, price, now, expected, runner_up):
+    settings = make_settings(**overrides)
+    assert make_book(settings, peak).evaluate({"mint": price}, now) == {"mint": expected}
+
+    rule = {"EARLY_STOP": "USE_SL", "SL": "USE_SL", "TP": "USE_TP", "TSL": "USE_TSL"}[expected]
+    if expected == "EARLY_STOP":  # same rule: without the early window the plain SL fires
+        settings["EARLY_SL_SECONDS"] = 10_000
+    else:
+        settings["EXIT_RULES"][rule] = False
+    assert make_book(settings, peak).evaluate({"mint": price}, now) == {"mint": runner_up}
+
+
+@pytest.mark.parametrize("overrides, price, trigger", [
+    ({}, 2.5, "TP"),
+    ({"SL": -1.0}, 1.5, "SL"),  # stop above entry, so a new peak can fall under it
+])
+def test_peak_kept_when_sl_or_tp_fires(overrides, price, trigger):
+    book = make_book(make_settings(**overrides))
+    assert book.evaluate({"mint": price}, 10) == {"mint": trigger}
+    assert book.peak("mint") == 1.0
+
+
+def test_peak_moves_and_trails():
+    book = make_book(make_settings())
+    assert book.evaluate({"mint": 1.5}, 10) == {}
+    assert book.peak("mint") == 1.5
+    assert book.evaluate({"mint": 1.25}, 11) == {}    # above 1.5 * 0.8
+    assert book.peak("mint") == 1.5
+    assert book.evaluate({"mint": 1.2}, 12) == {"mint": "TSL"}
+
+
+def test_peak_kept_without_tsl():
+    book = make_book(make_settings(EXIT_RULES={**ALL_RULES, "USE_TSL": False}))
+    assert book.evaluate({"mint": 1.5}, 10) == {}
+    assert book.peak("mint") == 1.0
+
+
+def test_timeout_fires_on_new_peak_tick():
+    book = make_book(make_settings())
+    assert book.evaluate({"mint": 1.1}, 400) == {"mint": "TIMEOUT"}
+    assert book.peak("mint") == 1.1  # TIMEOUT comes after TSL, which already saw the new peak
+
+
+def test_remove_middle_row():
+    settings = make_settings()
+    book = ExitPlanBook()
+    for i, (mint, entry) in enumerate([("a", 1.0), ("b", 2.0), ("c", 4.0)]):
+        book.add(mint, ExitPlan(i, entry, 0.0, settings))
+    book.evaluate({"c": 5.0}, 10)  # c: peak 5.0, trailing stop 4.0
+
+    book.remove("b")
+    assert len(book) == 2 and "b" not in book and list(book) == ["a", "c"]
+    assert book.trade_id("c") == 2 and book.entry("c") == 4.0 and book.peak("c") == 5.0
+    assert book.evaluate({"a": 1.0, "b": 0.1, "c": 4.0}, 10) == {"c": "TSL"}
+    assert book.evaluate({"a": 2.0}, 10) == {"a": "TP"}
+
+    book.remove("b")  # unknown mint: no-op
+    book.remove("c")  # last row
+    assert list(book) == ["a"] and book.entry("a") == 1.0
+
+
+def test_growth_past_capacity():
+    settings = make_settings()
+    book = ExitPlanBook(capacity=2)
+    entries = {f"mint{i}": 1.0 + i for i in range(9)}
+    for i, (mint, entry) in enumerate(entries.items()):
+        book.add(mint, ExitPlan(i, entry, 0.0, settings))
+
+    assert len(book) == 9
+    assert all(len(column) >= 9 for column in book.columns.values())
+    assert [book.entry(m) for m in entries] == list(entries.values())
+    assert [book.trade_id(m) for m in entries] == list(range(9))
+    assert book.evaluate({m: e * 2 for m, e in entries.items()}, 10) == {m: "TP" for m in entries}
+
+
+class FakeContext:
+    def __init__(self, settings: dict):
+        import logging
+        self.settings = settings
+        self.services = {"logger": logging.getLogger("test_exit_plan")}
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+def test_sync_plans_recompiles_on_settings_change_keeping_peaks():
+    pytest.importorskip("pandas")
+    pytest.importorskip("psycopg2")
+    from services.open_positions import OpenPositionTracker
+
+    settings = make_settings(TRADE_SYNC={"LISTEN": False, "RESYNC_INTERVAL": 300})
+    tracker = OpenPositionTracker(FakeContext(settings))
+    tracker.active_trades = {
+        "a": {"id": 1, "entry_usd": 1.0, "timestamp": datetime(2026, 1, 1)},
+        "b": {"id": 2, "entry_usd": 1.0, "timestamp": datetime(2026, 1, 1)},
+    }
+    tracker._sync_plans()
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp() + 10
+    assert tracker.plans.evaluate({"a": 1.5, "b": 1.2}, now) == {}
+
+    settings["TP"] = 1.4
+    tracker.active_trades["b"] = {"id": 3, "entry_usd": 1.0, "timestamp": datetime(2026, 1, 1)}  # new trade
+    tracker._sync_plans()
+    assert tracker.plan_key == settings_key(settings)
+    assert tracker.plans.peak("a") == 1.5
+    assert tracker.plans.peak("b") == 1.0 and tracker.plans.trade_id("b") == 3
+    assert tracker.plans.evaluate({"a": 1.45, "b": 1.3}, now) == {"a": "TP"}
+
+    del tracker.active_trades["b"]
+    tracker._sync_plans()
+    assert list(tracker.plans) == ["a"]
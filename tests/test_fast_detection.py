@@ -0,0 +1,64 @@
+import asyncio
+import logging
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils
+
+from core.transaction_manager import TransactionManager
+
+
+class FakeContext:
+    def __init__(self, **services):
+        self.services = services
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+class LaggingRpc:
+    """getTransaction that returns null for the first `misses` calls, like a tx notified at processed."""
+
+    def __init__(self, misses: int):
+        self.misses = misses
+        self.calls = 0
+
+    def _get(self, signature):
+        self.calls += 1
+        return {"signature": signature} if self.calls > self.misses else None
+
+    def get_transaction_data(self, signature):  # solana_manager
+        return self._get(signature)
+
+    async def get_transaction(self, signature):  # async_helius_client
+        return self._get(signature)
+
+
+def fetch(rpc: LaggingRpc, retries: int, use_async: bool):
+    tm = object.__new__(TransactionManager)
+    tm.ctx = FakeContext(solana_manager=rpc, async_helius_client=rpc)
+    tm.logger = logging.getLogger("test_fast_detection")
+    tm.tx_fetch_retries, tm.tx_fetch_delay = retries, 0.01
+    if use_async:
+        return asyncio.run(tm._fetch_transaction_async("sig"))
+    return tm._fetch_transaction("sig")
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_null_transaction_is_retried(use_async):
+    rpc = LaggingRpc(misses=2)
+    assert fetch(rpc, retries=3, use_async=use_async) == {"signature": "sig"}
+    assert rpc.calls == 3
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_retries_are_bounded(use_async):
+    rpc = LaggingRpc(misses=10)
+    assert fetch(rpc, retries=3, use_async=use_async) is None
+    assert rpc.calls == 4
+
+
+def test_no_retries_without_fast_detection():
+    rpc = LaggingRpc(misses=1)
+    assert fetch(rpc, retries=0, use_async=False) is None
+    assert rpc.calls == 1
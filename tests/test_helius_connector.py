@@ -0,0 +1,109 @@
+import copy
+import json
+import logging
+
+import pytest
+
+pytest.importorskip("pandas")     # helpers.framework_utils
+pytest.importorskip("websocket")  # websocket-client
+
+from config.settings import DEFAULT_SETTINGS
+from connectors.helius_connector import HeliusConnector
+from helpers.mint_work_queue import MintWorkQueue
+from helpers.signature_dedupe import SignatureDedupe
+
+
+class FakeContext:
+    def __init__(self, settings: dict, dex: str = "Pumpfun"):
+        self.settings = settings
+        self.api_keys = {"helius": "KEY", "dex": dex}
+        self.services = {
+            "logger": logging.getLogger("test_helius_connector"),
+            "signature_queue": MintWorkQueue(),
+            "signature_seen": SignatureDedupe(),
+        }
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+class FakeWs:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, text):
+        self.sent.append(json.loads(text))
+
+
+def connector(connections: int, endpoints: list, dex: str = "Pumpfun") -> HeliusConnector:
+    settings = copy.deepcopy(DEFAULT_SETTINGS)
+    settings["WEBSOCKET"].update(CONNECTIONS=connections, ENDPOINTS=endpoints, BACKFILL_LIMIT=0)
+    return HeliusConnector(FakeContext(settings, dex), stop_ws=None)
+
+
+def notification(subscription: int, signature: str, *logs: str) -> str:
+    return json.dumps({"jsonrpc": "2.0", "method": "logsNotification", "params": {
+        "subscription": subscription,
+        "result": {"context": {"slot": 1}, "value": {"signature": signature, "err": None, "logs": list(logs)}},
+    }})
+
+
+def subscribe(conn: HeliusConnector, link, first_subscription: int) -> None:
+    ws = FakeWs()
+    conn.on_open(link, ws)
+    for i, payload in enumerate(ws.sent):
+        conn.on_message(link, ws, json.dumps({"jsonrpc": "2.0", "id": payload["id"], "result": first_subscription + i}))
+
+
+def queued(conn: HeliusConnector) -> list[tuple[str, str]]:
+    items = []
+    while conn.queue.qsize():
+        sig, _, _, _, dex = conn.queue.get_nowait()
+        items.append((sig, dex))
+    return items
+
+
+def test_default_is_one_link():
+    assert DEFAULT_SETTINGS["WEBSOCKET"]["CONNECTIONS"] == 1
+    assert len(connector(1, []).links) == 1
+
+
+def test_links_round_robin_over_endpoints(caplog):
+    with caplog.at_level(logging.WARNING):
+        conn = connector(2, ["wss://a.example/?k=", "wss://b.example/?k="])
+    assert [link.url for link in conn.links] == ["wss://a.example/?k=KEY", "wss://b.example/?k=KEY"]
+    assert "share" not in caplog.text
+
+
+def test_warns_when_links_share_an_endpoint(caplog):
+    with caplog.at_level(logging.WARNING):
+        connector(2, [])
+    assert "2 connections share 1 endpoint(s)" in caplog.text
+
+
+def test_each_dex_is_subscribed_and_its_notifications_tagged():
+    conn = connector(1, [], dex="Pumpfun,Raydium")
+    link = conn.links[0]
+    subscribe(conn, link, 10)
+    assert link.subscriptions == {10: "Pumpfun", 11: "Raydium"}
+
+    conn.on_message(link, None, notification(10, "pump", "Program log: Instruction: InitializeMint2"))
+    conn.on_message(link, None, notification(11, "ray", "Program log: Instruction: MintTo"))
+    conn.on_message(link, None, notification(10, "wrong-dex", "Program log: Instruction: MintTo"))
+    conn.on_message(link, None, notification(11, "no-rule", "Program log: Instruction: Transfer"))
+
+    assert queued(conn) == [("pump", "Pumpfun"), ("ray", "Raydium")]
+    assert conn.detected == {"Pumpfun": 1, "Raydium": 1}
+
+
+def test_a_signature_delivered_by_two_links_is_queued_once():
+    conn = connector(2, ["wss://a.example/?k=", "wss://b.example/?k="])
+    first, second = conn.links
+    subscribe(conn, first, 10)
+    subscribe(conn, second, 20)
+
+    conn.on_message(first, None, notification(10, "sig", "Program log: Instruction: InitializeMint2"))
+    conn.on_message(second, None, notification(20, "sig", "Program log: Instruction: InitializeMint2"))
+
+    assert queued(conn) == [("sig", "Pumpfun")]
+    assert (first.first, second.late) == (1, 1)
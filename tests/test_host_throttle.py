@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from helpers.host_throttle import HostThrottle
+
+
+@pytest.fixture(autouse=True)
+def fresh_hosts(monkeypatch):
+    monkeypatch.setattr(HostThrottle, "_hosts", {})
+
+
+def test_hosts_are_throttled_independently():
+    rpc = HostThrottle.for_url("https://mainnet.helius-rpc.com/?api-key=x")
+    assert HostThrottle.for_url("https://mainnet.helius-rpc.com/v0/addresses") is rpc
+    jupiter = HostThrottle.for_url("https://lite-api.jup.ag/price/v3")
+
+    rpc.acquire()
+    assert rpc.release(429, retry_after="2") >= 2
+    stats = HostThrottle.get_all_stats()
+    assert stats["mainnet.helius-rpc.com"]["cooldown"] > 1
+    assert stats["lite-api.jup.ag"]["cooldown"] == 0
+
+    started = time.monotonic()
+    jupiter.acquire()  # not held up by the other host's cooldown
+    assert time.monotonic() - started < 0.1
+
+
+def test_429_halves_the_window_and_success_grows_it_additively():
+    throttle = HostThrottle("host")
+    throttle.limit = 16.0
+    throttle.release(429, retry_after="0")
+    throttle.release(429, retry_after="0")
+    assert throttle.limit == 4.0 and throttle.consecutive_429 == 2
+
+    for _ in range(4):
+        throttle.release(200)
+    assert 4.9 < throttle.limit < 5.0  # about +1 per window of successes
+    assert throttle.consecutive_429 == 0
+
+    throttle.release(500)  # server errors leave the window alone
+    assert 4.9 < throttle.limit < 5.0
+
+
+def test_window_stays_within_bounds():
+    throttle = HostThrottle("host")
+    for _ in range(10):
+        throttle.release(429, retry_after="0")
+    assert throttle.limit == 1.0
+    throttle.limit = float(HostThrottle.max_concurrency)
+    throttle.release(200)
+    assert throttle.limit == HostThrottle.max_concurrency
+
+
+def test_backoff_follows_retry_after_or_doubles(monkeypatch):
+    monkeypatch.setattr(HostThrottle, "max_backoff", 10)
+    throttle = HostThrottle("host")
+    assert 3 <= throttle.release(429, retry_after="3") <= 3 * 1.25
+    assert 10 <= throttle.release(429, retry_after="600") <= 10 * 1.25  # capped at max_backoff
+
+    throttle = HostThrottle("other")
+    first = throttle.release(429)
+    second = throttle.release(429)
+    assert 1 <= first <= 1.25 and 2 <= second <= 2.5
+
+
+def test_acquire_waits_for_a_free_slot():
+    throttle = HostThrottle("host")
+    throttle.limit = 1.0
+    throttle.acquire()
+    released = threading.Timer(0.05, throttle.release, args=(200,))
+    released.start()
+    started = time.monotonic()
+    throttle.acquire()
+    assert 0.04 <= time.monotonic() - started < 0.4  # woken by release(), not the 0.5s poll
+    assert throttle.in_flight == 1
+
+
+def test_acquire_async_waits_out_the_cooldown():
+    throttle = HostThrottle("host")
+    throttle.backoff_until = time.time() + 0.1
+    started = time.monotonic()
+    asyncio.run(throttle.acquire_async())
+    assert time.monotonic() - started >= 0.09
+    assert throttle.in_flight == 1
@@ -0,0 +1,47 @@
+import logging
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils
+pytest.importorskip("solders")
+
+from clients.jupiter_client import JupiterClient
+from config.third_parties import JUPITER_STATION
+from helpers.rate_limiter import RateLimiter
+
+
+class FakeContext:
+    def __init__(self, **services):
+        self.services = services
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+class FakePriceApi:
+    def __init__(self, unpriced=()):
+        self.unpriced = set(unpriced)
+        self.requests = []
+
+    def get(self, endpoint):
+        ids = parse_qs(urlsplit(endpoint).query)["ids"][0].split(",")
+        self.requests.append(ids)
+        return {mint: {"usdPrice": str(i + 1.0)} for i, mint in enumerate(ids) if mint not in self.unpriced}
+
+
+def test_open_positions_are_priced_in_chunks_of_price_max_ids():
+    api = FakePriceApi(unpriced={"mint7"})
+    limiter = RateLimiter(min_interval=0, jitter_range=None)
+    client = JupiterClient(FakeContext(
+        logger=logging.getLogger("test_jupiter_client"), jupiter_requests=api, jupiter_rl=limiter,
+    ))
+    size = JUPITER_STATION["PRICE_MAX_IDS"]
+    mints = [f"mint{i}" for i in range(size + 3)] + ["mint0"]
+
+    prices = client.get_token_prices(mints)
+
+    assert [len(ids) for ids in api.requests] == [size, 3]
+    assert set(prices) == set(mints)
+    assert prices["mint7"] is None and prices["mint0"] == 1.0
+    assert client.get_token_prices([]) == {} and len(api.requests) == 2
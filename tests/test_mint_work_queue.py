@@ -0,0 +1,72 @@
+from queue import Empty, Full
+
+import pytest
+
+from helpers.mint_work_queue import MintWorkQueue
+
+
+def item(sig: str, token_mint: str | None, source: str = "WS") -> tuple:
+    return (sig, None, token_mint, source, "pumpfun")
+
+
+def drain(queue: MintWorkQueue) -> list[str]:
+    sigs = []
+    while True:
+        try:
+            sigs.append(queue.get_nowait()[0])
+        except Empty:
+            return sigs
+
+
+def test_cancel_drops_only_that_mints_queued_work():
+    queue = MintWorkQueue()
+    for sig, mint in (("a1", "A"), ("b1", "B"), ("a2", "A"), ("u1", None)):
+        queue.put(item(sig, mint))
+    queue.cancel("A")
+
+    assert drain(queue) == ["b1", "u1"]
+    assert queue.cancelled == 2
+    assert queue.generations.entries == {}  # no per-mint state left once the queue is drained
+
+
+def test_work_queued_after_cancel_is_served():
+    queue = MintWorkQueue()
+    queue.put(item("a1", "A"))
+    queue.cancel("A")
+    queue.put(item("a2", "A"))
+    assert drain(queue) == ["a2"]
+
+
+def test_cancel_of_mint_without_work_is_a_no_op():
+    queue = MintWorkQueue()
+    queue.cancel("A")
+    queue.put(item("a1", "A"))
+    assert drain(queue) == ["a1"]
+
+
+def test_shards_share_cancellations():
+    main = MintWorkQueue()
+    shard = MintWorkQueue(generations=main.generations)
+    main.put(item("a1", "A"))
+    shard.put(item("a2", "A"))
+    shard.put(item("b1", "B"))
+    main.cancel("A")
+    assert drain(main) == [] and drain(shard) == ["b1"]
+
+
+def test_prefetch_lane_served_first():
+    queue = MintWorkQueue()
+    queue.put(item("live", "A"))
+    queue.put(item("prefetch", "B", "PREFETCH"), lane="PREFETCH")
+    assert queue.lane_sizes() == {"PREFETCH": 1, "LIVE": 1}
+    assert drain(queue) == ["prefetch", "live"]
+
+
+def test_maxsize_bounds_put():
+    queue = MintWorkQueue(maxsize=1)
+    queue.put(item("a1", "A"))
+    with pytest.raises(Full):
+        queue.put(item("a2", "A"), block=False)
+    with pytest.raises(Full):
+        queue.put(item("a2", "A"), timeout=0.01)
+    assert queue.qsize() == 1
@@ -0,0 +1,131 @@
+import json
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils
+pytest.importorskip("websocket")
+
+from config.settings import DEFAULT_SETTINGS
+from connectors.pool_price_feed import PoolPriceFeed
+
+SOL = "So11111111111111111111111111111111111111112"
+
+
+class FakeContext:
+    def __init__(self, settings, **services):
+        self.settings = settings
+        self.services = services
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+class FakeWs:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, text):
+        self.sent.append(json.loads(text))
+
+
+class FakeTracker:
+    def __init__(self):
+        self.ticks = []
+
+    def on_price_tick(self, mint, price):
+        self.ticks.append((mint, price))
+
+
+def vault(pub_key, mint, amount, decimals):
+    return {"pub_key": pub_key, "mint": mint, "amount": amount, "decimals": decimals}
+
+
+@pytest.fixture
+def feed():
+    analyzer = SimpleNamespace(
+        token_pools={"MINT": {"pool": "POOL"}},
+        # SOL per token from the reserves, times the SOL price
+        calculate_on_chain_price=lambda reserve_token, token_decimals, reserve_base, base_decimals, base_symbol, sol_price:
+            reserve_base / 10 ** base_decimals / (reserve_token / 10 ** token_decimals) * sol_price,
+    )
+    helius = SimpleNamespace(get_token_accounts_by_owner=lambda pool: [
+        vault("TOKEN_VAULT", "MINT", 1_000_000, 6), vault("SOL_VAULT", SOL, 2_000_000_000, 9),
+    ])
+    ctx = FakeContext(
+        DEFAULT_SETTINGS,
+        logger=logging.getLogger("test_pool_price_feed"),
+        liquidity_analyzer=analyzer,
+        helius_client=helius,
+        open_position_tracker=FakeTracker(),
+        jupiter_client=SimpleNamespace(get_sol_price=lambda: 100.0),
+    )
+    feed = PoolPriceFeed(ctx, threading.Event())
+    feed.ws = FakeWs()
+    feed._refresh_sol_price()
+    return feed
+
+
+def ack_all(feed):
+    for i, payload in enumerate(feed.ws.sent):
+        if payload["method"] == "accountSubscribe":
+            feed.on_message(feed.ws, json.dumps({"jsonrpc": "2.0", "id": payload["id"], "result": 100 + i}))
+
+
+def notify(feed, subscription, amount, slot=5):
+    feed.on_message(feed.ws, json.dumps({
+        "jsonrpc": "2.0", "method": "accountNotification",
+        "params": {"subscription": subscription, "result": {
+            "context": {"slot": slot},
+            "value": {"data": {"parsed": {"info": {"tokenAmount": {"amount": str(amount)}}}}},
+        }},
+    }))
+
+
+def test_reserve_changes_are_pushed_as_price_ticks(feed):
+    feed.on_open(feed.ws)
+    feed._watch("MINT")
+    assert [p["params"][0] for p in feed.ws.sent] == ["TOKEN_VAULT", "SOL_VAULT"]
+    assert feed.get_price("MINT") is None  # not live before both subscriptions are acked
+
+    ack_all(feed)
+    assert feed.get_price("MINT") == pytest.approx(200.0)  # 2 SOL / 1 token at $100
+    notify(feed, 101, 4_000_000_000)  # the SOL vault doubled
+    assert feed.ctx.get("open_position_tracker").ticks[-1] == ("MINT", pytest.approx(400.0))
+    assert feed.get_stats()["live"] == 1 and feed.ticks == 1
+
+
+def test_pools_are_resubscribed_after_a_reconnect(feed):
+    feed.on_open(feed.ws)
+    feed._watch("MINT")
+    ack_all(feed)
+    feed.on_close(feed.ws, 1006, "gone")
+    assert feed.get_price("MINT") is None and feed.subscriptions == {}
+
+    feed.ws = FakeWs()
+    feed.on_open(feed.ws)
+    assert [p["method"] for p in feed.ws.sent] == ["accountSubscribe", "accountSubscribe"]
+    ack_all(feed)
+    assert feed.get_price("MINT") == pytest.approx(200.0)
+
+
+def test_closed_positions_are_unsubscribed(feed, monkeypatch):
+    monkeypatch.setattr("connectors.pool_price_feed.run_bg", lambda fn, *args, **kwargs: fn(*args))
+    feed.on_open(feed.ws)
+    feed.track(["MINT"])
+    ack_all(feed)
+    feed.track([])
+    assert sorted(p["params"][0] for p in feed.ws.sent if p["method"] == "accountUnsubscribe") == [100, 101]
+    assert feed.pools == {} and feed.subscriptions == {}
+
+
+def test_unknown_pool_stays_on_polling_and_is_retried_later(feed, monkeypatch):
+    monkeypatch.setattr("connectors.pool_price_feed.run_bg", lambda fn, *args, **kwargs: fn(*args))
+    feed.ctx.services["liquidity_dao"] = SimpleNamespace(get_pool_address=lambda mint: None)
+    feed.track(["OTHER"])
+    assert "OTHER" in feed.unresolved and feed.get_price("OTHER") is None
+    resolved = feed.unresolved["OTHER"]
+    feed.track(["OTHER"])  # within UNRESOLVED_RETRY: not looked up again
+    assert feed.unresolved["OTHER"] == resolved
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+
+from helpers.rate_limiter import RateLimiter, current_priority, rate_priority
+
+
+def limiter(**kwargs) -> RateLimiter:
+    kwargs.setdefault("jitter_range", None)
+    return RateLimiter(**kwargs)
+
+
+def test_burst_then_refill_rate():
+    rl = limiter(min_interval=0.1, burst=3)
+    started = time.monotonic()
+    for _ in range(3):
+        rl.wait()
+    assert time.monotonic() - started < 0.05
+    rl.wait()
+    assert time.monotonic() - started >= 0.08
+    assert rl.waiters == []
+    assert rl.get_stats()["last_60s"] == 4
+
+
+def test_weights_charge_tokens():
+    rl = limiter(min_interval=0.1, burst=5, weights={"getProgramAccounts": 5})
+    rl.wait("getProgramAccounts")
+    assert rl.tokens < 1
+    assert rl.cost("getBalance") == 1
+
+
+def test_unlimited_limiter_never_waits():
+    rl = limiter(min_interval=0, max_requests_per_minute=None)
+    started = time.monotonic()
+    for _ in range(1000):
+        rl.wait()
+    assert time.monotonic() - started < 0.5
+    assert rl.total_requests == 1000
+
+
+def test_waiters_served_by_priority_then_arrival():
+    rl = limiter(min_interval=0.3)
+    rl.wait()  # bucket empty for the next 0.3s
+    order = []
+
+    def call(name, priority):
+        rl.wait(priority=priority)
+        order.append(name)
+
+    threads = []
+    for name, priority in (("detect-1", "DETECTION"), ("analytics", "ANALYTICS"),
+                           ("detect-2", "DETECTION"), ("execution", "EXECUTION")):
+        thread = threading.Thread(target=call, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["execution", "detect-1", "detect-2", "analytics"]
+    assert rl.get_stats()["by_priority"]["DETECTION"]["total"] == 3
+
+
+def test_quota_blocked_waiter_does_not_hold_up_other_classes():
+    rl = limiter(min_interval=0, max_requests_per_minute=600, burst=10, quotas={"EXECUTION": 0.001})
+
+    async def scenario():
+        rl.wait(priority="EXECUTION")  # spends the whole EXECUTION quota (6 tokens/min)
+        blocked = asyncio.create_task(rl.wait_async(priority="EXECUTION"))
+        await asyncio.sleep(0.05)
+        assert len(rl.waiters) == 1  # at the heap root, waiting out its quota
+
+        with rate_priority("DETECTION"):
+            await asyncio.wait_for(rl.wait_async(), 1)
+
+        blocked.cancel()
+        try:
+            await blocked
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+    assert rl.waiters == []
+    assert rl.get_stats()["by_priority"]["DETECTION"]["total"] == 1
+
+
+def test_quota_caps_a_class_share_of_the_minute_budget():
+    rl = limiter(min_interval=0, max_requests_per_minute=60, burst=20, quotas={"ANALYTICS": 0.25})
+
+    async def scenario():
+        with rate_priority("ANALYTICS"):
+            for _ in range(15):  # 25% of 60 per minute
+                await rl.wait_async()
+            try:
+                await asyncio.wait_for(rl.wait_async(), 0.1)
+                raise AssertionError("ANALYTICS went over its quota")
+            except asyncio.TimeoutError:
+                pass
+        await asyncio.wait_for(rl.wait_async(), 0.1)  # detection still has tokens
+
+    asyncio.run(scenario())
+    by_priority = rl.get_stats()["by_priority"]
+    assert by_priority["ANALYTICS"]["total"] == 15 and by_priority["DETECTION"]["total"] == 1
+
+
+def test_rate_priority_tags_only_the_block():
+    assert current_priority() == "DETECTION"
+    with rate_priority("EXECUTION"):
+        with rate_priority("ANALYTICS"):
+            assert current_priority() == "ANALYTICS"
+        assert current_priority() == "EXECUTION"
+    assert current_priority() == "DETECTION"
@@ -0,0 +1,79 @@
+import glob
+import json
+
+import pytest
+
+from helpers.pipeline_recorder import PipelineRecorder, read_archive, request_key
+from helpers.replay_server import ReplayServer
+
+RPC_URL = "https://mainnet.helius-rpc.com/?api-key=live-secret"
+PRICE_URL = "https://lite-api.jup.ag/price/v3"
+
+
+def rpc(id_, method, *params):
+    return {"jsonrpc": "2.0", "id": id_, "method": method, "params": list(params)}
+
+
+def test_request_key_ignores_ids_api_keys_and_param_placement():
+    assert request_key("post", RPC_URL, None, rpc(1, "getSlot")) == request_key(
+        "POST", "http://mainnet.helius-rpc.com/?api-key=other", None, rpc(99, "getSlot"))
+    assert request_key("GET", PRICE_URL, {"ids": "A,B"}) == request_key("GET", PRICE_URL + "?ids=A,B")
+    assert request_key("GET", PRICE_URL, {"ids": "A"}) != request_key("GET", PRICE_URL, {"ids": "B"})
+    assert request_key("POST", RPC_URL, None, rpc(1, "getSlot")) != request_key("POST", RPC_URL, None, rpc(1, "getBalance"))
+
+
+@pytest.fixture
+def recording(tmp_path):
+    recorder = PipelineRecorder(str(tmp_path), max_mb=1, network="mainnet")
+    batch = [rpc(7, "getBalance", "A"), rpc(8, "getBalance", "B")]
+    recorder.http("POST", RPC_URL, None, batch, 200,
+                  [{"jsonrpc": "2.0", "id": 8, "result": 2}, {"jsonrpc": "2.0", "id": 7, "result": 1}], 0.002)
+    recorder.http("POST", RPC_URL, None, json.dumps(rpc(9, "getSlot")), 200, {"jsonrpc": "2.0", "id": 9, "result": 100}, 0.001)
+    recorder.http("POST", RPC_URL, None, rpc(10, "getSlot"), 200, {"jsonrpc": "2.0", "id": 10, "result": 101}, 0.001)
+    recorder.http("GET", PRICE_URL, {"ids": "A"}, None, 200, {"A": {"usdPrice": 1.5}}, 0.003)
+    recorder.close()
+    [path] = glob.glob(str(tmp_path / "*.jsonl.gz"))
+    return list(read_archive(path))
+
+
+def test_recording_splits_batches_and_drops_secrets(recording):
+    http = [r for r in recording if r["type"] == "http"]
+    assert recording[0]["type"] == "meta" and len(http) == 5
+    assert all("live-secret" not in r["key"] for r in http)
+
+
+def test_replayed_calls_match_their_recorded_responses(recording):
+    server = ReplayServer(recording, latency=0)
+    url = server.url_for("https://mainnet.helius-rpc.com/?api-key=replay-key")
+    assert url.startswith(server.address + "/mainnet.helius-rpc.com/")
+    replayed = "http://" + url.split("://", 1)[1].split("/", 1)[1]  # what the handler rebuilds
+
+    status, response, _ = server.answer("POST", replayed, [rpc(2, "getBalance", "B"), rpc(1, "getBalance", "A")])
+    assert status == 200
+    assert response == [{"jsonrpc": "2.0", "id": 2, "result": 2}, {"jsonrpc": "2.0", "id": 1, "result": 1}]
+
+    # repeated calls get the recorded responses in order, then the last one repeats
+    assert [server.answer("POST", replayed, rpc(3, "getSlot"))[1]["result"] for _ in range(3)] == [100, 101, 101]
+
+    assert server.answer("GET", "http://lite-api.jup.ag/price/v3?ids=A", None)[1] == {"A": {"usdPrice": 1.5}}
+
+    _, miss, _ = server.answer("POST", replayed, rpc(4, "getBlock", 1))
+    assert miss["id"] == 4 and miss["error"]["code"] == ReplayServer.MISS_CODE
+    assert server.answer("GET", "http://lite-api.jup.ag/price/v3?ids=Z", None)[0] == 404
+
+    stats = server.get_stats()
+    assert stats["hits"] == 6 and stats["misses"] == 2
+    server.httpd.server_close()
+
+
+def test_replay_server_answers_over_http(recording):
+    requests = pytest.importorskip("requests")
+    server = ReplayServer(recording, latency=0)
+    server.start()
+    try:
+        url = server.url_for("https://mainnet.helius-rpc.com/?api-key=replay-key")
+        assert requests.post(url, json=rpc(5, "getSlot"), timeout=5).json() == {"jsonrpc": "2.0", "id": 5, "result": 100}
+        price = requests.get(server.url_for(PRICE_URL), params={"ids": "A"}, timeout=5)
+        assert price.status_code == 200 and price.json() == {"A": {"usdPrice": 1.5}}
+    finally:
+        server.stop()
@@ -0,0 +1,96 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from helpers.host_throttle import HostThrottle
+from helpers.requests_utility import RequestsUtility
+
+
+class FakeApi:
+    """Local JSON API: answers the scripted statuses in order (then 200) and records client ports."""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.ports = []
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                api.ports.append(self.client_address[1])
+                status = api.statuses.pop(0) if api.statuses else 200
+                payload = json.dumps({"path": self.path, "body": body}).encode()
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = _reply
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+        self.url = "http://127.0.0.1:%d" % self.httpd.server_address[1]
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def api_factory(monkeypatch):
+    monkeypatch.setattr(HostThrottle, "_hosts", {})
+    apis = []
+
+    def make(statuses=()):
+        apis.append(FakeApi(statuses))
+        return apis[-1]
+
+    yield make
+    for api in apis:
+        api.stop()
+
+
+def test_calls_reuse_one_keep_alive_connection(api_factory):
+    api = api_factory()
+    client = RequestsUtility(api.url)
+    try:
+        assert client.get("/price", {"ids": "A"})["path"] == "/price?ids=A"
+        assert client.post("/", {"method": "getSlot"})["body"] == {"method": "getSlot"}
+        client.get("/price")
+    finally:
+        client.close()
+    assert len(api.ports) == 3 and len(set(api.ports)) == 1
+
+
+def test_429_is_retried_on_the_same_host(api_factory):
+    api = api_factory(statuses=[429, 429])
+    client = RequestsUtility(api.url)
+    assert client.post("/", {"method": "getSlot"})["body"] == {"method": "getSlot"}
+    assert len(api.ports) == 3
+    assert client.throttle.get_stats()["throttled"] == 2
+
+
+def test_gives_up_after_max_retries(api_factory, monkeypatch):
+    monkeypatch.setattr(HostThrottle, "max_retries", 2)
+    api = api_factory(statuses=[429, 429, 429])
+    assert RequestsUtility(api.url).get("/price") == {}
+    assert len(api.ports) == 2
+
+
+def test_unexpected_status_returns_empty(api_factory):
+    api = api_factory(statuses=[500])
+    assert RequestsUtility(api.url).post("/", {}) == {}
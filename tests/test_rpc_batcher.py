@@ -0,0 +1,108 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from helpers.rate_limiter import rate_priority
+from helpers.rpc_batcher import RpcBatcher
+
+
+class FakeRpc:
+    """requests_utility stand-in: echoes each call's params back, in shuffled order for batches."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.posts = []
+        self.lock = threading.Lock()
+
+    def post(self, endpoint, payload):
+        with self.lock:
+            self.posts.append(payload)
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("boom")
+        if isinstance(payload, dict):
+            return {"jsonrpc": "2.0", "id": payload["id"], "result": payload["params"]}
+        responses = [{"jsonrpc": "2.0", "id": p["id"], "result": p["params"]} for p in payload]
+        random.shuffle(responses)
+        return responses
+
+
+class FakeLimiter:
+    def __init__(self):
+        self.waits = []
+
+    def cost(self, method):
+        return {"getProgramAccounts": 10}.get(method, 1)
+
+    def wait(self, cost, priority):
+        self.waits.append((cost, priority))
+
+
+def payload(i: int, method: str = "getBalance") -> dict:
+    return {"jsonrpc": "2.0", "id": i, "method": method, "params": [i]}
+
+
+def test_lone_call_goes_out_at_once_unbatched():
+    rpc = FakeRpc()
+    batcher = RpcBatcher(rpc, "KEY", window=1.0)
+    started = time.monotonic()
+    assert batcher.call(payload(1))["result"] == [1]
+    assert time.monotonic() - started < 0.5
+    assert rpc.posts == [payload(1)]
+
+
+def test_concurrent_calls_share_batches_and_get_their_own_response():
+    rpc = FakeRpc(delay=0.02)
+    batcher = RpcBatcher(rpc, "KEY", window=0.02)
+    results = {}
+    barrier = threading.Barrier(20)
+
+    def call(i):
+        barrier.wait()
+        results[i] = batcher.call(payload(i))["result"]
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {i: [i] for i in range(20)}
+    assert len(rpc.posts) < 20
+    assert batcher.get_stats()["calls_sent"] == 20
+    assert batcher.in_flight == 0
+
+
+def test_call_many_is_split_at_max_batch_and_keeps_order():
+    rpc = FakeRpc()
+    batcher = RpcBatcher(rpc, "KEY", max_batch=50)
+    responses = batcher.call_many([payload(i) for i in range(120)])
+    assert [r["result"] for r in responses] == [[i] for i in range(120)]
+    assert [len(p) for p in rpc.posts] == [50, 50, 20]
+
+
+def test_missing_or_failed_responses_become_empty_dicts():
+    batcher = RpcBatcher(FakeRpc(fail=True), "KEY")
+    assert batcher.call_many([payload(1), payload(2)]) == [{}, {}]
+
+    class DropsOne(FakeRpc):
+        def post(self, endpoint, payload):
+            return super().post(endpoint, payload)[1:]
+
+    responses = RpcBatcher(DropsOne(), "KEY").call_many([payload(1), payload(2), payload(3)])
+    assert sum(r == {} for r in responses) == 1
+
+
+def test_batch_charges_summed_weights_at_most_urgent_priority():
+    limiter = FakeLimiter()
+    batcher = RpcBatcher(FakeRpc(), "KEY", rate_limiter=limiter)
+    with rate_priority("ANALYTICS"):
+        batcher.call_many([payload(1), payload(2, "getProgramAccounts")])
+    assert limiter.waits == [(11, "ANALYTICS")]
+
+    batcher.pending = [(payload(3), Future(), "ANALYTICS")]  # queued by another caller
+    with rate_priority("EXECUTION"):
+        batcher.call(payload(4))
+    assert limiter.waits[-1] == (2, "EXECUTION")
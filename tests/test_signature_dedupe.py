@@ -0,0 +1,71 @@
+import time
+
+from helpers.signature_dedupe import BloomFilter, SignatureDedupe
+
+
+def wait_folded(dedupe: SignatureDedupe) -> None:
+    deadline = time.monotonic() + 2
+    while dedupe.folding and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert not dedupe.folding
+
+
+def test_duplicates_are_reported_once_seen():
+    dedupe = SignatureDedupe()
+    assert dedupe.check_and_add("a") is False
+    assert dedupe.check_and_add("a") is True
+    assert "a" in dedupe and "b" not in dedupe
+    assert dedupe.get_stats()["duplicates"] == 1
+
+
+def test_rotation_keeps_one_generation_then_forgets_without_bloom():
+    dedupe = SignatureDedupe(max_entries=4)  # rotates once a generation holds 2
+    for sig in ("a", "b", "c", "d"):
+        dedupe.check_and_add(sig)
+    assert dedupe.rotations == 1
+    assert dedupe.previous == {"a", "b"} and dedupe.current == {"c", "d"}
+    assert "a" in dedupe  # still remembered exactly
+
+    dedupe.check_and_add("e")  # the next call rotates again: a, b are evicted
+    assert dedupe.rotations == 2
+    assert dedupe.check_and_add("a") is False
+    assert len(dedupe) <= 4
+
+
+def test_window_expiry_rotates():
+    dedupe = SignatureDedupe(window=0.05)
+    dedupe.check_and_add("a")
+    time.sleep(0.06)
+    dedupe.check_and_add("b")
+    assert dedupe.rotations == 1 and dedupe.previous == {"a"}
+
+
+def test_rotated_out_signatures_stay_caught_by_the_bloom_filter():
+    dedupe = SignatureDedupe(max_entries=4, bloom_capacity=1000)
+    for sig in ("a", "b", "c", "d", "e"):
+        dedupe.check_and_add(sig)
+        wait_folded(dedupe)
+    assert "a" not in dedupe.current | dedupe.previous
+    assert dedupe.check_and_add("a") is True
+    stats = dedupe.get_stats()
+    assert stats["bloom_hits"] == 1 and stats["bloom_entries"] == 2
+
+
+def test_bloom_filter_is_reset_once_full():
+    dedupe = SignatureDedupe(max_entries=4, bloom_capacity=2)
+    for i in range(8):
+        dedupe.check_and_add(f"sig{i}")
+        wait_folded(dedupe)
+    assert dedupe.bloom_resets >= 1
+    assert dedupe.bloom.count <= 2
+
+
+def test_bloom_filter_has_no_false_negatives_and_a_small_fp_rate():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    keys = [f"sig{i}" for i in range(5000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other{i}" in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.03
+    assert 0 < bloom.fp_rate() < 0.03
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from core.signature_worker_pool import SignatureWorkerPool
+from helpers.mint_work_queue import MintWorkQueue
+
+
+class FakeContext:
+    def __init__(self, **services):
+        self.services = services
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+class FakeTransactionManager:
+    """Records which worker thread handled each mint and whether a mint was ever processed twice at once."""
+
+    def __init__(self, resolved: dict = None):
+        self.resolved = resolved or {}
+        self.lock = threading.Lock()
+        self.handled_by = defaultdict(set)
+        self.running = defaultdict(int)
+        self.overlaps = 0
+        self.processed = []
+
+    def resolve_signature(self, sig, tx_data):
+        mint = self.resolved.get(sig)
+        return ({"sig": sig}, mint) if mint else None
+
+    def process_signature(self, sig, tx_data, token_mint):
+        with self.lock:
+            self.running[token_mint] += 1
+            self.overlaps += self.running[token_mint] > 1
+            self.handled_by[token_mint].add(threading.current_thread().name)
+        time.sleep(0.002)
+        with self.lock:
+            self.running[token_mint] -= 1
+            self.processed.append(sig)
+
+
+def make_pool(workers: int, tm: FakeTransactionManager) -> tuple[SignatureWorkerPool, MintWorkQueue]:
+    queue = MintWorkQueue()
+    ctx = FakeContext(
+        logger=logging.getLogger("test_signature_worker_pool"), transaction_manager=tm, signature_queue=queue,
+    )
+    return SignatureWorkerPool(ctx, workers), queue
+
+
+def run_until_drained(pool: SignatureWorkerPool, tm: FakeTransactionManager, expected: int) -> None:
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=pool.run_worker, args=(stop, i), name=f"worker-{i}", daemon=True)
+        for i in range(pool.workers)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while len(tm.processed) < expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    for thread in threads:
+        thread.join(1)
+
+
+def test_shard_for_is_stable_and_in_range():
+    pool, _ = make_pool(4, FakeTransactionManager())
+    shards = {pool.shard_for(f"mint{i}") for i in range(100)}
+    assert shards == {0, 1, 2, 3}
+    assert pool.shard_for("mint7") == pool.shard_for("mint7")
+
+
+def test_every_mint_is_processed_by_its_owner_only():
+    tm = FakeTransactionManager()
+    pool, queue = make_pool(4, tm)
+    sigs = [(f"sig{i}", f"mint{i % 6}") for i in range(60)]
+    for sig, mint in sigs:
+        queue.put((sig, None, mint, "WS", "pumpfun"))
+
+    run_until_drained(pool, tm, len(sigs))
+
+    assert sorted(tm.processed) == sorted(sig for sig, _ in sigs)
+    assert tm.overlaps == 0
+    for mint, threads in tm.handled_by.items():
+        assert threads == {f"worker-{pool.shard_for(mint)}"}
+    stats = pool.get_stats()
+    assert sum(w["processed"] for w in stats["workers"]) == len(sigs)
+    assert stats["forwarded"] > 0
+
+
+def test_unknown_mints_are_resolved_then_forwarded_to_their_owner():
+    tm = FakeTransactionManager(resolved={"sig1": "mintA", "sig2": "mintA"})
+    pool, queue = make_pool(3, tm)
+    queue.put(("sig1", None, None, "WS", None))
+    queue.put(("sig2", None, None, "PREFETCH", None), lane="PREFETCH")
+    queue.put(("unresolvable", None, None, "WS", None))
+
+    run_until_drained(pool, tm, 2)
+
+    assert sorted(tm.processed) == ["sig1", "sig2"]
+    assert tm.handled_by["mintA"] == {f"worker-{pool.shard_for('mintA')}"}
+
+
+def test_cancelling_a_mint_drops_work_already_forwarded_to_a_shard():
+    tm = FakeTransactionManager()
+    pool, queue = make_pool(2, tm)
+    owner = pool.shard_for("mintA")
+    other = next(m for m in (f"mint{i}" for i in range(100)) if m != "mintA" and pool.shard_for(m) == owner)
+    pool.shards[owner].put(("forwarded", None, "mintA", "WS", "pumpfun"))
+    queue.cancel("mintA")
+    queue.put(("other", None, other, "WS", "pumpfun"))
+
+    run_until_drained(pool, tm, 1)  # the owner drains its shard before the main queue
+
+    assert tm.processed == ["other"]
+    assert pool.shards[owner].cancelled == 1
@@ -0,0 +1,67 @@
+import json
+import time
+
+import pytest
+
+from helpers.span_tracker import (
+    Histogram, SpanTracker, bind_trace, mark_queued, record_queue_wait, record_span, span,
+)
+
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    tracker = SpanTracker(str(tmp_path / "spans.json"), interval=60, max_traces=3)
+    monkeypatch.setattr(SpanTracker, "active", tracker)
+    yield tracker
+    bind_trace()  # the trace context outlives the test otherwise
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = Histogram()
+    for ms in [1] * 50 + [40] * 40 + [70_000] * 10:
+        histogram.observe(ms)
+    assert histogram.quantile(0.5) == 5.0
+    assert histogram.quantile(0.9) == 50.0
+    assert histogram.quantile(0.99) == 70_000  # +Inf bucket reports the max
+    summary = histogram.summary()
+    assert summary["count"] == 100 and summary["max_ms"] == 70_000
+    assert Histogram().summary()["p50_ms"] == 0.0
+
+
+def test_spans_are_a_no_op_while_disabled(monkeypatch):
+    monkeypatch.setattr(SpanTracker, "active", None)
+    with span("stage"):
+        pass
+    record_span("stage", 1.0)
+
+
+def test_signature_spans_join_the_mint_trace(tracker):
+    mark_queued("sig")
+    record_queue_wait("sig")
+    record_span("get_transaction", 0.02, signature="sig")
+    bind_trace("sig", "mint")
+    with span("gates"):
+        time.sleep(0.01)
+
+    stats = tracker.get_stats()
+    [trace] = stats["traces"]
+    assert (trace["signature"], trace["mint"]) == ("sig", "mint")
+    assert [s[0] for s in trace["spans"]] == ["queue_wait", "get_transaction", "gates"]
+    assert set(stats["stages"]) == {"queue_wait", "get_transaction", "gates"}
+    assert stats["stages"]["gates"]["count"] == 1
+
+
+def test_traces_are_bounded(tracker):
+    for i in range(5):
+        record_span("stage", 0.001, mint=f"mint{i}")
+    assert [t["mint"] for t in tracker.get_stats()["traces"]] == ["mint4", "mint3", "mint2"]
+
+
+def test_export_resets_only_the_window(tracker):
+    record_span("stage", 0.001, mint="mint")
+    tracker.export()
+    with open(tracker.path, encoding="utf-8") as f:
+        exported = json.load(f)
+    assert exported["window"]["stage"]["count"] == 1
+    stats = tracker.get_stats()
+    assert stats["window"] == {} and stats["stages"]["stage"]["count"] == 1
@@ -0,0 +1,61 @@
+import copy
+import logging
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils
+
+from services.liquidity_analyzer import LiquidityAnalyzer
+
+
+class FakeContext:
+    def __init__(self, **services):
+        self.services = services
+
+    def get(self, name):
+        return self.services.get(name)
+
+
+CREATION_TX = {
+    "blockTime": 1_700_000_000,
+    "meta": {
+        "err": None,
+        "logMessages": ["Program log: Instruction: InitializeMint2", "Program log: Instruction: Buy"],
+        "preTokenBalances": [],
+        "postTokenBalances": [{"mint": "MINT", "uiTokenAmount": {"decimals": 6}}],
+    },
+    "transaction": {"message": {"accountKeys": [{"pubkey": "PAYER"}, {"pubkey": "MINT"}]}},
+}
+
+
+@pytest.fixture
+def analyzer():
+    return LiquidityAnalyzer(FakeContext(logger=logging.getLogger("test_token_age")))
+
+
+def changed(**meta) -> dict:
+    tx = copy.deepcopy(CREATION_TX)
+    tx["meta"].update(meta)
+    return tx
+
+
+def test_creation_tx_gives_its_block_time(analyzer):
+    assert analyzer.creation_blocktime(CREATION_TX, "MINT") == 1_700_000_000
+
+
+def test_mint_in_loaded_addresses_counts(analyzer):
+    tx = changed(loadedAddresses={"writable": ["MINT"], "readonly": []})
+    tx["transaction"]["message"]["accountKeys"] = ["PAYER"]
+    assert analyzer.creation_blocktime(tx, "MINT") == 1_700_000_000
+
+
+@pytest.mark.parametrize("tx, mint", [
+    (changed(logMessages=["Program log: Instruction: Buy"]), "MINT"),  # no InitializeMint
+    (CREATION_TX, "OTHER"),  # initialised some other mint
+    (changed(preTokenBalances=[{"mint": "MINT"}]), "MINT"),  # mint existed before this tx
+    (changed(err={"InstructionError": [0, "Custom"]}), "MINT"),
+    ({**CREATION_TX, "blockTime": None}, "MINT"),
+    ({}, "MINT"),
+])
+def test_anything_else_needs_an_rpc_lookup(analyzer, tx, mint):
+    assert analyzer.creation_blocktime(tx, mint) is None
@@ -0,0 +1,95 @@
+import logging
+import queue
+import threading
+
+import pytest
+
+pytest.importorskip("pandas")  # helpers.framework_utils
+pytest.importorskip("psycopg2")  # dao.trade_dao
+
+from services.open_positions import OpenPositionTracker
+
+
+class FakeTradeDao:
+    def __init__(self, *trades):
+        self.trades = list(trades)
+
+    def get_open_trades(self, sim_mode):
+        return [dict(t) for t in self.trades]
+
+
+def trade(id_, mint, version=1, status="FINALIZED", **extra) -> dict:
+    return {"id": id_, "token_address": mint, "version": version, "status": status, "simulation": False, **extra}
+
+
+def change(id_, mint, version=1, status="FINALIZED", op="UPDATE") -> dict:
+    return {**trade(id_, mint, version, status), "op": op, "timestamp": "2026-10-17T12:00:00"}
+
+
+@pytest.fixture
+def tracker():
+    tracker = object.__new__(OpenPositionTracker)
+    tracker.settings = {"SIM_MODE": False}
+    tracker.logger = logging.getLogger("test_trade_sync")
+    tracker.trade_dao = FakeTradeDao()
+    tracker.tokens_lock = threading.Lock()
+    tracker.active_trades = {}
+    tracker.closed_ids = set()
+    tracker.changes = queue.Queue()
+    tracker.ticks = queue.Queue()
+    return tracker
+
+
+def push(tracker, *changes):
+    for c in changes:
+        tracker.on_trade_change(c)
+    tracker._apply_trade_changes()
+
+
+def test_pushed_buy_is_tracked_and_close_untracks_it(tracker):
+    push(tracker, change(1, "A"))
+    assert tracker.active_trades["A"]["id"] == 1
+    assert tracker.active_trades["A"]["timestamp"].hour == 12
+    push(tracker, change(1, "A", version=2, status="CLOSED"))
+    assert "A" not in tracker.active_trades and tracker.closed_ids == {1}
+
+
+def test_changes_of_the_other_mode_or_without_mint_are_ignored(tracker):
+    push(tracker, {**change(1, "A"), "simulation": True}, {**change(2, None)})
+    assert tracker.active_trades == {}
+
+
+def test_older_versions_never_overwrite_newer_ones(tracker):
+    tracker.active_trades["A"] = trade(1, "A", version=3, entry_usd=2.0)
+    push(tracker, change(1, "A", version=2))
+    assert tracker.active_trades["A"]["entry_usd"] == 2.0
+
+    tracker.trade_dao = FakeTradeDao(trade(1, "A", version=1))  # stale snapshot
+    tracker._sync_from_db()
+    assert tracker.active_trades["A"]["version"] == 3
+
+
+def test_trade_closed_here_is_not_resurrected_by_a_stale_sync(tracker):
+    tracker.active_trades["A"] = trade(1, "A")
+    tracker.drop_trade("A")
+    tracker.trade_dao = FakeTradeDao(trade(1, "A"))  # read before the close committed
+    tracker._sync_from_db()
+    assert "A" not in tracker.active_trades
+    push(tracker, change(1, "A"))  # a late open-state change neither
+    assert "A" not in tracker.active_trades
+
+    tracker.trade_dao = FakeTradeDao()  # the DB agrees now
+    tracker._sync_from_db()
+    assert tracker.closed_ids == set()
+
+
+def test_full_sync_merges_instead_of_replacing(tracker):
+    tracker.active_trades = {"A": trade(1, "A"), "B": trade(2, "B")}
+    tracker.trade_dao = FakeTradeDao(trade(1, "A", version=2), trade(3, "C"))
+    tracker._sync_from_db()
+    assert {m: t["version"] for m, t in tracker.active_trades.items()} == {"A": 2, "C": 1}
+
+
+def test_deleted_trade_is_dropped(tracker):
+    push(tracker, change(1, "A"), change(1, "A", op="DELETE"))
+    assert tracker.active_trades == {}
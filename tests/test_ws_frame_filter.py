@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from helpers.ws_frame_filter import WsFrameFilter, get_decoder
+
+RULES = ["Program log: Instruction: InitializeMint2", 'Program log: "quoted" rule', "Program log: café"]
+
+
+def frame(signature: str, logs: list[str], subscription: int = 7, ensure_ascii: bool = True) -> str:
+    value = {"signature": signature, "err": None, "logs": logs}
+    return json.dumps({
+        "jsonrpc": "2.0", "method": "logsNotification",
+        "params": {"result": {"context": {"slot": 1}, "value": value}, "subscription": subscription},
+    }, ensure_ascii=ensure_ascii)
+
+
+def naive_parse(raw) -> tuple | None:
+    """The decode-everything check the prefilter must agree with."""
+    value = json.loads(raw)["params"]["result"]["value"]
+    if any(rule in log for log in value["logs"] for rule in RULES):
+        return value["signature"], value["logs"], 7
+    return None
+
+
+FRAMES = [
+    frame("match", ["Program 1 invoke", "Program log: Instruction: InitializeMint2"]),
+    frame("quoted", ['Program log: "quoted" rule here']),
+    frame("escaped", ["Program log: café"]),
+    frame("raw-unicode", ["Program log: café"], ensure_ascii=False),
+    frame("miss", ["Program log: Instruction: Transfer"]),
+    frame("split", ["Program log: Instruction:", "InitializeMint2"]),  # rule text spread over two lines
+]
+
+
+@pytest.mark.parametrize("raw", FRAMES)
+@pytest.mark.parametrize("as_bytes", [False, True], ids=["str", "bytes"])
+def test_parse_agrees_with_decoding_every_frame(raw, as_bytes):
+    expected = naive_parse(raw)
+    assert WsFrameFilter(RULES, "json").parse(raw.encode() if as_bytes else raw) == expected
+
+
+def test_non_matching_frames_are_rejected_before_decoding():
+    ws_filter = WsFrameFilter(RULES, "json")
+    ws_filter.loads = None  # any decode attempt would fail
+    assert ws_filter.parse(FRAMES[4]) is None
+    assert ws_filter.get_stats()["rejected_raw"] == 1
+
+
+def test_no_rules_accepts_everything():
+    ws_filter = WsFrameFilter([], "json")
+    assert ws_filter.parse(FRAMES[4]) == ("miss", ["Program log: Instruction: Transfer"], 7)
+    assert ws_filter.parse('{"jsonrpc": "2.0", "result": 3, "id": 1}') is None  # subscription ack
+
+
+def test_decoder_falls_back_to_json():
+    name, loads = get_decoder("json")
+    assert name == "json" and loads('{"a": 1}') == {"a": 1}
+    assert get_decoder("auto")[0] in ("orjson", "msgspec", "json")